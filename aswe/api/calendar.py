@@ -4,11 +4,16 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from loguru import logger
 
+from aswe.utils.cache import ttl_cache
+from aswe.utils.cassette import recorded
+from aswe.utils.lazy import lazy_import
+
+google_requests = lazy_import("google.auth.transport.requests")
+oauthlib_flow = lazy_import("google_auth_oauthlib.flow")
+discovery = lazy_import("googleapiclient.discovery")
+
 _SCOPES = ["https://www.googleapis.com/auth/calendar"]
 _CREDENTIALS_FILE = "calendar_credentials.json"
 _PICKLE_FILE = "calendar_token.pickle"
@@ -65,19 +70,46 @@ def get_calendar_service() -> Any:
             creds = pickle.load(token)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+            creds.refresh(google_requests.Request())
         else:
-            flow = InstalledAppFlow.from_client_secrets_file(_CREDENTIALS_FILE, _SCOPES)
+            flow = oauthlib_flow.InstalledAppFlow.from_client_secrets_file(_CREDENTIALS_FILE, _SCOPES)
             creds = flow.run_local_server(port=0)
 
         # Save the credentials for the next run
         with open(_PICKLE_FILE, "wb") as token:
             pickle.dump(creds, token)
 
-    service = build("calendar", "v3", credentials=creds)
+    service = discovery.build("calendar", "v3", credentials=creds)
     return service
 
 
+def _list_calendar_events(min_timestamp: str, max_timestamp: str) -> list[list[dict[str, Any]]]:
+    """Requests the raw events inside the timeframe from every calendar of the user"""
+    service = get_calendar_service()
+
+    calendars = service.calendarList().list().execute().get("items", [])  # pylint: disable=no-member
+    calendar_events = []
+    for calendar in calendars:
+        calendar_id = calendar.get("id", "")
+        if calendar_id != "":
+            events_result = (
+                service.events()  # pylint: disable=no-member
+                .list(
+                    calendarId=calendar_id,
+                    timeMin=min_timestamp,
+                    timeMax=max_timestamp,
+                    maxResults=100,
+                    singleEvents=True,
+                    orderBy="startTime",
+                )
+                .execute()
+            )
+            calendar_events.append(events_result.get("items", []))
+
+    return calendar_events
+
+
+@ttl_cache(60)
 def get_events_by_timeframe(min_timestamp: str, max_timestamp: str) -> list[Event]:
     """Provides all events inside timeframe
 
@@ -93,41 +125,20 @@ def get_events_by_timeframe(min_timestamp: str, max_timestamp: str) -> list[Even
     list[Event]
         List of all events inside timeframe
     """
-    service = get_calendar_service()
-
-    calendars = service.calendarList().list().execute().get("items", [])  # pylint: disable=no-member
     event_array = []
-    for i, _ in enumerate(calendars):
-        current_calendar = calendars[i].get("id", "")
-        if current_calendar != "":
-
-            events_result = (
-                service.events()  # pylint: disable=no-member
-                .list(
-                    calendarId=current_calendar,
-                    timeMin=min_timestamp,
-                    timeMax=max_timestamp,
-                    maxResults=100,
-                    singleEvents=True,
-                    orderBy="startTime",
+    for events in recorded("googleapiclient.calendar.events", _list_calendar_events, min_timestamp, max_timestamp):
+        for event_data in events:
+            if "Kalenderwoche" not in event_data.get("summary", ""):
+                event = Event(
+                    title=event_data.get("summary", ""),
+                    description=event_data.get("description", ""),
+                    location=event_data.get("location", ""),
+                    full_day="date" in event_data.get("start", {}),
+                    date=event_data.get("start", {}).get("date", ""),
+                    start_time=event_data.get("start", {}).get("dateTime", ""),
+                    end_time=event_data.get("end", {}).get("dateTime", ""),
                 )
-                .execute()
-            )
-
-            events = events_result.get("items", [])
-
-            for event_data in events:
-                if "Kalenderwoche" not in event_data.get("summary", ""):
-                    event = Event(
-                        title=event_data.get("summary", ""),
-                        description=event_data.get("description", ""),
-                        location=event_data.get("location", ""),
-                        full_day="date" in event_data.get("start", {}),
-                        date=event_data.get("start", {}).get("date", ""),
-                        start_time=event_data.get("start", {}).get("dateTime", ""),
-                        end_time=event_data.get("end", {}).get("dateTime", ""),
-                    )
-                    event_array.append(event)
+                event_array.append(event)
 
     logger.debug(f"All events: {event_array}")
     return event_array
@@ -174,6 +185,12 @@ def get_next_event_today() -> Event | None:
     return None
 
 
+def _insert_calendar_event(event: dict[str, Any]) -> None:
+    """Inserts an event into the primary calendar of the user"""
+    service = get_calendar_service()
+    service.events().insert(calendarId="primary", body=event).execute()  # pylint: disable=no-member
+
+
 def create_event(event_info: Event) -> None:
     """Creates Event in Google Calendar
 
@@ -199,7 +216,7 @@ def create_event(event_info: Event) -> None:
         else {"dateTime": event_info.end_time, "timeZone": "Europe/Berlin"},
     }
 
-    service = get_calendar_service()
-    service.events().insert(calendarId="primary", body=event).execute()  # pylint: disable=no-member
+    recorded("googleapiclient.calendar.insert", _insert_calendar_event, event)
+    get_events_by_timeframe.cache_clear()
 
     logger.success(f"Created Event: {event}")
@@ -7,6 +7,7 @@ from requests import JSONDecodeError
 
 from aswe.api.event.event_data import EventLocation, ReducedEvent
 from aswe.api.event.event_params import EventApiEventParams
+from aswe.utils.decoder import decode_json
 from aswe.utils.request import http_request
 
 _BASE_URL: Final[str] = "https://app.ticketmaster.com/discovery/v2/"
@@ -82,7 +83,7 @@ def events(query_params: EventApiEventParams) -> list[ReducedEvent] | None:
 
     if response:
         try:
-            response_json: dict[str, Any] = response.json()
+            response_json: dict[str, Any] = decode_json(response)
             reduced_events = _reduce_events(response_json)
 
             return reduced_events
@@ -1,14 +1,20 @@
 import os
 from datetime import datetime, timedelta
+from functools import cache
+from itertools import islice
 from json import JSONDecodeError
 from pathlib import Path
 from typing import Any, Final
 
-import pandas as pd
-from currency_converter import CurrencyConverter
 from loguru import logger
 
-from aswe.utils.request import http_request
+from aswe.utils.cache import ttl_cache
+from aswe.utils.decoder import decode_json, iter_json_items
+from aswe.utils.lazy import lazy_import
+from aswe.utils.request import asynchronous, http_request
+
+pd = lazy_import("pandas")
+currency_converter = lazy_import("currency_converter")
 
 _FMP_BASE_URL: Final[str] = "https://financialmodelingprep.com/api/v3"
 _AV_BASE_URL: Final[str] = "https://www.alphavantage.co"
@@ -18,12 +24,25 @@ _AV_API_KEY: Final[str] = os.getenv("FINANCE_API_KEY_2", "")
 
 _CC_MAPPING_PATH: Final[str] = "data/finance/country_currency_mapping.csv"
 
-cur_conv = CurrencyConverter()
+
+@cache
+def _get_currency_converter() -> Any:
+    """Returns the shared currency converter
+
+    The converter parses its exchange rate file on creation, therefore it is only created on first use.
+
+    Returns
+    -------
+    currency_converter.CurrencyConverter
+        The currency converter.
+    """
+    return currency_converter.CurrencyConverter()
 
 
 # Stock price data
 
 
+@cache
 def get_currency_by_country(country: str) -> tuple[str, str]:
     """Returns the currency and the currency symbol for a given country.
 
@@ -65,9 +84,9 @@ def get_stock_price(symbol: str, currency: str = "USD") -> float | None:
     response = http_request(f"{_FMP_BASE_URL}/quote-short/{symbol}?apikey={_FMP_API_KEY}")
     if response is not None:
         try:
-            price = response.json()[0]["price"]
+            price = decode_json(response)[0]["price"]
             if currency != "USD":
-                price = cur_conv.convert(price, "USD", currency)
+                price = _get_currency_converter().convert(price, "USD", currency)
             return float(round(price, 2))
         except (KeyError, AttributeError, JSONDecodeError):
             logger.error("Got invalid response from Stock API.")
@@ -92,7 +111,7 @@ def get_stock_rating(symbol: str) -> str | None:
     response = http_request(f"{_FMP_BASE_URL}/rating/{symbol}?apikey={_FMP_API_KEY}")
     if response is not None:
         try:
-            rating_data = response.json()[0]
+            rating_data = decode_json(response)[0]
             rating = f"{rating_data['rating']} ({rating_data['ratingRecommendation']})"
             rating = rating.replace("-", " minus")
             rating = rating.replace("+", " plus")
@@ -139,7 +158,7 @@ def get_stock_price_change(symbol: str) -> dict[str, str] | None:
     response = http_request(f"{_FMP_BASE_URL}/stock-price-change/{symbol}?apikey={_FMP_API_KEY}")
     if response is not None:
         try:
-            change_data = response.json()[0]
+            change_data = decode_json(response)[0]
             change = {
                 "24h": _get_percentage_change(change_data["1D"]),
                 "5D": _get_percentage_change(change_data["5D"]),
@@ -155,6 +174,8 @@ def get_stock_price_change(symbol: str) -> dict[str, str] | None:
 # Financial news sentiment
 
 
+# The URL changes every minute and the stream is not read completely, so the parsed news are cached instead
+@ttl_cache(60 * 60)
 def get_news_info_by_symbol(symbol: str) -> list[dict[str, Any]] | None:
     """Returns the latest news for a given symbol.
 
@@ -171,18 +192,22 @@ def get_news_info_by_symbol(symbol: str) -> list[dict[str, Any]] | None:
     one_day_ago = (datetime.utcnow() - timedelta(days=1)).strftime("%Y%m%dT%H%M")
     response = http_request(
         f"""{_AV_BASE_URL}/query?function=NEWS_SENTIMENT&tickers={symbol}&time_from="""
-        f"""{one_day_ago}&sort=latest&limit=200&apikey={_AV_API_KEY}"""
+        f"""{one_day_ago}&sort=latest&limit=200&apikey={_AV_API_KEY}""",
+        stream=True,
     )
     if response is not None:
         try:
-            all_news = response.json()["feed"]
+            # The feed is parsed while it is downloaded and the download stops after two relevant articles
             most_relevant_news = list(
-                filter(
-                    lambda news: float(get_ticker_by_symbol(news["ticker_sentiment"], symbol)["relevance_score"])
-                    >= 0.8,
-                    all_news,
+                islice(
+                    filter(
+                        lambda news: float(get_ticker_by_symbol(news["ticker_sentiment"], symbol)["relevance_score"])
+                        >= 0.8,
+                        iter_json_items(response, "feed"),
+                    ),
+                    2,
                 )
-            )[:2]
+            )
             return most_relevant_news
         except (KeyError, AttributeError, JSONDecodeError):
             logger.error("Got invalid response from News Sentiment API.")
@@ -205,3 +230,11 @@ def get_ticker_by_symbol(ticker_list: list[dict[str, str]], symbol: str) -> dict
         The ticker data for the given symbol.
     """
     return next(ticker for ticker in ticker_list if ticker["ticker"] == symbol)
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+get_stock_price_async = asynchronous(get_stock_price)
+get_stock_rating_async = asynchronous(get_stock_rating)
+get_stock_price_change_async = asynchronous(get_stock_price_change)
+get_news_info_by_symbol_async = asynchronous(get_news_info_by_symbol)
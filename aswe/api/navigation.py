@@ -2,11 +2,17 @@ import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
+from typing import Any
 
-import googlemaps as gmaps
 from loguru import logger
 from requests import Response
-from vvspy import get_trips
+
+from aswe.utils.cache import ttl_cache
+from aswe.utils.cassette import recorded
+from aswe.utils.lazy import lazy_import
+
+gmaps = lazy_import("googlemaps")
+vvspy = lazy_import("vvspy")
 
 _GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
 
@@ -94,7 +100,7 @@ def get_latest_connection(start_station: str, end_station: str, arrival_time: da
     Trip | None
         An object containing all the information about the trip
     """
-    trips = get_trips(start_station, end_station, check_time=arrival_time, limit=10)
+    trips = recorded("vvspy.get_trips", vvspy.get_trips, start_station, end_station, check_time=arrival_time, limit=10)
 
     if isinstance(trips, Response):
         logger.error("Got unexpected response from VVS API")
@@ -127,6 +133,7 @@ def get_latest_connection(start_station: str, end_station: str, arrival_time: da
     return None
 
 
+@ttl_cache(60)
 def get_next_connection(start_station: str, end_station: str) -> Trip | None:
     """Provides the next trip from the start location to the end location
 
@@ -142,7 +149,7 @@ def get_next_connection(start_station: str, end_station: str) -> Trip | None:
     Trip | None
         An object containing all the information about the trip
     """
-    trips = get_trips(start_station, end_station, limit=10)
+    trips = recorded("vvspy.get_trips", vvspy.get_trips, start_station, end_station, limit=10)
 
     if isinstance(trips, Response):
         logger.error("Got unexpected response from VVS API")
@@ -175,6 +182,14 @@ def get_next_connection(start_station: str, end_station: str) -> Trip | None:
     return None
 
 
+def _get_directions(start_location: str, end_location: str, mode: str) -> list[dict[str, Any]]:
+    """Requests the directions between two locations from the Google Maps client"""
+    client = gmaps.Client(key=_GOOGLE_MAPS_API_KEY)
+    directions: list[dict[str, Any]] = client.directions(start_location, end_location, mode=mode)
+    return directions
+
+
+@ttl_cache(5 * 60)
 def get_maps_connection(start_location: str, end_location: str, mode: MapsTripMode) -> MapsTrip:
     """Provides the distance and duration for a trip with a specific transportation type
 
@@ -192,8 +207,7 @@ def get_maps_connection(start_location: str, end_location: str, mode: MapsTripMo
     MapsTrip
         A MapsTrip object containing the distance and duration of the trip
     """
-    client = gmaps.Client(key=_GOOGLE_MAPS_API_KEY)
-    directions_result = client.directions(start_location, end_location, mode=mode.value)  # type: ignore
+    directions_result = recorded("googlemaps.directions", _get_directions, start_location, end_location, mode.value)
 
     distance = int(directions_result[0]["legs"][0]["distance"]["value"])
     duration = int(directions_result[0]["legs"][0]["duration"]["value"] / 60)
@@ -1,6 +1,7 @@
 import os
 
-from aswe.utils.request import http_request
+from aswe.utils.decoder import decode_json
+from aswe.utils.request import asynchronous, http_request
 
 _NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 
@@ -24,7 +25,7 @@ def top_headlines_search(country: str = "us", max_results: int = 3) -> list[str]
     request = http_request(f"https://newsapi.org/v2/top-headlines?country={country}&apiKey={_NEWS_API_KEY}")
     if request is None:
         return None
-    headline_request = request.json()
+    headline_request = decode_json(request)
     if max_results > len(headline_request["articles"]):
         max_results = len(headline_request["articles"])
     for i in range(max_results):
@@ -56,9 +57,15 @@ def keyword_search(keyword: str, max_results: int = 3) -> list[str] | None:
     request = http_request(f"https://newsapi.org/v2/everything?q={keyword}&apiKey={_NEWS_API_KEY}")
     if request is None:
         return None
-    keyword_request = request.json()
+    keyword_request = decode_json(request)
     if max_results > len(keyword_request["articles"]):
         max_results = len(keyword_request["articles"])
     for i in range(max_results):
         result.append(keyword_request["articles"][i]["title"] + ": " + keyword_request["articles"][i]["description"])
     return result
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+top_headlines_search_async = asynchronous(top_headlines_search)
+keyword_search_async = asynchronous(keyword_search)
@@ -1,8 +1,9 @@
 import os
 from datetime import date
 
+from aswe.utils.decoder import decode_json
 from aswe.utils.error import ApiLimitReached
-from aswe.utils.request import http_request, validate_api
+from aswe.utils.request import asynchronous, http_request, validate_api
 
 _HEADERS = {"x-rapidapi-key": os.getenv("SPORTS_API_KEY"), "x-rapidapi-host": "v1.basketball.api-sports.io"}
 
@@ -20,7 +21,7 @@ def get_nba_standings() -> list[list[str]] | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
     wc_standings = []
     ec_standings = []
     conferences = []
@@ -52,7 +53,7 @@ def get_nba_teams() -> list[str] | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
     teams = []
     for team in data["response"][0]:
         teams.append(team["team"]["name"])
@@ -78,7 +79,7 @@ def get_team_id(team_name: str) -> int | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
 
     if data["response"] == []:
         return None
@@ -113,7 +114,7 @@ def get_team_game_today(team_name: str) -> list[str] | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
 
     if data["response"] == []:
         return []
@@ -125,3 +126,10 @@ def get_team_game_today(team_name: str) -> list[str] | None:
 {game['scores']['away']['total']} {game['teams']['away']['name']}"
         )
     return games
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+get_nba_standings_async = asynchronous(get_nba_standings)
+get_nba_teams_async = asynchronous(get_nba_teams)
+get_team_game_today_async = asynchronous(get_team_game_today)
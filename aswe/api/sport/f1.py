@@ -1,4 +1,5 @@
-from aswe.utils.request import http_request
+from aswe.utils.decoder import decode_json
+from aswe.utils.request import asynchronous, http_request
 
 
 def get_results_by_round(year: int, round_num: int) -> list[str] | None:
@@ -20,7 +21,7 @@ def get_results_by_round(year: int, round_num: int) -> list[str] | None:
     request = http_request(url)
     if request is None:
         return None
-    response = dict(request.json())
+    response = dict(decode_json(request))
     if response["MRData"]["total"] == "0":
         return None
     result = [
@@ -45,7 +46,7 @@ def get_results_next_round() -> list[str] | None:
     request = http_request(url)
     if request is None:
         return None
-    response = dict(request.json())
+    response = dict(decode_json(request))
 
     if response["MRData"]["total"] == "0":
         return []
@@ -72,7 +73,7 @@ def get_results_last_round() -> list[str] | None:
     request = http_request(url)
     if request is None:
         return None
-    response = dict(request.json())
+    response = dict(decode_json(request))
 
     if response["MRData"]["total"] == "0":
         return []
@@ -85,3 +86,10 @@ def get_results_last_round() -> list[str] | None:
         for driver in response["MRData"]["RaceTable"]["Races"][0]["Results"]
     ]
     return result
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+get_results_by_round_async = asynchronous(get_results_by_round)
+get_results_next_round_async = asynchronous(get_results_next_round)
+get_results_last_round_async = asynchronous(get_results_last_round)
@@ -1,6 +1,8 @@
 import os
+from datetime import datetime
 
-from aswe.utils.request import http_request
+from aswe.utils.decoder import decode_json, iter_json_items
+from aswe.utils.request import asynchronous, http_request
 
 _HEADERS = {"X-Auth-Token": os.getenv("SOCCER_API_KEY")}
 
@@ -93,7 +95,7 @@ def get_league_standings(league: str) -> list[str] | None:
     request = http_request(f"https://api.football-data.org/v4/competitions/{league_id}/standings", headers=_HEADERS)
     if request is None:
         return None
-    results = request.json()
+    results = decode_json(request)
     for team in results["standings"][0]["table"]:
         standings.append(str(team["position"]) + ". " + team["team"]["name"] + " - " + str(team["points"]) + " points")
     return standings
@@ -123,7 +125,7 @@ def get_matchday_matches(league: str, matchday: int) -> list[str] | None:
     )
     if request is None:
         return None
-    results = request.json()
+    results = decode_json(request)
 
     for match in results["matches"]:
         if match["status"] == "SCHEDULED" or match["status"] == "TIMED":
@@ -182,11 +184,10 @@ def get_ongoing_matches(league: str = "") -> list[str] | None:
     matches = []
     if league_id is None:
         return None
-    request = http_request("https://api.football-data.org/v4/matches?status=IN_PLAY", headers=_HEADERS)
+    request = http_request("https://api.football-data.org/v4/matches?status=IN_PLAY", headers=_HEADERS, stream=True)
     if request is None:
         return None
-    results = request.json()
-    for match in results["matches"]:
+    for match in iter_json_items(request, "matches"):
         if match["competition"]["code"] == league_id:
             matches.append(
                 match["homeTeam"]["name"]
@@ -222,11 +223,10 @@ def get_matches_today(league: str = "") -> list[str] | None:
     matches = []
     if league_id is None:
         return None
-    request = http_request("https://api.football-data.org/v4/matches?status=SCHEDULED", headers=_HEADERS)
+    request = http_request("https://api.football-data.org/v4/matches?status=SCHEDULED", headers=_HEADERS, stream=True)
     if request is None:
         return None
-    results = request.json()
-    for match in results["matches"]:
+    for match in iter_json_items(request, "matches"):
         if match["competition"]["code"] == league_id:
             matches.append(
                 "playing at "
@@ -274,7 +274,7 @@ def get_upcoming_team_matches(league: str, team_name: str, num_matches: int = 3)
     )
     if request is None:
         return None
-    results = request.json()
+    results = decode_json(request)
     for match in results["matches"]:
         matches.append(
             "playing on the "
@@ -294,6 +294,43 @@ def get_upcoming_team_matches(league: str, team_name: str, num_matches: int = 3)
     return matches[0:num_matches]
 
 
+def get_next_team_kickoff(league: str, team_name: str) -> datetime | None:
+    """Get the kick-off of the next scheduled match of the specified team
+
+    Parameters
+    ----------
+    league : str
+        Name of the league
+    team_name : str
+        Name of the team from which the kick-off is requested
+
+    Returns
+    -------
+    datetime | None
+        The kick-off in local time, `None` if no match is scheduled
+    """
+    teams = get_teams(league)
+    if teams is None:
+        return None
+    team_id = ""
+    for i in range(int(len(teams) / 2)):
+        if teams[i * 2] == team_name:
+            team_id = teams[i * 2 + 1]
+    if team_id == "":
+        return None
+    request = http_request(
+        f"https://api.football-data.org/v4/teams/{team_id}/matches?status=SCHEDULED", headers=_HEADERS
+    )
+    if request is None:
+        return None
+    results = decode_json(request)
+    kickoffs = [
+        datetime.fromisoformat(match["utcDate"].replace("Z", "+00:00")).astimezone().replace(tzinfo=None)
+        for match in results["matches"]
+    ]
+    return min(kickoffs, default=None)
+
+
 def get_current_team_match(league: str, team_name: str) -> list[str] | None:
     """Get the current match of the specified team
 
@@ -322,7 +359,7 @@ def get_current_team_match(league: str, team_name: str) -> list[str] | None:
     request = http_request(f"https://api.football-data.org/v4/teams/{team_id}/matches?status=IN_PLAY", headers=_HEADERS)
     if request is None:
         return None
-    results = request.json()
+    results = decode_json(request)
     for match in results["matches"]:
         matches.append(
             match["homeTeam"]["name"]
@@ -357,9 +394,21 @@ def get_teams(league: str) -> list[str] | None:
     request = http_request(f"https://api.football-data.org/v4/competitions/{league_id}/teams", headers=_HEADERS)
     if request is None:
         return None
-    results = request.json()
+    results = decode_json(request)
     teams = []
     for team in results["teams"]:
         teams.append(team["name"])
         teams.append(str(team["id"]))
     return teams
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+get_league_standings_async = asynchronous(get_league_standings)
+get_matchday_matches_async = asynchronous(get_matchday_matches)
+get_ongoing_matches_async = asynchronous(get_ongoing_matches)
+get_matches_today_async = asynchronous(get_matches_today)
+get_upcoming_team_matches_async = asynchronous(get_upcoming_team_matches)
+get_next_team_kickoff_async = asynchronous(get_next_team_kickoff)
+get_current_team_match_async = asynchronous(get_current_team_match)
+get_teams_async = asynchronous(get_teams)
@@ -1,8 +1,9 @@
 import os
 from datetime import date
 
+from aswe.utils.decoder import decode_json
 from aswe.utils.error import ApiLimitReached
-from aswe.utils.request import http_request, validate_api
+from aswe.utils.request import asynchronous, http_request, validate_api
 
 _HEADERS = {"x-rapidapi-key": os.getenv("SPORTS_API_KEY"), "x-rapidapi-host": "v1.handball.api-sports.io"}
 
@@ -25,7 +26,7 @@ def get_league_id(league_name: str) -> int | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
     for league in data["response"]:
         if league["name"] == league_name:
             return int(league["id"])
@@ -55,7 +56,7 @@ def get_league_teams(league_name: str) -> list[str] | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    standings = request.json()
+    standings = decode_json(request)
     table = []
     for position in standings["response"][0]:
         table.append(position["team"]["name"])
@@ -85,7 +86,7 @@ def get_league_table(league_name: str = "Bundesliga") -> list[str] | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    standings = request.json()
+    standings = decode_json(request)
     table = []
     for position in standings["response"][0]:
         table.append(f'{position["position"]}. {position["team"]["name"]} {position["points"]} points')
@@ -111,7 +112,7 @@ def get_team_id(team_name: str) -> int | None:
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
 
     if data["response"] == []:
         return None
@@ -151,7 +152,7 @@ def get_team_game_today(team_name: str, league_name: str = "Bundesliga") -> list
         return None
     if validate_api(request):
         raise ApiLimitReached("You have reached the handball API request limit for the day")
-    data = request.json()
+    data = decode_json(request)
     if data["response"] == []:
         return []
     games = []
@@ -161,3 +162,10 @@ def get_team_game_today(team_name: str, league_name: str = "Bundesliga") -> list
             f"{game['scores']['away']} {game['teams']['away']['name']}"
         )
     return games
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+get_league_teams_async = asynchronous(get_league_teams)
+get_league_table_async = asynchronous(get_league_table)
+get_team_game_today_async = asynchronous(get_team_game_today)
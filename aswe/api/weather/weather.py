@@ -7,7 +7,8 @@ from requests import JSONDecodeError
 
 from aswe.api.weather.weather_params import DynamicPeriodEnum, ElementsEnum, IncludeEnum
 from aswe.utils.date import validate_date
-from aswe.utils.request import http_request
+from aswe.utils.decoder import decode_json
+from aswe.utils.request import asynchronous, http_request
 
 _BASE_URL: Final[str] = "https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline"
 _API_KEY: str = os.getenv("WEATHER_API_KEY", "")
@@ -118,7 +119,7 @@ def historic_range(
 
     if response is not None:
         try:
-            response_json: dict[str, Any] = response.json()
+            response_json: dict[str, Any] = decode_json(response)
             return response_json
         except (AttributeError, JSONDecodeError):
             logger.error("Weather API returned invalid JSON")
@@ -170,7 +171,7 @@ def historic_day(
 
     if response is not None:
         try:
-            response_json: dict[str, Any] = response.json()
+            response_json: dict[str, Any] = decode_json(response)
             return response_json
         except (AttributeError, JSONDecodeError):
             logger.error("Weather API returned invalid JSON")
@@ -214,7 +215,7 @@ def dynamic_range(
 
     if response is not None:
         try:
-            response_json: dict[str, Any] = response.json()
+            response_json: dict[str, Any] = decode_json(response)
             return response_json
         except (AttributeError, JSONDecodeError):
             logger.error("Weather API returned invalid JSON")
@@ -283,9 +284,17 @@ def forecast(
 
     if response is not None:
         try:
-            response_json: dict[str, Any] = response.json()
+            response_json: dict[str, Any] = decode_json(response)
             return response_json
         except (AttributeError, JSONDecodeError):
             logger.error("Weather API returned invalid JSON")
 
     return None
+
+
+# Async variants, see `aswe.utils.request.asynchronous`
+
+historic_range_async = asynchronous(historic_range)
+historic_day_async = asynchronous(historic_day)
+dynamic_range_async = asynchronous(dynamic_range)
+forecast_async = asynchronous(forecast)
@@ -1,32 +1,45 @@
 import json
+import os
+import statistics
 import sys
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
+from typing import Iterator, TextIO, cast
 
-import pandas as pd
 from fire import Fire
 from loguru import logger
-from pandas.errors import IndexingError
 
+from aswe import use_cases
+from aswe.core import classify
+from aswe.core.intent import CatalogueWatcher, IntentIndex
 from aswe.core.objects import (
     Address,
     BestMatch,
     Favorites,
-    LogProactivity,
     Possessions,
     User,
 )
+from aswe.core.registry import UseCaseRegistry
+from aswe.core.scheduler import ProactiveJob, ProactivityScheduler
+from aswe.core.state import StateStore
 from aswe.core.user_interaction import SpeechToText, TextToSpeech
-from aswe.use_cases import (
-    EventUseCase,
-    GeneralUseCase,
-    MorningBriefingUseCase,
-    NavigationUseCase,
-    SportUseCase,
-)
-from aswe.utils.date import check_timedelta
+from aswe.utils.cache import ResponseStore
+from aswe.utils.cassette import Cassette, CassetteMode, configure_cassette
+from aswe.utils.limiter import background_requests
+from aswe.utils.metrics import serve_metrics
+from aswe.utils.request import configure_cache, configure_rate_limits, host_available
 from aswe.utils.shell import clear_shell, get_int, print_options
-from aswe.utils.text import calculate_similarity
+
+PROACTIVITY_JOBS = {
+    1: "events",
+    2: "morningBriefing",
+    3: "morningBriefing.wakeup",
+    4: "sport",
+    5: "navigation",
+}
 
 
 class Agent:
@@ -37,79 +50,105 @@ class Agent:
     and handle proactivity.
     """
 
-    def __init__(self, get_mic: bool = False) -> None:
+    def __init__(
+        self,
+        get_mic: bool = False,
+        headless: bool = False,
+        utterances: str = "-",
+        tts_sink: str | None = None,
+        proactivity_workers: int = 2,
+        state_path: str = "data/state.sqlite",
+        http_cache_path: str | None = "data/http_cache.sqlite",
+        metrics_port: int | None = None,
+        cassette: str | None = None,
+        cassette_mode: str = "replay",
+    ) -> None:
         """
+        In headless mode the microphone and the speech engine are replaced by text streams. This allows to drive
+        the regular dispatch code without audio hardware, e.g. to benchmark the end-to-end latency of many turns.
+
+        ```bash
+        python aswe/core/agent.py --headless=True --utterances=data/utterances.txt main
+        ```
+
+        With a cassette the API calls of a session are recorded once and replayed offline at full speed, so the
+        turn latencies of two versions can be compared on identical data:
+
+        ```bash
+        python aswe/core/agent.py --headless=True --cassette=data/cassettes/session.sqlite --cassette_mode=record main
+        python aswe/core/agent.py --headless=True --cassette=data/cassettes/session.sqlite main
+        ```
+
         Parameters
         ----------
         get_mic : bool, optional
             Boolean if the speech to text class should first ask for the microphone to use. _By default `False`_.
+        headless : bool, optional
+            Boolean if utterances should be read from text instead of the microphone and the answers written
+            to text instead of being spoken. _By default `False`_.
+        utterances : str, optional
+            Path to a file with one utterance per line, or `-` for stdin. Only used in headless mode.
+            _By default `-`_.
+        tts_sink : str | None, optional
+            Path to the file the answers are written to, `-` for stdout, or `None` to discard them.
+            Only used in headless mode. _By default `None`_.
+        proactivity_workers : int, optional
+            The number of threads the proactive jobs run on, `0` runs them in the main loop. _By default `2`_.
+        state_path : str, optional
+            Path to the SQLite database the agent state is checkpointed to, `:memory:` to not persist it.
+            _By default `data/state.sqlite`_.
+        http_cache_path : str | None, optional
+            Path to the SQLite database the API responses are persisted to, `None` to only cache them in memory.
+            _By default `data/http_cache.sqlite`_.
+        metrics_port : int | None, optional
+            Local port the HTTP metrics of the API requests are served on in the Prometheus text format (`/metrics`)
+            and as JSON (`/metrics.json`), `None` to not serve them. _By default `None`_.
+        cassette : str | None, optional
+            Path to the cassette the API calls are recorded to or replayed from, `None` to send them as usual.
+            _By default `None`_.
+        cassette_mode : str, optional
+            Either `record` or `replay`, see `CassetteMode`. _By default `replay`_.
 
         Attributes
         ----------
         assistant_name : str
             The name of the assistant
-        quotes : pd.DataFrame
-            DataFrame storing the use cases and functionality combinations
+        headless : bool
+            Boolean if the agent runs in headless mode
+        intents_watcher : CatalogueWatcher
+            Watcher to detect changes of the intent catalogue `data/quotes.json`
+        intents : IntentIndex
+            Precompiled index storing the use cases and functionality combinations
         user : User
             User class to store the user information (eg., name, age)
         stt : SpeechToText
             Speech to text class to handle speech-to-text conversion
         tts : TextToSpeech
             Text to speech class to handle text-to-speech conversion
-        log_proactivity : LogProactivity
-            Log proactivity class to handle the logging of proactivity
-        uc_general : GeneralUseCase
-            General use case class to handle general use cases
-        uc_navigation : NavigationUseCase
-            Navigation use case class to handle navigation use cases
-        uc_event : EventUseCase
-            Event use case class to handle event use cases
-        uc_sport : SportUseCase
-            Sport use case class to handle sport use cases
+        turn_durations : list[float]
+            The duration in seconds of every evaluated user turn
+        state : StateStore
+            Store which keeps the state of the use cases and the proactivity schedule across restarts
+        registry : UseCaseRegistry
+            Registry which creates the use cases (general, morningBriefing, events, navigation, sport)
+            the first time they are needed. Their modules are imported at startup to register their jobs
+        scheduler : ProactivityScheduler
+            Scheduler running the proactive jobs the use cases registered once they are due. The announcements
+            of the jobs are queued and spoken by the main loop between two turns. Jobs polling an API host whose
+            circuit is open are skipped.
         """
         self.assistant_name = "HiBuddy"
+        self.headless = headless
 
-        try:
-            with open(Path("data/quotes.json"), encoding="utf-8") as file:
-                self.quotes = (
-                    pd.DataFrame(
-                        [
-                            [use_case, choice, phrase]
-                            for use_case, value in json.load(file).items()
-                            for choice, phrase in value.items()
-                        ],
-                        columns=["use_case", "choice", "phrase"],
-                    )
-                    .explode("phrase")
-                    .reset_index(drop=True)
-                )
-        except OSError:
+        self.intents_watcher = CatalogueWatcher(Path("data/quotes.json"))
+        catalogue = self.intents_watcher.poll()
+        if catalogue is None:
             logger.error("Could not open file. Please check if the file exists.")
             sys.exit(1)
+        self.intents = IntentIndex(catalogue)
 
         try:
-            with open(Path("data/user.json"), encoding="utf-8") as file:
-                user_data = json.load(file)
-                self.user = User(
-                    name=user_data["name"],
-                    age=user_data["age"],
-                    possessions=Possessions(bike=user_data["possessions"]["bike"], car=user_data["possessions"]["car"]),
-                    address=Address(
-                        street=user_data["address"]["street"],
-                        city=user_data["address"]["city"],
-                        zip_code=user_data["address"]["zip_code"],
-                        country=user_data["address"]["country"],
-                        vvs_id=user_data["address"]["vvs_id"],
-                    ),
-                    favorites=Favorites(
-                        stocks=user_data["favorites"]["stocks"],
-                        league=user_data["favorites"]["league"],
-                        team=user_data["favorites"]["team"],
-                        news_country=user_data["favorites"]["news_country"],
-                        news_keywords=user_data["favorites"]["news_keywords"],
-                        wakeup_time=datetime.strptime(user_data["favorites"]["wakeup_time"], "%H:%M"),
-                    ),
-                )
+            self.user = self.load_user(Path("data/user.json"))
         except OSError:
             logger.error("Could not open file. Please check if the file exists.")
             sys.exit(1)
@@ -117,23 +156,150 @@ class Agent:
             logger.error("It appears that not all necessary keys are correctly set in the `user.json` file.")
             sys.exit(1)
 
-        self.stt = SpeechToText(get_mic)
-        self.tts = TextToSpeech()
-
-        self.log_proactivity = LogProactivity(
-            last_wakeup_check=datetime.now().replace(
-                hour=self.user.favorites.wakeup_time.hour,
-                minute=self.user.favorites.wakeup_time.minute,
-                second=0,
-                microsecond=0,
+        if headless:
+            self.stt = SpeechToText(get_mic, source=self._open_stream(utterances, "r"))
+            self.tts = TextToSpeech(sink=self._open_stream(tts_sink or os.devnull, "w"))
+        else:
+            self.stt = SpeechToText(get_mic)
+            self.tts = TextToSpeech()
+        self.turn_durations: list[float] = []
+
+        self.state = StateStore(state_path)
+        configure_rate_limits(state=self.state)
+        configure_cache(store=ResponseStore(http_cache_path) if http_cache_path is not None else None)
+        if metrics_port is not None:
+            serve_metrics(metrics_port)
+        if cassette is not None:
+            configure_cassette(Cassette(cassette, CassetteMode(cassette_mode)))
+        self.registry = UseCaseRegistry(self.stt, self.tts, self.assistant_name, self.user, self.state)
+        self.registry.register("general", lambda: use_cases.GeneralUseCase)
+        self.registry.register("morningBriefing", lambda: use_cases.MorningBriefingUseCase)
+        self.registry.register("events", lambda: use_cases.EventUseCase)
+        self.registry.register("navigation", lambda: use_cases.NavigationUseCase)
+        self.registry.register("sport", lambda: use_cases.SportUseCase)
+
+        self.scheduler = ProactivityScheduler(
+            proactivity_workers, context=self._job_context, state=self.state, available=host_available
+        )
+        for name in self.registry:
+            self.registry.get_class(name).register_jobs(
+                self.scheduler, name, partial(self.registry.get, name), self.user
             )
+        self._configure_proactivity(Path("data/proactivity.json"))
+
+    @staticmethod
+    def _open_stream(path: str, mode: str) -> TextIO:
+        """Opens a text stream for the headless mode
+
+        Parameters
+        ----------
+        path : str
+            The path to the file, or `-` for stdin respectively stdout.
+        mode : str
+            The mode the file is opened with, either `r` or `w`.
+
+        Returns
+        -------
+        TextIO
+            The opened text stream.
+        """
+        if path == "-":
+            return sys.stdin if mode == "r" else sys.stdout
+
+        return cast(TextIO, open(Path(path), mode, encoding="utf-8"))  # pylint: disable=consider-using-with
+
+    @staticmethod
+    def load_user(path: Path) -> User:
+        """Loads the user information from a JSON file
+
+        Parameters
+        ----------
+        path : Path
+            The path to the user file, e.g. `data/user.json`.
+
+        Returns
+        -------
+        User
+            The user information.
+
+        Raises
+        ------
+        OSError
+            If the file could not be opened.
+        KeyError
+            If not all necessary keys are set in the file.
+        """
+        with open(path, encoding="utf-8") as file:
+            user_data = json.load(file)
+
+        return User(
+            name=user_data["name"],
+            age=user_data["age"],
+            possessions=Possessions(bike=user_data["possessions"]["bike"], car=user_data["possessions"]["car"]),
+            address=Address(
+                street=user_data["address"]["street"],
+                city=user_data["address"]["city"],
+                zip_code=user_data["address"]["zip_code"],
+                country=user_data["address"]["country"],
+                vvs_id=user_data["address"]["vvs_id"],
+            ),
+            favorites=Favorites(
+                stocks=user_data["favorites"]["stocks"],
+                league=user_data["favorites"]["league"],
+                team=user_data["favorites"]["team"],
+                news_country=user_data["favorites"]["news_country"],
+                news_keywords=user_data["favorites"]["news_keywords"],
+                wakeup_time=datetime.strptime(user_data["favorites"]["wakeup_time"], "%H:%M"),
+            ),
         )
 
-        self.uc_general = GeneralUseCase(self.stt, self.tts, self.assistant_name, self.user)
-        self.uc_navigation = NavigationUseCase(self.stt, self.tts, self.assistant_name, self.user)
-        self.uc_event = EventUseCase(self.stt, self.tts, self.assistant_name, self.user)
-        self.uc_sport = SportUseCase(self.stt, self.tts, self.assistant_name, self.user)
-        self.uc_morning_briefing = MorningBriefingUseCase(self.stt, self.tts, self.assistant_name, self.user)
+    @contextmanager
+    def _job_context(self, job: ProactiveJob) -> Iterator[None]:
+        """Runs a proactive job with deferred announcements and low priority requests
+
+        Parameters
+        ----------
+        job : ProactiveJob
+            The job.
+        """
+        with self.tts.defer(job.priority), background_requests():
+            yield
+
+    def _configure_proactivity(self, path: Path) -> None:
+        """Applies the configured interval bounds to the proactive jobs
+
+        The file is optional, jobs which are not configured keep the bounds of their use case.
+
+        ??? example "`data/proactivity.json`"
+
+            ```json
+            {
+                "sport": {"min_minutes": 15, "max_minutes": 240},
+                "navigation": {"min_minutes": 5, "max_minutes": 60}
+            }
+            ```
+
+        Parameters
+        ----------
+        path : Path
+            The path to the configuration file.
+        """
+        if not path.exists():
+            return
+
+        with open(path, encoding="utf-8") as file:
+            config = json.load(file)
+
+        for name, bounds in config.items():
+            if name not in self.scheduler:
+                logger.warning(f"Could not configure the unknown proactive job `{name}`.")
+                continue
+
+            self.scheduler.configure(
+                name,
+                min_interval=timedelta(minutes=bounds["min_minutes"]) if "min_minutes" in bounds else None,
+                max_interval=timedelta(minutes=bounds["max_minutes"]) if "max_minutes" in bounds else None,
+            )
 
     def _greeting(self) -> None:
         """Function to greet the user.
@@ -149,24 +315,40 @@ class Agent:
         else:
             greeting_text = f"Good Evening {self.user.name}."
 
-        clear_shell()
+        if not self.headless:
+            clear_shell()
         self.tts.convert_text(greeting_text)
         self.tts.convert_text(f"I am your Assistant {self.assistant_name}")
 
+    def _reload_intents(self) -> None:
+        """Swaps in a new intent index if `data/quotes.json` changed
+
+        Only the use cases whose phrases changed are compiled again. The new index replaces the current one
+        in a single assignment, so it is only used from the next turn on.
+        """
+        catalogue = self.intents_watcher.poll()
+        if catalogue is None:
+            return
+
+        intents = self.intents.update(catalogue)
+        logger.info(f"Reloaded intent catalogue, compiled use cases: {intents.compiled_use_cases}")
+        self.intents = intents
+
     def _get_best_match(self, parsed_text: str, threshold: float = 0.7) -> BestMatch | None:
         """Find the best match for the parsed text
 
-        Function calculates the similarity between the parsed text and the use cases.
+        Function calculates the similarity between the parsed text and the use cases. If multiple combinations
+        share the highest similarity, the user is asked to choose one. In headless mode the first one is selected.
 
         * TODO: Add tokenization and stop words
         * TODO: Watch if the default threshold is too high
 
-        ??? example "`self.quotes` DataFrame"
+        ??? example "`self.intents` index"
 
-            The `self.quotes` consists of three columns: `use_case`, `choice` and `phrase`.
-            We use the `use_case` and `choice` column for the chain-of-responsibility pattern
-            to map the best match to the final function. The `phrase` column contains multiple phrases
-            which are going to be compared to the parsed text.
+            The `self.intents` index stores every phrase together with its `use_case` and `choice`.
+            We use the `use_case` and `choice` for the chain-of-responsibility pattern
+            to map the best match to the final function. The phrases of each combination
+            are going to be compared to the parsed text in one vectorized pass.
 
             |     | use_case        | choice       | phrase                    |
             | --- | --------------- | ------------ | ------------------------- |
@@ -197,49 +379,71 @@ class Agent:
             the similarity, and the parsed text.
         """
         logger.debug(f"Finding the best match for the parsed text: {parsed_text}")
-        logger.debug(f"The data frame contains {len(self.quotes)} rows")
+        logger.debug(f"The index contains {len(self.intents)} phrases")
         if threshold < 0 or threshold > 1:
             raise ValueError("The threshold needs to be between 0 and 1.")
 
-        temp_df: pd.DataFrame = self.quotes.copy()
+        candidates = self.intents.match(parsed_text, threshold)
+        logger.debug(f"Intent cache statistics: {self.intents.cache_info()}")
 
-        try:
-            temp_df["similarity"] = temp_df["phrase"].apply(lambda value: calculate_similarity(parsed_text, value))
-            temp_df = temp_df.iloc[
-                temp_df.groupby(["use_case", "choice"], sort=False)["similarity"].agg(pd.Series.idxmax)
-            ]
-            temp_df = temp_df[temp_df["similarity"] >= threshold].reset_index(drop=True)
-            temp_df = temp_df.loc[temp_df["similarity"] == temp_df["similarity"].max()]
-        except ValueError:
-            logger.warning("Could not find a match for the parsed text meeting the requirements.")
-            return None
-        except (KeyError, IndexingError):
-            logger.error("The data frame does not match the required schema.")
-            return None
-
-        if temp_df.empty:
+        if len(candidates) == 0:
             logger.warning("Could not find a match for the parsed text meeting the requirements.")
             return None
 
         choice = None
-        if len(temp_df) > 1:
+        if len(candidates) > 1 and self.headless:
+            # Nobody can answer in headless mode, so the first candidate is selected like in `classify_batch`
+            logger.info(f"Selected the first of {len(candidates)} matches without asking in headless mode.")
+        elif len(candidates) > 1:
             self.tts.convert_text("I got multiple matches. Please choose one.", line_above=True)
 
-            options = temp_df["phrase"].tolist()
+            options: list[str | int] = [candidate.phrase for candidate in candidates]
             print_options(options=options)
             choice = get_int(options=options)
 
-        if choice is not None or len(temp_df) == 1:
-            selected_row = temp_df.iloc[choice - 1 if choice is not None else 0]
+        if choice is not None or len(candidates) == 1 or self.headless:
+            selected = candidates[choice - 1 if choice is not None else 0]
             return BestMatch(
-                selected_row["use_case"],
-                selected_row["choice"],
-                selected_row["similarity"],
+                selected.use_case,
+                selected.choice,
+                selected.similarity,
                 parsed_text,
             )
 
         return None
 
+    def classify_batch(
+        self, texts: list[str] | str, threshold: float = 0.7, processes: int = 1
+    ) -> list[BestMatch | None]:
+        """Classify many utterances at once against the intent index of the agent without any user interaction
+
+        Delegates to `aswe.core.classify.classify_batch`. Offline evaluations without an agent use the standalone
+        entry point `aswe/core/classify.py` instead.
+
+        ```bash
+        python aswe/core/agent.py classify_batch data/utterances.txt --processes=4
+        ```
+
+        Parameters
+        ----------
+        texts : list[str] | str
+            The utterances which should be classified, or the path to a file with one utterance per line.
+        threshold : float, optional
+            The threshold which is used to determine if the similarity is high enough to be considered.
+            The value needs to be between 0 and 1. _By default `0.7`_.
+        processes : int, optional
+            The number of processes the utterances are sharded across. _By default `1`_.
+
+        Returns
+        -------
+        list[BestMatch | None]
+            The best match for each utterance, `None` if no combination meets the threshold.
+        """
+        if isinstance(texts, str):
+            texts = classify.read_utterances(texts)
+
+        return classify.classify_batch(self.intents, texts, threshold, processes)
+
     def _evaluate_use_case(self, parsed_text: str) -> None:
         """Evaluates the parsed text to trigger the correct use case
 
@@ -256,42 +460,35 @@ class Agent:
         logger.info(best_match)
 
         try:
-            match best_match.use_case:
-                case "general":
-                    self.uc_general.trigger_assistant(best_match)
-                case "morningBriefing":
-                    self.uc_morning_briefing.trigger_assistant(best_match)
-                case "events":
-                    self.uc_event.trigger_assistant(best_match)
-                case "navigation":
-                    self.uc_navigation.trigger_assistant(best_match)
-                case "sport":
-                    self.uc_sport.trigger_assistant(best_match)
-                case _:
-                    self.tts.convert_text(
-                        "I was not able to map your input to a use case. Maybe the request is not implemented yet."
-                    )
+            if best_match.use_case in self.registry:
+                self.registry.get(best_match.use_case).trigger_assistant(best_match)
+            else:
+                self.tts.convert_text(
+                    "I was not able to map your input to a use case. Maybe the request is not implemented yet."
+                )
         except NotImplementedError:
             self.tts.convert_text("Sorry, the requested function is not implemented yet.")
 
         return None
 
     def _check_proactivity(self, test_proactivity: int | None = None) -> None:
-        """Checks if there are any updates which should be announced to the user
+        """Runs the proactive jobs which are due to announce updates to the user
 
-        Checks every `60` seconds if there are any updates which should be announced to the user.
-        There is an additional option to set a separate interval for each use case.
+        The jobs are registered by the use cases and kept in a min-heap ordered by their next deadline,
+        therefore only due jobs are touched instead of polling every use case. The jobs run on worker threads,
+        their announcements are spoken by the next call in the order of their priority.
 
         ??? note "Proactivity IDs"
 
             The following table shows the IDs for the proactivity.
 
-            | ID  | Use Case         |
-            | --- | ---------------- |
-            | 1   | Event            |
-            | 2   | Morning Briefing |
-            | 3   | Sport            |
-            | 4   | Navigation       |
+            | ID  | Use Case                   |
+            | --- | -------------------------- |
+            | 1   | Event                      |
+            | 2   | Morning Briefing           |
+            | 3   | Morning Briefing (wakeup)  |
+            | 4   | Sport                      |
+            | 5   | Navigation                 |
 
         Parameters
         ----------
@@ -300,48 +497,29 @@ class Agent:
         """
         logger.debug("Checking for proactivity.")
 
-        try:
-            if check_timedelta(self.log_proactivity.last_event_check, 15) or test_proactivity == 1:
-                logger.info("Triggered proactivity for events.")
-                self.log_proactivity.last_event_check = datetime.now()
-                self.uc_event.check_proactivity()
-        except NotImplementedError:
-            logger.warning("Proactivity for events is not implemented yet.")
-
-        if check_timedelta(self.log_proactivity.last_morning_briefing_check, 15) or test_proactivity == 2:
-            logger.debug("Triggering proactivity for morning briefing.")
-            self.uc_morning_briefing.check_proactivity()
-        if check_timedelta(self.log_proactivity.last_wakeup_check, 1440) or test_proactivity == 3:
-            logger.debug("Triggering proactivity for morning briefing (wakeup).")
-            self.uc_morning_briefing.full_briefing()
-
-        try:
-            if check_timedelta(self.log_proactivity.last_sport_check, 15) or test_proactivity == 4:
-                logger.info("Triggered proactivity for sport.")
-                self.log_proactivity.last_sport_check = datetime.now()
-                self.uc_sport.check_proactivity()
-        except NotImplementedError:
-            logger.warning("Proactivity for sport is not implemented yet.")
+        if test_proactivity is not None and PROACTIVITY_JOBS.get(test_proactivity) in self.scheduler:
+            self.scheduler.run(PROACTIVITY_JOBS[test_proactivity])
+            self.scheduler.join()
 
-        if check_timedelta(self.log_proactivity.last_navigation_check, 5) or test_proactivity == 5:
-            logger.info("Triggered proactivity for navigation.")
-            self.log_proactivity.last_navigation_check = datetime.now()
-            self.uc_navigation.check_proactivity()
+        self.scheduler.run_due()
+        self.tts.drain()
 
     def main(self, test_proactivity: int | None = None) -> None:
         """Main function to interact with the user
 
         The agent function is the main function of the assistant. It first greets the user and
-        then checks proactively if there are updates for the user. If thats not the case, it will start
-        listening for user input in `60` second intervals. If the user input is not empty, it will
-        execute the use case function for proactivity.
+        then runs the proactive jobs which are due and speaks the announcements of finished jobs. Afterwards it
+        listens for user input until the next job is due, but at most `60` seconds (`5` seconds while jobs are
+        running, so their announcements are not delayed). If the user input is not empty, it will execute the
+        matching use case.
 
-        The `threading` library seems to be not compatible with some python version
-        ([documentation](https://docs.python.org/3/library/threading.html)). Therefore it will be removed
-        and the agent will be executed in a single thread.
+        The user interaction runs in the calling thread, while the proactive jobs run on the worker threads of
+        the `ProactivityScheduler`. Their announcements are queued and spoken between two turns.
 
         * TODO: Add hotword detection
 
+        In headless mode the loop ends once all utterances are read and a summary of the turn durations is logged.
+
         Parameters
         ----------
         test_proactivity : int | None, optional
@@ -353,16 +531,32 @@ class Agent:
             logger.info("Proactivity is triggered for test purposes.")
             self._check_proactivity(test_proactivity)
 
-        while True:
-            if check_timedelta(self.log_proactivity.last_check, 1):
+        try:
+            while True:
                 self._check_proactivity()
-
-            query = self.stt.convert_speech(line_above=True)
-            if not query:
-                logger.info("No input detected. Please try again.")
-                continue
-            parsed_text = query.lower()
-            self._evaluate_use_case(parsed_text)
+                self._reload_intents()
+
+                timeout = self.scheduler.seconds_until_next_deadline(maximum=60 if not self.scheduler.running else 5)
+                query = self.stt.convert_speech(line_above=True, timeout=timeout)
+                if not query:
+                    logger.info("No input detected. Please try again.")
+                    continue
+                parsed_text = query.lower()
+
+                start = time.perf_counter()
+                self._evaluate_use_case(parsed_text)
+                self.turn_durations.append(time.perf_counter() - start)
+        except EOFError:
+            logger.info("All utterances were processed.")
+        finally:
+            self.scheduler.shutdown()
+
+        if len(self.turn_durations) > 0:
+            logger.info(
+                f"Evaluated {len(self.turn_durations)} turns in {sum(self.turn_durations):.3f} seconds "
+                f"(mean {statistics.mean(self.turn_durations) * 1000:.3f} ms, "
+                f"max {max(self.turn_durations) * 1000:.3f} ms)"
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,137 @@
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from fire import Fire
+
+from aswe.utils.cache import ResponseStore
+from aswe.utils.decoder import STDLIB_DECODER, JsonDecoder, fast_decoder
+
+
+def load_payloads(path: str | Path) -> dict[str, list[bytes]]:
+    """Loads recorded response bodies grouped by provider
+
+    Payloads are read from the HTTP cache of the agent (`data/http_cache.sqlite`), which keeps the bodies of the
+    API responses of previous runs, or from a recorded session of `aswe/core/replay.py`.
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to a SQLite response store or a recorded session as JSON.
+
+    Returns
+    -------
+    dict[str, list[bytes]]
+        The bodies by host of the API.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the response store does not exist.
+    """
+    payloads: dict[str, list[bytes]] = {}
+    if Path(path).suffix == ".json":
+        with open(Path(path), encoding="utf-8") as file:
+            session = json.load(file)
+        for url, canned in session.get("responses", {}).items():
+            payloads.setdefault(urlsplit(url).netloc, []).append(json.dumps(canned["json"]).encode("utf-8"))
+    elif Path(path).is_file():
+        store = ResponseStore(path)
+        for response in store.responses():
+            payloads.setdefault(urlsplit(response.url or "").netloc, []).append(response.content)
+        store.close()
+    else:
+        raise FileNotFoundError(f"No recorded payloads at {path}")
+
+    return payloads
+
+
+def time_decoder(decoder: JsonDecoder, payloads: list[bytes], repeat: int = 50) -> float:
+    """Measures the time a decoder needs to decode payloads
+
+    Parameters
+    ----------
+    decoder : JsonDecoder
+        The decoder which should be measured.
+    payloads : list[bytes]
+        The bodies which are decoded.
+    repeat : int, optional
+        The number of measurements, the median is reported. _By default `50`_.
+
+    Returns
+    -------
+    float
+        The median duration in microseconds to decode all payloads once.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            decoder.loads(payload)
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations) * 1_000_000
+
+
+def benchmark_decoders(
+    payloads: dict[str, list[bytes]], baseline: JsonDecoder = STDLIB_DECODER, candidate: JsonDecoder | None = None
+) -> dict[str, Any]:
+    """Compares the parse time of two decoders per provider
+
+    Parameters
+    ----------
+    payloads : dict[str, list[bytes]]
+        The bodies by provider, see `load_payloads`.
+    baseline : JsonDecoder, optional
+        The decoder the saving is measured against. _By default the standard library_.
+    candidate : JsonDecoder | None, optional
+        The decoder which should be faster. _By default `fast_decoder()`, the baseline if it is not installed_.
+
+    Returns
+    -------
+    dict[str, Any]
+        The names of the decoders and per provider the number and size of the payloads, both durations and the
+        saving in percent.
+    """
+    candidate = candidate or fast_decoder() or baseline
+    providers = {}
+    for provider, bodies in sorted(payloads.items()):
+        baseline_us = time_decoder(baseline, bodies)
+        candidate_us = time_decoder(candidate, bodies)
+        providers[provider] = {
+            "payloads": len(bodies),
+            "bytes": sum(len(body) for body in bodies),
+            "baseline_us": round(baseline_us, 1),
+            "candidate_us": round(candidate_us, 1),
+            "saving_percent": round((1 - candidate_us / baseline_us) * 100, 1) if baseline_us else 0.0,
+        }
+
+    return {"baseline": baseline.name, "candidate": candidate.name, "providers": providers}
+
+
+def benchmark_file(path: str = "data/http_cache.sqlite") -> str:
+    """Benchmarks the JSON decoders on recorded payloads and returns the report as JSON
+
+    ```bash
+    python aswe/core/benchmark.py data/replay/sample_session.json
+    ```
+
+    Parameters
+    ----------
+    path : str, optional
+        The path to a SQLite response store or a recorded session as JSON. _By default the HTTP cache of the
+        agent_.
+
+    Returns
+    -------
+    str
+        The report as JSON.
+    """
+    return json.dumps(benchmark_decoders(load_payloads(path)), indent=2)
+
+
+if __name__ == "__main__":
+    Fire(benchmark_file)
@@ -0,0 +1,127 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+
+from fire import Fire
+from loguru import logger
+
+from aswe.core.intent import CatalogueWatcher, IntentIndex
+from aswe.core.objects import BestMatch
+
+
+def classify_batch(
+    intents: IntentIndex, texts: list[str], threshold: float = 0.7, processes: int = 1
+) -> list[BestMatch | None]:
+    """Classify many utterances at once without any user interaction
+
+    All utterances are scored against the precompiled intent index in vectorized chunks. In contrast to
+    `Agent._get_best_match`, the first candidate is selected if multiple combinations share the highest similarity.
+
+    Parameters
+    ----------
+    intents : IntentIndex
+        The index of the intent catalogue.
+    texts : list[str]
+        The utterances which should be classified.
+    threshold : float, optional
+        The threshold which is used to determine if the similarity is high enough to be considered.
+        The value needs to be between 0 and 1. _By default `0.7`_.
+    processes : int, optional
+        The number of processes the utterances are sharded across. _By default `1`_.
+
+    Raises
+    ------
+    ValueError
+        If the threshold is not between 0 and 1.
+
+    Returns
+    -------
+    list[BestMatch | None]
+        The best match for each utterance, `None` if no combination meets the threshold.
+    """
+    if threshold < 0 or threshold > 1:
+        raise ValueError("The threshold needs to be between 0 and 1.")
+
+    logger.info(f"Classifying {len(texts)} utterances using {processes} process(es)")
+
+    if processes > 1 and len(texts) > 1:
+        shard_size = -(-len(texts) // processes)
+        shards = [texts[start : start + shard_size] for start in range(0, len(texts), shard_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = [
+                candidates
+                for shard in executor.map(partial(intents.match_batch, threshold=threshold), shards)
+                for candidates in shard
+            ]
+    else:
+        results = intents.match_batch(texts, threshold)
+
+    return [
+        BestMatch(candidates[0].use_case, candidates[0].choice, candidates[0].similarity, text)
+        if len(candidates) > 0
+        else None
+        for text, candidates in zip(texts, results)
+    ]
+
+
+def read_utterances(path: str) -> list[str]:
+    """Reads logged utterances from a file
+
+    Parameters
+    ----------
+    path : str
+        The path to a file with one utterance per line.
+
+    Returns
+    -------
+    list[str]
+        The utterances without empty lines.
+    """
+    with open(Path(path), encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def classify_file(
+    texts: list[str] | str, threshold: float = 0.7, processes: int = 1, catalogue: str = "data/quotes.json"
+) -> str:
+    """Classifies logged utterances offline and returns the best matches as JSON
+
+    Intended for offline evaluation, e.g. to re-score logged utterances after `data/quotes.json` changed. Only
+    the intent catalogue is loaded, so no speech interfaces, stores or API sessions are set up. This is a separate
+    entry point, because Fire creates the `Agent` before running any of its subcommands. A running agent classifies
+    batches against its own index with `Agent.classify_batch`.
+
+    ```bash
+    python aswe/core/classify.py data/utterances.txt --processes=4 > matches.json
+    ```
+
+    Parameters
+    ----------
+    texts : list[str] | str
+        The utterances which should be classified, or the path to a file with one utterance per line.
+    threshold : float, optional
+        The threshold which is used to determine if the similarity is high enough to be considered.
+        The value needs to be between 0 and 1. _By default `0.7`_.
+    processes : int, optional
+        The number of processes the utterances are sharded across. _By default `1`_.
+    catalogue : str, optional
+        The path to the intent catalogue. _By default `data/quotes.json`_.
+
+    Returns
+    -------
+    str
+        The best match of each utterance as JSON, `null` if no combination meets the threshold.
+    """
+    if isinstance(texts, str):
+        texts = read_utterances(texts)
+
+    intents = IntentIndex(CatalogueWatcher(Path(catalogue)).poll() or {})
+    best_matches = classify_batch(intents, texts, threshold, processes)
+
+    return json.dumps([asdict(match) if match is not None else None for match in best_matches], indent=2)
+
+
+if __name__ == "__main__":
+    Fire(classify_file)
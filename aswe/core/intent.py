@@ -0,0 +1,564 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import _CacheInfo, lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from loguru import logger
+
+from aswe.utils.text import InvertedIndex
+
+
+@dataclass(frozen=True)
+class IntentCandidate:
+    """Dataclass to store a scored `(use_case, choice)` combination.
+
+    Attributes
+    ----------
+    use_case : str
+        The name of the use case.
+    choice : str
+        The key of the function within the use case.
+    phrase : str
+        The phrase of the combination which matched the parsed text best.
+    similarity : float
+        The similarity between the parsed text and the phrase.
+    """
+
+    use_case: str
+    choice: str
+    phrase: str
+    similarity: float
+
+
+@dataclass(frozen=True)
+class _UseCaseBlock:
+    """Compiled phrases of a single use case
+
+    Blocks are immutable and shared between indices, so an updated catalogue only has to compile the use cases
+    whose phrases changed.
+
+    Attributes
+    ----------
+    choices : dict[str, list[str]]
+        The catalogue entry of the use case the block was compiled from.
+    phrases : list[str]
+        All phrases of the use case.
+    groups : list[str]
+        All choices of the use case which have at least one phrase.
+    group_starts : list[int]
+        The index of the first phrase of each choice within the block.
+    counts : npt.NDArray[np.int32]
+        The character counts of each phrase. The block only has columns for the characters known when it was
+        compiled, later characters are appended as zero columns when the index is assembled.
+    inverted_index : InvertedIndex | None
+        Index over the tokens and trigrams of the phrases, `None` if pruning is disabled.
+    """
+
+    choices: dict[str, list[str]]
+    phrases: list[str]
+    groups: list[str]
+    group_starts: list[int]
+    counts: npt.NDArray[np.int32]
+    inverted_index: InvertedIndex | None
+
+
+class IntentIndex:
+    """Precompiled index over all phrases of the intent catalogue (`data/quotes.json`)
+
+    Every phrase is stored as a character count vector in one NumPy matrix. The similarity of a parsed text to
+    all phrases is then calculated in a single vectorized pass. The score is identical to
+    `SequenceMatcher.quick_ratio`, which is used by `aswe.utils.text.calculate_similarity`: twice the number of
+    shared characters divided by the total number of characters of both strings.
+
+    With pruning enabled, an `InvertedIndex` over the tokens and character trigrams of the phrases first selects
+    the phrases sharing material with the parsed text. Only those are scored, all other phrases get a
+    similarity of `0`.
+
+    Results of `match` are memoized in a bounded LRU cache keyed on the normalized parsed text and the threshold.
+    As the index is immutable, a changed catalogue results in a new index and therefore in an empty cache.
+
+    The phrases are compiled per use case. `update` builds a new index for a changed catalogue which reuses the
+    compiled blocks of all unchanged use cases.
+
+    ??? example "Layout of the index"
+
+        Phrases are stored in the order of the catalogue, therefore all phrases of a `(use_case, choice)`
+        combination are contiguous and can be reduced with `np.maximum.reduceat`.
+
+        |     | use_case        | choice       | phrase           | group |
+        | --- | --------------- | ------------ | ---------------- | ----- |
+        | 0   | morningBriefing | fullBriefing | morning briefing | 0     |
+        | 1   | morningBriefing | fullBriefing | good morning     | 0     |
+        | 2   | morningBriefing | news         | news             | 1     |
+    """
+
+    def __init__(
+        self,
+        catalogue: dict[str, dict[str, list[str]]],
+        prune: bool = True,
+        full_scan_fallback: bool = True,
+        cache_size: int | None = 256,
+        previous: "IntentIndex | None" = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        catalogue : dict[str, dict[str, list[str]]]
+            The intent catalogue mapping each use case to its choices and the choices to their phrases.
+        prune : bool, optional
+            If only phrases sharing a token or trigram with the parsed text should be scored. _By default `True`_.
+        full_scan_fallback : bool, optional
+            If all phrases should be scored when pruning leaves no candidate. _By default `True`_.
+        cache_size : int | None, optional
+            The maximal number of memoized results of `match`, `None` for no limit. _By default `256`_.
+        previous : IntentIndex | None, optional
+            An index of a previous version of the catalogue whose blocks are reused for unchanged use cases.
+            _By default `None`_.
+
+        Attributes
+        ----------
+        phrases : list[str]
+            All phrases of the catalogue.
+        groups : list[tuple[str, str]]
+            All `(use_case, choice)` combinations which have at least one phrase.
+        alphabet : dict[str, int]
+            Mapping of every character which occurs in a phrase to its column in the count matrix.
+        counts : npt.NDArray[np.int32]
+            Matrix of shape `(len(phrases), len(alphabet))` with the character counts of each phrase.
+        lengths : npt.NDArray[np.int32]
+            The length of each phrase.
+        group_starts : npt.NDArray[np.intp]
+            The index of the first phrase of each group.
+        compiled_use_cases : list[str]
+            The use cases which had to be compiled, as opposed to being reused from `previous`.
+        """
+        self.prune = prune
+        self.full_scan_fallback = full_scan_fallback
+
+        self.alphabet: dict[str, int] = dict(previous.alphabet) if previous is not None else {}
+        self.compiled_use_cases: list[str] = []
+        self._blocks: dict[str, _UseCaseBlock] = {}
+
+        for use_case, choices in catalogue.items():
+            block = previous._blocks.get(use_case) if previous is not None else None
+            if block is None or block.choices != choices or (block.inverted_index is not None) != prune:
+                block = self._compile_block(choices)
+                self.compiled_use_cases.append(use_case)
+            self._blocks[use_case] = block
+
+        self.phrases: list[str] = []
+        self.groups: list[tuple[str, str]] = []
+        self._block_offsets: list[tuple[_UseCaseBlock, int]] = []
+        group_starts: list[int] = []
+        counts: list[npt.NDArray[np.int32]] = []
+
+        for use_case, block in self._blocks.items():
+            offset = len(self.phrases)
+            self._block_offsets.append((block, offset))
+            self.groups.extend((use_case, choice) for choice in block.groups)
+            group_starts.extend(offset + start for start in block.group_starts)
+            self.phrases.extend(block.phrases)
+            counts.append(np.pad(block.counts, ((0, 0), (0, len(self.alphabet) - block.counts.shape[1]))))
+
+        self.counts: npt.NDArray[np.int32] = (
+            np.vstack(counts) if len(counts) > 0 else np.zeros((0, len(self.alphabet)), dtype=np.int32)
+        )
+        self.lengths: npt.NDArray[np.int32] = self.counts.sum(axis=1, dtype=np.int32)
+        self.group_starts: npt.NDArray[np.intp] = np.array(group_starts, dtype=np.intp)
+
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _compile_block(self, choices: dict[str, list[str]]) -> _UseCaseBlock:
+        """Compiles the phrases of a single use case and extends the alphabet by unknown characters
+
+        Parameters
+        ----------
+        choices : dict[str, list[str]]
+            The choices of the use case mapped to their phrases.
+
+        Returns
+        -------
+        _UseCaseBlock
+            The compiled block.
+        """
+        phrases: list[str] = []
+        groups: list[str] = []
+        group_starts: list[int] = []
+
+        for choice, choice_phrases in choices.items():
+            if len(choice_phrases) == 0:
+                continue
+            groups.append(choice)
+            group_starts.append(len(phrases))
+            phrases.extend(choice_phrases)
+
+        for phrase in phrases:
+            for character in phrase:
+                self.alphabet.setdefault(character, len(self.alphabet))
+
+        counts = np.zeros((len(phrases), len(self.alphabet)), dtype=np.int32)
+        for row, phrase in enumerate(phrases):
+            np.add.at(counts[row], [self.alphabet[character] for character in phrase], 1)
+
+        return _UseCaseBlock(
+            choices=choices,
+            phrases=phrases,
+            groups=groups,
+            group_starts=group_starts,
+            counts=counts,
+            inverted_index=InvertedIndex(phrases, full_scan_fallback=False) if self.prune else None,
+        )
+
+    def update(self, catalogue: dict[str, dict[str, list[str]]]) -> "IntentIndex":
+        """Builds an index for a changed catalogue
+
+        Only the use cases whose phrases changed are compiled again, all other blocks are reused.
+        The current index is not modified, so it can keep serving requests until the new index is swapped in.
+
+        Parameters
+        ----------
+        catalogue : dict[str, dict[str, list[str]]]
+            The changed intent catalogue.
+
+        Returns
+        -------
+        IntentIndex
+            The new index with the same settings and an empty match cache.
+        """
+        return IntentIndex(
+            catalogue,
+            prune=self.prune,
+            full_scan_fallback=self.full_scan_fallback,
+            cache_size=self.cache_info().maxsize,
+            previous=self,
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs: Any) -> "IntentIndex":
+        """Builds the index from a JSON file
+
+        Parameters
+        ----------
+        path : str | Path
+            The path to the intent catalogue, e.g. `data/quotes.json`.
+        **kwargs : Any
+            Further keyword arguments passed to the constructor.
+
+        Returns
+        -------
+        IntentIndex
+            The compiled index.
+
+        Raises
+        ------
+        OSError
+            If the file could not be opened.
+        """
+        with open(Path(path), encoding="utf-8") as file:
+            catalogue: dict[str, Any] = json.load(file)
+
+        return cls(catalogue, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_cached_match"] = self._cached_match.cache_info().maxsize
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        cache_size = state.pop("_cached_match")
+        self.__dict__.update(state)
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def vectorize(self, text: str) -> npt.NDArray[np.int32]:
+        """Converts a text into a character count vector matching the columns of the index
+
+        Characters which do not occur in any phrase are ignored, as they can not contribute to a match.
+
+        Parameters
+        ----------
+        text : str
+            The text which should be vectorized.
+
+        Returns
+        -------
+        npt.NDArray[np.int32]
+            The character count vector of the text.
+        """
+        vector = np.zeros(len(self.alphabet), dtype=np.int32)
+        columns = [self.alphabet[character] for character in text if character in self.alphabet]
+        np.add.at(vector, columns, 1)
+
+        return vector
+
+    def score(self, parsed_text: str) -> npt.NDArray[np.float64]:
+        """Calculates the similarity between the parsed text and every phrase
+
+        Parameters
+        ----------
+        parsed_text : str
+            The parsed text from the user input.
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            The similarity to each phrase, in the order of `phrases`.
+        """
+        if not self.prune:
+            return self._score_rows(parsed_text, slice(None))
+
+        candidate_rows = [
+            offset + row
+            for block, offset in self._block_offsets
+            if block.inverted_index is not None
+            for row in block.inverted_index.candidates(parsed_text)
+        ]
+        if len(candidate_rows) == 0 and self.full_scan_fallback:
+            return self._score_rows(parsed_text, slice(None))
+
+        rows = np.array(candidate_rows, dtype=np.intp)
+        scores = np.zeros(len(self.phrases), dtype=np.float64)
+        if len(rows) > 0:
+            scores[rows] = self._score_rows(parsed_text, rows)
+
+        return scores
+
+    def _score_rows(self, parsed_text: str, rows: npt.NDArray[np.intp] | slice) -> npt.NDArray[np.float64]:
+        """Calculates the similarity between the parsed text and the selected phrases
+
+        Parameters
+        ----------
+        parsed_text : str
+            The parsed text from the user input.
+        rows : npt.NDArray[np.intp] | slice
+            The rows of the phrases which should be scored.
+
+        Returns
+        -------
+        npt.NDArray[np.float64]
+            The similarity to each selected phrase.
+        """
+        total_lengths = self.lengths[rows] + len(parsed_text)
+        matches = np.minimum(self.counts[rows], self.vectorize(parsed_text)).sum(axis=1)
+
+        return np.divide(
+            2.0 * matches,
+            total_lengths,
+            out=np.ones(len(total_lengths), dtype=np.float64),
+            where=total_lengths > 0,
+        )
+
+    @staticmethod
+    def normalize(parsed_text: str) -> str:
+        """Normalizes the parsed text to lower case with single spaces between words
+
+        Parameters
+        ----------
+        parsed_text : str
+            The parsed text from the user input.
+
+        Returns
+        -------
+        str
+            The normalized text.
+        """
+        return " ".join(parsed_text.lower().split())
+
+    def cache_info(self) -> _CacheInfo:
+        """Returns the hit and miss counters of the match cache
+
+        Returns
+        -------
+        _CacheInfo
+            Named tuple with `hits`, `misses`, `maxsize` and `currsize`.
+        """
+        return self._cached_match.cache_info()
+
+    def clear_cache(self) -> None:
+        """Removes all memoized results and resets the counters of the match cache"""
+        self._cached_match.cache_clear()
+
+    def match(self, parsed_text: str, threshold: float = 0.7) -> list[IntentCandidate]:
+        """Finds all `(use_case, choice)` combinations sharing the highest similarity above the threshold
+
+        For every combination only the phrase with the highest similarity is considered. If several phrases
+        of the same combination share that similarity, the first one is used. The parsed text is normalized
+        before matching and the result is memoized.
+
+        Parameters
+        ----------
+        parsed_text : str
+            The parsed text which should be matched to a use case.
+        threshold : float, optional
+            The minimal similarity a combination needs to be considered. _By default `0.7`_.
+
+        Returns
+        -------
+        list[IntentCandidate]
+            All combinations with the highest similarity, in the order of the catalogue.
+            The list is empty if no combination reaches the threshold.
+        """
+        return list(self._cached_match(self.normalize(parsed_text), threshold))
+
+    def _match(self, parsed_text: str, threshold: float) -> tuple[IntentCandidate, ...]:
+        """Uncached implementation of `match`
+
+        Parameters
+        ----------
+        parsed_text : str
+            The normalized parsed text.
+        threshold : float
+            The minimal similarity a combination needs to be considered.
+
+        Returns
+        -------
+        tuple[IntentCandidate, ...]
+            All combinations with the highest similarity, in the order of the catalogue.
+        """
+        if len(self.phrases) == 0:
+            return ()
+
+        return self._select(self.score(parsed_text), threshold)
+
+    def _select(self, scores: npt.NDArray[np.float64], threshold: float) -> tuple[IntentCandidate, ...]:
+        """Selects the combinations sharing the highest similarity above the threshold
+
+        Parameters
+        ----------
+        scores : npt.NDArray[np.float64]
+            The similarity to each phrase, in the order of `phrases`.
+        threshold : float
+            The minimal similarity a combination needs to be considered.
+
+        Returns
+        -------
+        tuple[IntentCandidate, ...]
+            All combinations with the highest similarity, in the order of the catalogue.
+        """
+        group_maxima = np.maximum.reduceat(scores, self.group_starts)
+
+        best = group_maxima.max()
+        if best < threshold:
+            return ()
+
+        group_ends = np.append(self.group_starts[1:], len(self.phrases))
+        candidates = []
+        for group in np.flatnonzero(group_maxima == best):
+            start, end = self.group_starts[group], group_ends[group]
+            row = start + int(np.argmax(scores[start:end]))
+            use_case, choice = self.groups[group]
+            candidates.append(IntentCandidate(use_case, choice, self.phrases[row], float(scores[row])))
+
+        return tuple(candidates)
+
+    def match_batch(
+        self, texts: list[str], threshold: float = 0.7, chunk_size: int = 64
+    ) -> list[list[IntentCandidate]]:
+        """Matches many parsed texts at once
+
+        The texts are vectorized into one matrix and scored against all phrases chunk by chunk. Pruning and the
+        match cache are bypassed, therefore the scores equal `calculate_similarity` for every phrase.
+
+        Parameters
+        ----------
+        texts : list[str]
+            The parsed texts which should be matched to a use case.
+        threshold : float, optional
+            The minimal similarity a combination needs to be considered. _By default `0.7`_.
+        chunk_size : int, optional
+            The number of texts which are scored in one vectorized pass. Limits the size of the intermediate
+            matrix of shape `(chunk_size, len(phrases), len(alphabet))`. _By default `64`_.
+
+        Returns
+        -------
+        list[list[IntentCandidate]]
+            The candidates of each text, see `match`.
+        """
+        normalized_texts = [self.normalize(text) for text in texts]
+        if len(self.phrases) == 0:
+            return [[] for _ in normalized_texts]
+
+        results: list[list[IntentCandidate]] = []
+        for chunk_start in range(0, len(normalized_texts), chunk_size):
+            chunk = normalized_texts[chunk_start : chunk_start + chunk_size]
+
+            queries = np.stack([self.vectorize(text) for text in chunk])
+            text_lengths = np.array([len(text) for text in chunk], dtype=np.int32)
+
+            matches = np.minimum(self.counts[np.newaxis, :, :], queries[:, np.newaxis, :]).sum(axis=2)
+            total_lengths = self.lengths[np.newaxis, :] + text_lengths[:, np.newaxis]
+            scores = np.divide(
+                2.0 * matches,
+                total_lengths,
+                out=np.ones(matches.shape, dtype=np.float64),
+                where=total_lengths > 0,
+            )
+
+            results.extend(list(self._select(row, threshold)) for row in scores)
+
+        return results
+
+
+class CatalogueWatcher:
+    """Class to detect changes of the intent catalogue file
+
+    A change is detected in two steps. The modification time is checked on every poll, which only costs a `stat`.
+    Only if it changed, the file is read and its SHA-256 hash is compared to the last loaded version.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Parameters
+        ----------
+        path : str | Path
+            The path to the intent catalogue, e.g. `data/quotes.json`.
+
+        Attributes
+        ----------
+        mtime : int | None
+            The modification time of the last seen version in nanoseconds, `None` if it was never read.
+        digest : str | None
+            The SHA-256 hash of the last loaded version, `None` if it was never loaded.
+        """
+        self.path = Path(path)
+        self.mtime: int | None = None
+        self.digest: str | None = None
+
+    def poll(self) -> dict[str, dict[str, list[str]]] | None:
+        """Loads the catalogue if it changed since the last poll
+
+        Returns
+        -------
+        dict[str, dict[str, list[str]]] | None
+            The changed catalogue, or `None` if the file did not change or could not be loaded.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self.mtime:
+                return None
+
+            content = self.path.read_bytes()
+        except OSError:
+            logger.error(f"Could not read the intent catalogue `{self.path}`.")
+            return None
+
+        self.mtime = mtime
+        digest = hashlib.sha256(content).hexdigest()
+        if digest == self.digest:
+            return None
+
+        try:
+            catalogue: dict[str, dict[str, list[str]]] = json.loads(content)
+        except json.JSONDecodeError:
+            logger.error(f"The intent catalogue `{self.path}` is not valid JSON. Keeping the previous version.")
+            return None
+
+        self.digest = digest
+        return catalogue
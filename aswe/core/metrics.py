@@ -0,0 +1,38 @@
+import json
+
+import requests
+from fire import Fire
+
+
+def dump_metrics(port: int = 9464, host: str = "127.0.0.1", timeout: float = 5.0) -> str:
+    """Fetches the HTTP metrics of a running agent and returns them as JSON
+
+    The agent has to be started with a metrics port:
+
+    ```bash
+    python aswe/core/agent.py --metrics_port=9464 main
+    python aswe/core/metrics.py --port=9464 > metrics.json
+    ```
+
+    Parameters
+    ----------
+    port : int, optional
+        The port the agent serves its metrics on. _By default `9464`_.
+    host : str, optional
+        The address of the agent. _By default `127.0.0.1`_.
+    timeout : float, optional
+        The time in seconds to wait for the agent. _By default `5.0`_.
+
+    Returns
+    -------
+    str
+        The metrics per host and endpoint as JSON, see `RequestMetrics.snapshot`.
+    """
+    response = requests.get(f"http://{host}:{port}/metrics.json", timeout=timeout)
+    response.raise_for_status()
+
+    return json.dumps(response.json(), indent=2)
+
+
+if __name__ == "__main__":
+    Fire(dump_metrics)
@@ -1,33 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-
-
-@dataclass
-class LogProactivity:
-    """A class to keep track of the last time proactivity was triggered
-
-    Attributes
-    ----------
-    last_check : datetime
-        The last time proactivity was triggered
-    last_event_check : datetime
-        The last time the event use case was triggered
-    last_morning_briefing_check : datetime
-        The last time the morning briefing was triggered
-    last_wakeup_check : datetime
-        The last time the wakeup in morning briefing was triggered
-    last_sport_check : datetime
-        The last time the sport use case was triggered
-    last_navigation_check : datetime
-        The last time the navigation use case was triggered
-    """
-
-    last_check: datetime = datetime.now()
-    last_event_check: datetime = datetime.now()
-    last_morning_briefing_check: datetime = datetime.now()
-    last_wakeup_check: datetime = datetime.now()
-    last_sport_check: datetime = datetime.now()
-    last_navigation_check: datetime = datetime.now()
+from typing import Any, Callable
 
 
 @dataclass
@@ -145,3 +118,37 @@ class User:
     address: Address
     possessions: Possessions
     favorites: Favorites
+
+
+@dataclass(order=True)
+class Announcement:
+    """Dataclass to store an announcement of a proactive job until the agent speaks it.
+
+    Announcements are ordered by `priority`, then by `batch` and `index`, so all announcements of one job run
+    are spoken together and in the order they were made.
+
+    Attributes
+    ----------
+    priority : int
+        The priority of the announcement, lower values are spoken first.
+    batch : int
+        The number of the job run which made the announcement.
+    index : int
+        The position of the announcement within its batch.
+    text : str
+        The text which should be spoken.
+    options : dict[str, Any]
+        Keyword arguments for `TextToSpeech.convert_text`.
+    line_above : bool
+        If a new line should be printed before the text.
+    follow_up : Callable[[], None] | None
+        Function which is called instead of speaking a text, e.g. to ask the user a question.
+    """
+
+    priority: int
+    batch: int
+    index: int
+    text: str = field(default="", compare=False)
+    options: dict[str, Any] = field(default_factory=dict, compare=False)
+    line_above: bool = field(default=False, compare=False)
+    follow_up: Callable[[], None] | None = field(default=None, compare=False)
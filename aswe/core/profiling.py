@@ -0,0 +1,132 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from fire import Fire
+
+from aswe.core.agent import Agent
+from aswe.core.intent import CatalogueWatcher, IntentIndex
+from aswe.core.user_interaction import SpeechToText, TextToSpeech
+
+
+def parse_import_times(output: str, min_cumulative_us: int = 0) -> list[dict[str, Any]]:
+    """Parses the output of `python -X importtime` into a tree
+
+    Python prints each module after all modules it imported, indented by two spaces per nesting level.
+    Therefore the children of a module are collected until the module itself is printed.
+
+    Parameters
+    ----------
+    output : str
+        The `stderr` output of `python -X importtime`.
+    min_cumulative_us : int, optional
+        Modules with a smaller cumulative import time are omitted, including their children. _By default `0`_.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The top level modules with `module`, `self_us`, `cumulative_us` and `children`.
+    """
+    pending: dict[int, list[dict[str, Any]]] = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        node: dict[str, Any] = {
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "children": pending.pop(depth + 1, []),
+        }
+        if node["cumulative_us"] >= min_cumulative_us:
+            pending.setdefault(depth, []).append(node)
+
+    return pending.get(0, [])
+
+
+def _measure(function: Callable[[], Any]) -> dict[str, Any]:
+    """Measures the wall time of a function call
+
+    Parameters
+    ----------
+    function : Callable[[], Any]
+        The function which should be measured.
+
+    Returns
+    -------
+    dict[str, Any]
+        The duration in milliseconds and, if the call failed, the error.
+    """
+    start = time.perf_counter()
+    try:
+        function()
+        error = None
+    except Exception as err:
+        error = f"{type(err).__name__}: {err}"
+
+    result: dict[str, Any] = {"duration_ms": round((time.perf_counter() - start) * 1000, 3)}
+    if error is not None:
+        result["error"] = error
+
+    return result
+
+
+def profile_startup(module: str = "aswe.core.agent", min_import_us: int = 1000) -> str:
+    """Profiles the startup of the agent and returns the report as JSON
+
+    The import tree is measured in a fresh interpreter with `python -X importtime`. Loading the data files and
+    initializing the speech interfaces is measured in the current process, the same way `Agent.__init__` does it.
+    This is a separate entry point, because Fire creates the `Agent` before running any of its subcommands.
+
+    ```bash
+    python aswe/core/profiling.py --min_import_us=500 > startup.json
+    ```
+
+    Parameters
+    ----------
+    module : str, optional
+        The module whose import should be profiled. _By default `aswe.core.agent`_.
+    min_import_us : int, optional
+        Modules with a smaller cumulative import time in microseconds are omitted from the tree.
+        _By default `1000`_.
+
+    Returns
+    -------
+    str
+        The report as JSON.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    import_tree = parse_import_times(result.stderr, min_import_us)
+
+    report = {
+        "python": sys.version.split()[0],
+        "imports": {
+            "module": module,
+            "total_us": next((node["cumulative_us"] for node in import_tree if node["module"] == module), None),
+            "tree": import_tree,
+        },
+        "stages": {
+            "load_quotes": _measure(lambda: IntentIndex(CatalogueWatcher(Path("data/quotes.json")).poll() or {})),
+            "load_user": _measure(lambda: Agent.load_user(Path("data/user.json"))),
+            "init_text_to_speech": _measure(TextToSpeech),
+            "init_speech_to_text": _measure(lambda: SpeechToText(get_mic=False)),
+        },
+    }
+
+    return json.dumps(report, indent=2)
+
+
+if __name__ == "__main__":
+    Fire(profile_startup)
@@ -0,0 +1,139 @@
+import threading
+from typing import Callable, Iterator
+
+from loguru import logger
+
+from aswe.core.objects import User
+from aswe.core.state import StateStore
+from aswe.core.user_interaction import SpeechToText, TextToSpeech
+from aswe.utils.abstract import AbstractUseCase
+
+UseCaseFactory = Callable[[], type[AbstractUseCase]]
+
+
+class UseCaseRegistry:
+    """Registry which instantiates use cases on demand
+
+    Each use case is registered with a factory returning its class. The agent calls every factory at startup
+    to register the proactive jobs of the use case (see `AbstractUseCase.register_jobs`), so the modules of all
+    use cases are imported then. A use case is only instantiated the first time it is requested, with the
+    `AbstractUseCase` constructor signature, and reused afterwards. The proactive jobs request use cases from
+    worker threads, so every use case is instantiated exactly once.
+    """
+
+    def __init__(
+        self,
+        stt: SpeechToText,
+        tts: TextToSpeech,
+        assistant_name: str,
+        user: User,
+        state: StateStore | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        stt : SpeechToText
+            The speech to text object passed to every use case
+        tts : TextToSpeech
+            The text to speech object passed to every use case
+        assistant_name : str
+            The name of the assistant
+        user : User
+            User preference information
+        state : StateStore | None, optional
+            The store passed to every use case. _By default each use case keeps its state in memory_.
+        """
+        self.stt = stt
+        self.tts = tts
+        self.assistant_name = assistant_name
+        self.user = user
+        self.state = state
+
+        self._factories: dict[str, UseCaseFactory] = {}
+        self._instances: dict[str, AbstractUseCase] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def register(self, name: str, factory: UseCaseFactory) -> None:
+        """Registers a use case
+
+        Parameters
+        ----------
+        name : str
+            The name of the use case, matching the key in `data/quotes.json`.
+        factory : UseCaseFactory
+            Callable returning the class of the use case.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get_class(self, name: str) -> type[AbstractUseCase]:
+        """Returns the class of a use case without instantiating it
+
+        Parameters
+        ----------
+        name : str
+            The name of the use case.
+
+        Returns
+        -------
+        type[AbstractUseCase]
+            The class of the use case.
+
+        Raises
+        ------
+        KeyError
+            If no use case is registered with the given name.
+        """
+        return self._factories[name]()
+
+    def get(self, name: str) -> AbstractUseCase:
+        """Returns the instance of a use case and creates it on first access
+
+        Parameters
+        ----------
+        name : str
+            The name of the use case.
+
+        Returns
+        -------
+        AbstractUseCase
+            The instance of the use case.
+
+        Raises
+        ------
+        KeyError
+            If no use case is registered with the given name.
+        """
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    logger.debug(f"Instantiating use case `{name}`")
+                    use_case_class = self.get_class(name)
+                    instance = use_case_class(self.stt, self.tts, self.assistant_name, self.user, self.state)
+                    self._instances[name] = instance
+
+        return instance
+
+    def is_loaded(self, name: str) -> bool:
+        """Checks if a use case was already instantiated
+
+        Parameters
+        ----------
+        name : str
+            The name of the use case.
+
+        Returns
+        -------
+        bool
+            Boolean if the use case was instantiated.
+        """
+        return name in self._instances
@@ -0,0 +1,307 @@
+import builtins
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from datetime import date, datetime, timezone, tzinfo
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from fire import Fire
+from loguru import logger
+from requests import Response
+
+from aswe.core.agent import Agent
+from aswe.core.objects import BestMatch
+from aswe.utils.cassette import normalize_url
+
+_STUBBED_MODULES = [
+    "aswe.api.event.event",
+    "aswe.api.finance",
+    "aswe.api.news",
+    "aswe.api.sport.basketball",
+    "aswe.api.sport.f1",
+    "aswe.api.sport.football",
+    "aswe.api.sport.handball",
+    "aswe.api.weather.weather",
+]
+
+
+class ReplayStub:
+    """Replacement for `http_request` serving canned responses of a recorded session"""
+
+    def __init__(self, responses: dict[str, dict[str, Any]]) -> None:
+        """
+        Parameters
+        ----------
+        responses : dict[str, dict[str, Any]]
+            Canned responses by normalized URL. Each response contains the `json` body and optionally the
+            `status_code` (_by default `200`_).
+
+        Attributes
+        ----------
+        calls : list[dict[str, Any]]
+            The API calls of the current turn with `url`, `duration_ms` and `replayed`.
+        """
+        self.responses = {normalize_url(url): response for url, response in responses.items()}
+        self.calls: list[dict[str, Any]] = []
+
+    def __call__(
+        self, url: str, headers: dict[Any, Any] | None = None, timeout: int = 10, stream: bool = False
+    ) -> Response | None:
+        start = time.perf_counter()
+        canned = self.responses.get(normalize_url(url))
+
+        response = None
+        if canned is None:
+            logger.warning(f"No recorded response for {normalize_url(url)}")
+        else:
+            response = Response()
+            response.status_code = canned.get("status_code", 200)
+            response.url = url
+            response._content = json.dumps(canned["json"]).encode("utf-8")  # pylint: disable=protected-access
+            response.encoding = "utf-8"
+
+        self.calls.append(
+            {
+                "url": normalize_url(url),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "replayed": canned is not None,
+            }
+        )
+        return response
+
+
+@contextmanager
+def _patched(target: Any, attribute: str, replacement: Any) -> Iterator[None]:
+    """Temporarily replaces an attribute"""
+    original = getattr(target, attribute)
+    setattr(target, attribute, replacement)
+    try:
+        yield
+    finally:
+        setattr(target, attribute, original)
+
+
+@contextmanager
+def frozen_clock(now: datetime) -> Iterator[None]:
+    """Fixes the clock of the `aswe` modules to a recorded time
+
+    `datetime.now()`, `datetime.today()`, `datetime.utcnow()` and `date.today()` return `now` in every `aswe` module
+    which imports `datetime` respectively `date`, so time dependent use cases (e.g. the time or the morning
+    briefing) answer like they did when the session was recorded. `time.time()` is not fixed.
+
+    Parameters
+    ----------
+    now : datetime
+        The recorded local time.
+
+    Yields
+    ------
+    None
+    """
+
+    class FrozenDatetime(datetime):
+        """`datetime` whose current time is `now`"""
+
+        @classmethod
+        def now(cls, tz: tzinfo | None = None) -> datetime:  # type: ignore[override]
+            return now if tz is None else now.astimezone(tz)
+
+        @classmethod
+        def today(cls) -> datetime:  # type: ignore[override]
+            return now
+
+        @classmethod
+        def utcnow(cls) -> datetime:  # type: ignore[override]
+            return now.astimezone(timezone.utc).replace(tzinfo=None)
+
+    class FrozenDate(date):
+        """`date` whose current day is the day of `now`"""
+
+        @classmethod
+        def today(cls) -> date:  # type: ignore[override]
+            return now.date()
+
+    # Bound before patching, because this module is patched as well
+    replacements = [("datetime", datetime, FrozenDatetime), ("date", date, FrozenDate)]
+    with ExitStack() as stack:
+        for name, module in list(sys.modules.items()):
+            if not name.startswith("aswe."):
+                continue
+            for attribute, original, frozen in replacements:
+                if getattr(module, attribute, None) is original:
+                    stack.enter_context(_patched(module, attribute, frozen))
+        yield
+
+
+def _timed(function: Callable[..., Any], durations: list[float]) -> Callable[..., Any]:
+    """Wraps a function to append the duration of every call to `durations`"""
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def _milliseconds(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def replay(session: dict[str, Any], agent: Agent | None = None) -> dict[str, Any]:
+    """Replays a recorded session through the agent in headless mode
+
+    Every API module calling `http_request` is served from the canned responses of the session, so the numbers
+    are reproducible and do not depend on the network. Clients which do not use `http_request` (Google Calendar,
+    Google Maps and VVS) are not stubbed. The clock is fixed to the `timestamp` of each turn, see `frozen_clock`.
+
+    ??? example "Session format"
+
+        ```json
+        {
+            "responses": {
+                "https://ergast.com/api/f1/current/last/results.json": {"status_code": 200, "json": {}}
+            },
+            "turns": [
+                {"timestamp": "2022-12-01T07:30:00", "utterance": "f1 last round result", "follow_ups": []}
+            ]
+        }
+        ```
+
+        `follow_ups` are answers to questions of the use case (e.g. yes/no or the number of an option).
+
+    Parameters
+    ----------
+    session : dict[str, Any]
+        The recorded session with `responses` and `turns`.
+    agent : Agent | None, optional
+        The headless agent the session is replayed with. _By default a new headless agent is created_.
+
+    Returns
+    -------
+    dict[str, Any]
+        The per-turn timings of intent matching, use case execution, each API call and TTS text preparation
+        in milliseconds, and a summary of the mean per stage.
+    """
+    if agent is None:
+        agent = Agent(headless=True, utterances=os.devnull, state_path=":memory:", http_cache_path=None)
+
+    stub = ReplayStub(session.get("responses", {}))
+    modules = [importlib.import_module(name) for name in _STUBBED_MODULES]
+    for name in ("GeneralUseCase", "MorningBriefingUseCase", "EventUseCase", "NavigationUseCase", "SportUseCase"):
+        getattr(importlib.import_module("aswe.use_cases"), name)
+
+    turns = []
+    with ExitStack() as stack:
+        stack.enter_context(_patched(builtins, "input", lambda prompt="": agent.stt.convert_speech() or ""))
+        for module in modules:
+            stack.enter_context(_patched(module, "http_request", stub))
+
+        for turn in session.get("turns", []):
+            turns.append(_replay_turn(agent, stub, turn))
+
+    stages = ["intent_matching_ms", "use_case_execution_ms", "api_calls_ms", "tts_ms", "total_ms"]
+    summary = {
+        stage: round(statistics.mean(turn[stage] for turn in turns), 3) if len(turns) > 0 else 0.0 for stage in stages
+    }
+    summary["turns"] = len(turns)
+
+    return {"turns": turns, "summary": summary}
+
+
+def _replay_turn(agent: Agent, stub: ReplayStub, turn: dict[str, Any]) -> dict[str, Any]:
+    """Replays a single turn and measures its stages
+
+    Parameters
+    ----------
+    agent : Agent
+        The headless agent.
+    stub : ReplayStub
+        The stub serving the canned responses.
+    turn : dict[str, Any]
+        The recorded turn with `utterance`, and optionally the ISO `timestamp` the clock is fixed to and
+        `follow_ups`.
+
+    Returns
+    -------
+    dict[str, Any]
+        The timings of the turn.
+    """
+    stub.calls = []
+    matching_durations: list[float] = []
+    tts_durations: list[float] = []
+    best_matches: list[BestMatch | None] = []
+
+    def get_best_match(parsed_text: str, threshold: float = 0.7) -> BestMatch | None:
+        best_match = Agent._get_best_match(agent, parsed_text, threshold)  # pylint: disable=protected-access
+        best_matches.append(best_match)
+        return best_match
+
+    agent.stt.source = StringIO("".join(f"{follow_up}\n" for follow_up in turn.get("follow_ups", [])))
+
+    timestamp = turn.get("timestamp")
+    clock = frozen_clock(datetime.fromisoformat(timestamp)) if timestamp is not None else nullcontext()
+
+    with clock, _patched(agent, "_get_best_match", _timed(get_best_match, matching_durations)), _patched(
+        agent.tts, "convert_text", _timed(agent.tts.convert_text, tts_durations)
+    ):
+        start = time.perf_counter()
+        try:
+            agent._evaluate_use_case(turn["utterance"].lower())  # pylint: disable=protected-access
+            error = None
+        except Exception as err:
+            error = f"{type(err).__name__}: {err}"
+        total = time.perf_counter() - start
+
+    matching = sum(matching_durations)
+    result: dict[str, Any] = {
+        "timestamp": turn.get("timestamp"),
+        "utterance": turn["utterance"],
+        "use_case": None if not best_matches or best_matches[0] is None else best_matches[0].use_case,
+        "choice": None if not best_matches or best_matches[0] is None else best_matches[0].function_key,
+        "intent_matching_ms": _milliseconds(matching),
+        "use_case_execution_ms": _milliseconds(total - matching),
+        "api_calls_ms": round(sum((call["duration_ms"] for call in stub.calls), 0.0), 3),
+        "api_calls": stub.calls,
+        "tts_ms": _milliseconds(sum(tts_durations)),
+        "total_ms": _milliseconds(total),
+    }
+    if error is not None:
+        result["error"] = error
+
+    return result
+
+
+def replay_file(path: str) -> str:
+    """Replays a recorded session file and returns the timings as JSON
+
+    ```bash
+    python aswe/core/replay.py data/replay/sample_session.json
+    ```
+
+    Parameters
+    ----------
+    path : str
+        The path to the recorded session.
+
+    Returns
+    -------
+    str
+        The timings as JSON.
+    """
+    with open(Path(path), encoding="utf-8") as file:
+        session = json.load(file)
+
+    return json.dumps(replay(session), indent=2)
+
+
+if __name__ == "__main__":
+    Fire(replay_file)
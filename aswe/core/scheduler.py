@@ -0,0 +1,464 @@
+import heapq
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from loguru import logger
+
+from aswe.core.state import StateStore
+
+_NO_STATE = object()
+
+
+@dataclass
+class JobResult:
+    """Dataclass to store what a proactive job observed, used to adapt its polling interval
+
+    Attributes
+    ----------
+    state : Any
+        Comparable fingerprint of the checked data. If it equals the state of the previous run, the interval
+        is backed off, otherwise it is reset to the minimum.
+    deadline : datetime | None
+        The next known point in time the data is expected to change, e.g. a kick-off or the start of the next
+        calendar event. The job is never scheduled after an upcoming deadline.
+    """
+
+    state: Any = None
+    deadline: datetime | None = None
+
+
+@dataclass
+class ProactiveJob:
+    """Dataclass to store a recurring proactive job
+
+    Attributes
+    ----------
+    name : str
+        The unique name of the job.
+    callback : Callable[[], JobResult | None]
+        The function which is called when the job is due. If it returns a `JobResult`, the interval is adapted.
+    interval : timedelta
+        The current time between two runs.
+    min_interval : timedelta
+        The shortest time between two runs.
+    max_interval : timedelta
+        The longest time between two runs.
+    backoff : float
+        The factor the interval is multiplied with if the state of the job did not change.
+    next_due : datetime
+        The next time the job is due.
+    anchored : bool
+        If the next run is calculated from the previous deadline instead of the time the job ran.
+        Anchored jobs keep their time of day, e.g. the daily wakeup briefing.
+    priority : int
+        The priority of the announcements of the job, lower values are spoken first.
+    hosts : tuple[str, ...]
+        The API hosts the job polls. While one of them is unavailable, the runs of the job are skipped.
+    last_run : datetime | None
+        The last time the job ran, `None` if it never ran.
+    last_state : Any
+        The state reported by the last run.
+    """
+
+    name: str
+    callback: Callable[[], JobResult | None]
+    interval: timedelta
+    min_interval: timedelta
+    max_interval: timedelta
+    next_due: datetime
+    anchored: bool = False
+    priority: int = 0
+    backoff: float = 2.0
+    hosts: tuple[str, ...] = ()
+    last_run: datetime | None = None
+    last_state: Any = field(default=_NO_STATE, repr=False)
+    _version: int = field(default=0, repr=False)
+
+
+class ProactivityScheduler:
+    """Scheduler keeping the proactive jobs in a min-heap ordered by their next deadline
+
+    Instead of polling every job on every iteration, the agent only asks for the time until the next deadline
+    and listens at most that long. Afterwards all due jobs are run in the order of their deadlines.
+    Rescheduled or removed jobs leave stale heap entries, which are skipped by comparing versions.
+
+    With workers, due jobs run on a bounded thread pool, so slow API calls do not block listening to the user.
+    The heap is only touched by the thread calling `run_due`.
+
+    With a state store, the deadline, interval and last run of every job are checkpointed whenever a job is
+    rescheduled. A job registered again after a restart continues where it stopped instead of starting over.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        context: Callable[[ProactiveJob], AbstractContextManager[Any]] | None = None,
+        state: StateStore | None = None,
+        available: Callable[[str], bool] | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            The number of worker threads, `0` runs the jobs in the calling thread. _By default `0`_.
+        context : Callable[[ProactiveJob], AbstractContextManager[Any]] | None, optional
+            Returns the context a job runs in, e.g. `TextToSpeech.defer` to queue its announcements.
+            _By default no context_.
+        state : StateStore | None, optional
+            The store the schedule is checkpointed to. _By default the schedule is not persisted_.
+        available : Callable[[str], bool] | None, optional
+            Checks if an API host is available, e.g. `aswe.utils.request.host_available`.
+            _By default all hosts are available_.
+
+        Attributes
+        ----------
+        jobs : dict[str, ProactiveJob]
+            All registered jobs by name.
+        """
+        self.jobs: dict[str, ProactiveJob] = {}
+        self.context = context
+        self.state = state
+        self.available = available
+        self._heap: list[tuple[datetime, int, str, int]] = []
+        self._counter = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="proactivity") if max_workers > 0 else None
+        self._running: dict[str, Future[JobResult | None]] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.jobs
+
+    def _push(self, job: ProactiveJob) -> None:
+        job._version += 1  # pylint: disable=protected-access
+        heapq.heappush(self._heap, (job.next_due, next(self._counter), job.name, job._version))
+
+    def register(
+        self,
+        name: str,
+        callback: Callable[[], JobResult | None],
+        interval: timedelta,
+        first_due: datetime | None = None,
+        anchored: bool = False,
+        priority: int = 0,
+        max_interval: timedelta | None = None,
+        backoff: float = 2.0,
+        hosts: tuple[str, ...] = (),
+    ) -> ProactiveJob:
+        """Registers a recurring job, replacing any job with the same name
+
+        Parameters
+        ----------
+        name : str
+            The unique name of the job.
+        callback : Callable[[], JobResult | None]
+            The function which is called when the job is due.
+        interval : timedelta
+            The time between two runs, respectively the minimum interval of adaptive jobs.
+        first_due : datetime | None, optional
+            The first time the job is due. _By default one interval from now_.
+        anchored : bool, optional
+            If the next run is calculated from the previous deadline. _By default `False`_.
+        priority : int, optional
+            The priority of the announcements of the job. _By default `0`_.
+        max_interval : timedelta | None, optional
+            The longest time between two runs, `None` keeps the interval fixed. _By default `None`_.
+        backoff : float, optional
+            The factor the interval grows with while the state does not change. _By default `2.0`_.
+        hosts : tuple[str, ...], optional
+            The API hosts the job polls, runs are skipped while one is unavailable. _By default none_.
+
+        Returns
+        -------
+        ProactiveJob
+            The registered job.
+        """
+        job = ProactiveJob(
+            name=name,
+            callback=callback,
+            interval=interval,
+            min_interval=interval,
+            max_interval=max(interval, max_interval if max_interval is not None else interval),
+            next_due=first_due if first_due is not None else datetime.now() + interval,
+            anchored=anchored,
+            priority=priority,
+            backoff=backoff,
+            hosts=hosts,
+        )
+        self._restore(job)
+        self.jobs[name] = job
+        self._push(job)
+        logger.debug(f"Registered proactive job `{name}`, next due at {job.next_due}")
+
+        return job
+
+    def _restore(self, job: ProactiveJob) -> None:
+        """Restores the checkpointed schedule of a job
+
+        Anchored jobs keep their computed deadline, because their time of day may have changed since.
+        """
+        saved = self.state.get("scheduler", job.name) if self.state is not None else None
+        if saved is None:
+            return
+
+        job.last_run = datetime.fromisoformat(saved["last_run"]) if saved["last_run"] is not None else None
+        job.interval = min(job.max_interval, max(job.min_interval, timedelta(seconds=saved["interval"])))
+        if not job.anchored:
+            job.next_due = datetime.fromisoformat(saved["next_due"])
+        logger.debug(f"Restored proactive job `{job.name}`, next due at {job.next_due}")
+
+    def _checkpoint(self, job: ProactiveJob) -> None:
+        """Writes the schedule of a job to the state store"""
+        if self.state is not None:
+            self.state.set(
+                "scheduler",
+                job.name,
+                {"next_due": job.next_due, "interval": job.interval.total_seconds(), "last_run": job.last_run},
+            )
+
+    def configure(
+        self, name: str, min_interval: timedelta | None = None, max_interval: timedelta | None = None
+    ) -> None:
+        """Changes the bounds of the interval of a job
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        min_interval : timedelta | None, optional
+            The shortest time between two runs. _By default unchanged_.
+        max_interval : timedelta | None, optional
+            The longest time between two runs. _By default unchanged_.
+        """
+        job = self.jobs[name]
+        job.min_interval = min_interval if min_interval is not None else job.min_interval
+        job.max_interval = max(job.min_interval, max_interval if max_interval is not None else job.max_interval)
+        job.interval = min(job.max_interval, max(job.min_interval, job.interval))
+
+    def unregister(self, name: str) -> None:
+        """Removes a job
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        """
+        self.jobs.pop(name, None)
+        if self.state is not None:
+            self.state.delete("scheduler", name)
+
+    def reschedule(self, name: str, next_due: datetime) -> None:
+        """Moves the next deadline of a job
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        next_due : datetime
+            The new deadline.
+        """
+        job = self.jobs[name]
+        job.next_due = next_due
+        self._push(job)
+        self._checkpoint(job)
+
+    def _peek(self) -> ProactiveJob | None:
+        """Returns the job with the earliest deadline and drops stale heap entries"""
+        while len(self._heap) > 0:
+            _, _, name, version = self._heap[0]
+            job = self.jobs.get(name)
+            if job is not None and job._version == version:  # pylint: disable=protected-access
+                return job
+            heapq.heappop(self._heap)
+
+        return None
+
+    def next_deadline(self) -> datetime | None:
+        """Returns the earliest deadline of all jobs
+
+        Returns
+        -------
+        datetime | None
+            The earliest deadline, `None` if no job is registered.
+        """
+        job = self._peek()
+        return job.next_due if job is not None else None
+
+    def seconds_until_next_deadline(self, maximum: float, minimum: float = 1.0) -> float:
+        """Returns how long the agent can wait before the next job is due
+
+        Parameters
+        ----------
+        maximum : float
+            The longest time to wait in seconds, e.g. the listen timeout.
+        minimum : float, optional
+            The shortest time to wait in seconds. _By default `1`_.
+
+        Returns
+        -------
+        float
+            The seconds until the next deadline, clamped between `minimum` and `maximum`.
+        """
+        deadline = self.next_deadline()
+        if deadline is None:
+            return maximum
+
+        return max(minimum, min(maximum, (deadline - datetime.now()).total_seconds()))
+
+    @property
+    def running(self) -> list[str]:
+        """The names of the jobs currently running on a worker thread"""
+        return [name for name, future in self._running.items() if not future.done()]
+
+    def _execute(self, job: ProactiveJob) -> JobResult | None:
+        """Calls the job in its context"""
+        with self.context(job) if self.context is not None else nullcontext():
+            return job.callback()
+
+    def _adapt(self, job: ProactiveJob, result: JobResult) -> None:
+        """Adapts the interval of a job to its result and schedules the next run from the last one
+
+        The interval is reset to the minimum if the state changed and grows by `backoff` up to the maximum
+        otherwise. The next run is never scheduled after an upcoming deadline, and until one maximum interval
+        after a deadline passed the minimum interval is used. Anchored jobs are not adapted.
+
+        Parameters
+        ----------
+        job : ProactiveJob
+            The job which finished.
+        result : JobResult
+            The result of the run.
+        """
+        if job.anchored or job.last_run is None:
+            return
+
+        now = job.last_run
+        if job.last_state is _NO_STATE or result.state != job.last_state:
+            job.interval = job.min_interval
+        else:
+            job.interval = min(job.max_interval, job.interval * job.backoff)
+        job.last_state = result.state
+
+        interval = job.interval
+        if result.deadline is not None and now - job.max_interval <= result.deadline <= now:
+            interval = job.min_interval
+
+        next_due = now + interval
+        if result.deadline is not None and now < result.deadline < next_due:
+            next_due = max(result.deadline, now + job.min_interval)
+
+        logger.debug(f"Proactive job `{job.name}` adapted to an interval of {interval}, next due at {next_due}")
+        self.reschedule(job.name, next_due)
+
+    def _finish(self, name: str, error: BaseException | None, result: JobResult | None = None) -> None:
+        """Handles the outcome of a job run
+
+        Jobs raising a `NotImplementedError` are removed, any other error is logged.
+        """
+        if isinstance(error, NotImplementedError):
+            logger.warning(f"Proactivity for `{name}` is not implemented yet.")
+            self.unregister(name)
+        elif error is not None:
+            logger.opt(exception=error).error(f"Proactive job `{name}` failed.")
+        elif isinstance(result, JobResult) and name in self.jobs:
+            self._adapt(self.jobs[name], result)
+
+    def _collect(self) -> None:
+        """Handles the outcome of all jobs which finished on a worker thread"""
+        for name, future in list(self._running.items()):
+            if future.done():
+                del self._running[name]
+                error = future.exception()
+                self._finish(name, error, future.result() if error is None else None)
+
+    def run(self, name: str, now: datetime | None = None) -> None:
+        """Runs a job immediately and schedules its next run
+
+        With workers the job is submitted to the pool, unless its previous run did not finish yet. The run is
+        skipped while one of the hosts of the job is unavailable.
+
+        Parameters
+        ----------
+        name : str
+            The name of the job.
+        now : datetime | None, optional
+            The current time. _By default `datetime.now()`_.
+        """
+        job = self.jobs[name]
+        now = now if now is not None else datetime.now()
+
+        if job.anchored:
+            next_due = job.next_due + job.interval
+            while next_due <= now:
+                next_due += job.interval
+        else:
+            next_due = now + job.interval
+
+        if name in self.running:
+            logger.debug(f"Proactive job `{name}` is still running, skipping this run.")
+            self.reschedule(name, next_due)
+            return
+
+        unavailable = [host for host in job.hosts if self.available is not None and not self.available(host)]
+        if unavailable:
+            logger.info(f"Skipping proactive job `{name}`, {', '.join(unavailable)} is unavailable.")
+            self.reschedule(name, next_due)
+            return
+
+        logger.info(f"Triggered proactive job `{name}`.")
+        job.last_run = now
+        self.reschedule(name, next_due)
+        if self._executor is not None:
+            self._running[name] = self._executor.submit(self._execute, job)
+            return
+
+        try:
+            result = self._execute(job)
+        except Exception as err:  # pylint: disable=broad-except
+            self._finish(name, err)
+        else:
+            self._finish(name, None, result)
+
+    def run_due(self, now: datetime | None = None) -> list[str]:
+        """Runs all jobs whose deadline passed, in the order of their deadlines
+
+        Parameters
+        ----------
+        now : datetime | None, optional
+            The current time. _By default `datetime.now()`_.
+
+        Returns
+        -------
+        list[str]
+            The names of the jobs which ran.
+        """
+        self._collect()
+        now = now if now is not None else datetime.now()
+
+        ran = []
+        job = self._peek()
+        while job is not None and job.next_due <= now:
+            self.run(job.name, now)
+            ran.append(job.name)
+            job = self._peek()
+
+        return ran
+
+    def join(self, timeout: float | None = None) -> None:
+        """Waits until all running jobs finished
+
+        Parameters
+        ----------
+        timeout : float | None, optional
+            The maximum seconds to wait. _By default no limit_.
+        """
+        wait(self._running.values(), timeout)
+        self._collect()
+
+    def shutdown(self) -> None:
+        """Waits for the running jobs and stops the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        self._collect()
@@ -0,0 +1,193 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+def _encode(value: Any) -> Any:
+    """Converts values `json` can not serialize (datetimes, enums and dataclasses)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StateStore:
+    """Key-value store in SQLite which keeps the agent state across restarts
+
+    Values are grouped in namespaces (e.g. `morningBriefing.last_stock_prices`) and stored as JSON.
+    Every write is committed on its own, so the state is checkpointed incrementally and a restarted agent
+    resumes from the last write instead of querying every provider again.
+    """
+
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        """
+        Parameters
+        ----------
+        path : str | Path, optional
+            The path to the SQLite database, `:memory:` keeps the state in memory only. _By default `:memory:`_.
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Returns a stored value
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace of the value.
+        key : str
+            The key of the value.
+        default : Any, optional
+            The value returned if nothing is stored. _By default `None`_.
+
+        Returns
+        -------
+        Any
+            The decoded JSON value.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None else default
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        """Stores a value, replacing the previous one
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace of the value.
+        key : str
+            The key of the value.
+        value : Any
+            The value, which must be JSON serializable. Datetimes, enums and dataclasses are converted.
+        """
+        encoded = json.dumps(value, default=_encode)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO state (namespace, key, value, updated) VALUES (?, ?, ?, ?)",
+                (namespace, key, encoded, time.time()),
+            )
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Removes a value
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace of the value.
+        key : str
+            The key of the value.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace: str) -> dict[str, Any]:
+        """Returns all values of a namespace
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace.
+
+        Returns
+        -------
+        dict[str, Any]
+            The decoded values by key.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, value FROM state WHERE namespace = ? ORDER BY key", (namespace,)
+            ).fetchall()
+
+        return {key: json.loads(value) for key, value in rows}
+
+    def mapping(self, namespace: str, decode: Callable[[Any], Any] | None = None) -> "PersistentDict":
+        """Returns a dictionary which writes every change of a namespace through to the store
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace.
+        decode : Callable[[Any], Any] | None, optional
+            Converts the decoded JSON back to the stored type, e.g. a dataclass. _By default no conversion_.
+
+        Returns
+        -------
+        PersistentDict
+            The dictionary holding the restored values.
+        """
+        return PersistentDict(self, namespace, decode)
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class PersistentDict(MutableMapping[str, Any]):
+    """Dictionary which checkpoints every change to a `StateStore` namespace
+
+    Reads are served from memory, only writes touch the database.
+    """
+
+    def __init__(self, store: StateStore, namespace: str, decode: Callable[[Any], Any] | None = None) -> None:
+        """
+        Parameters
+        ----------
+        store : StateStore
+            The store the values are written to.
+        namespace : str
+            The namespace of the values.
+        decode : Callable[[Any], Any] | None, optional
+            Converts the decoded JSON back to the stored type. _By default no conversion_.
+        """
+        self.store = store
+        self.namespace = namespace
+        self._data = {
+            key: decode(value) if decode is not None else value for key, value in store.items(namespace).items()
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self.store.set(self.namespace, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+        self.store.delete(self.namespace, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.namespace!r}, {self._data!r})"
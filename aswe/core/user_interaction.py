@@ -1,13 +1,18 @@
+import itertools
+import queue
 import re
+import threading
 import time
-from contextlib import redirect_stdout
+from contextlib import contextmanager, redirect_stdout
 from io import StringIO
 from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
 
 import pyttsx3
 import speech_recognition as sr
 from loguru import logger
 
+from aswe.core.objects import Announcement
 from aswe.utils.shell import clear_shell, get_int, print_options
 from aswe.utils.text import calculate_similarity
 
@@ -15,7 +20,7 @@ from aswe.utils.text import calculate_similarity
 class SpeechToText:
     """Class to convert speech to text."""
 
-    def __init__(self, get_mic: bool) -> None:
+    def __init__(self, get_mic: bool, source: TextIO | None = None) -> None:
         """Initializes the speech to text class.
 
         * TODO: Think about a better way to handle the case that the `microphone_index` is not required
@@ -24,6 +29,9 @@ class SpeechToText:
         ----------
         get_mic : bool
             If the speech to text class should first get the microphone index.
+        source : TextIO | None, optional
+            Text stream with one utterance per line which replaces the microphone (headless mode).
+            _By default `None`._
 
         Attributes
         ----------
@@ -31,11 +39,14 @@ class SpeechToText:
             The speech recognition object.
         microphone_index : int | None
             The index of the microphone which should be used.
+        source : TextIO | None
+            The text stream utterances are read from in headless mode.
         """
+        self.source = source
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 800
 
-        if get_mic:
+        if get_mic and source is None:
             clear_shell()
 
             print("At first, please select the microphone you want to use.\n")
@@ -46,7 +57,7 @@ class SpeechToText:
             choice = get_int(list_of_microphones, start=1)
             self.microphone_index = choice
 
-        if not get_mic:
+        if not get_mic or source is not None:
             self.microphone_index = None
 
     def check_if_yes(self) -> bool:
@@ -103,10 +114,11 @@ class SpeechToText:
 
         return None
 
-    def convert_speech(self, line_above: bool = False) -> str | None:
+    def convert_speech(self, line_above: bool = False, timeout: float = 60) -> str | None:
         """First records an audio file an then pareses it to text.
 
-        When the function does not detect any speech for `60` seconds it will timeout and return `None`.
+        When the function does not detect any speech for `timeout` seconds it will timeout and return `None`.
+        In headless mode the next line of `source` is returned instead.
 
         * TODO: Maybe use `adjust_for_ambient_noise`
         * TODO: Add function to cancel the request without quitting the program
@@ -115,21 +127,36 @@ class SpeechToText:
         ----------
         line_above : bool, optional
             If a new line should be printed before the user input. _By default `False`._
+        timeout : float, optional
+            The seconds to wait for the user to start speaking. _By default `60`._
 
         Returns
         -------
         str | None
             The parsed text or None if no text could be parsed.
+
+        Raises
+        ------
+        EOFError
+            If all utterances of `source` were read.
         """
         if line_above:
             print()
 
+        if self.source is not None:
+            line = self.source.readline()
+            if line == "":
+                raise EOFError("No more utterances in the source.")
+            parsed_text = line.strip()
+            print(f"User: {parsed_text}")
+            return parsed_text or None
+
         audio: sr.AudioData | None = None
 
         with sr.Microphone(self.microphone_index) as source:
             print("Listening...")
             try:
-                audio = self.recognizer.listen(source, timeout=60)
+                audio = self.recognizer.listen(source, timeout=timeout)
             except sr.WaitTimeoutError:
                 logger.warning("The speech recognition timed out.")
 
@@ -162,19 +189,39 @@ class SpeechToText:
 class TextToSpeech:
     """Class to convert text to speech."""
 
-    def __init__(self) -> None:
+    def __init__(self, sink: TextIO | None = None) -> None:
         """Initializes the text to speech class.
 
         * TODO: Add Attributes section
 
+        Parameters
+        ----------
+        sink : TextIO | None, optional
+            Text stream which receives the optimized text instead of the speech engine (headless mode).
+            _By default `None`._
+
         Attributes
         ----------
-        engine : pyttsx3.Engine
-            The text to speech engine.
+        engine : pyttsx3.Engine | None
+            The text to speech engine, `None` in headless mode.
+        sink : TextIO | None
+            The text stream the optimized text is written to in headless mode.
+        lock : threading.RLock
+            Lock held while speaking, so two threads never speak over each other.
+        announcements : queue.PriorityQueue[Announcement]
+            Announcements of proactive jobs which are spoken by `drain`.
         """
-        self.engine: pyttsx3.Engine = pyttsx3.init()
-        self.engine.setProperty("rate", 175)
-        self.engine.setProperty("voice", "english")
+        self.sink = sink
+        self.engine: pyttsx3.Engine | None = None
+        self.lock = threading.RLock()
+        self.announcements: queue.PriorityQueue[Announcement] = queue.PriorityQueue()
+        self._deferred = threading.local()
+        self._batches = itertools.count()
+
+        if sink is None:
+            self.engine = pyttsx3.init()
+            self.engine.setProperty("rate", 175)
+            self.engine.setProperty("voice", "english")
 
     def optimize_text(
         self,
@@ -231,17 +278,118 @@ class TextToSpeech:
         line_above : bool, optional
             If a new line should be printed before the bot input. _By default `False`_.
         """
-        if line_above:
-            print()
+        if self._queue(
+            text=text,
+            options={"optimize_time": optimize_time, "optimize_numbers": optimize_numbers},
+            line_above=line_above,
+        ):
+            return
+
+        with self.lock:
+            if line_above:
+                print()
+
+            logger.debug(f"Converting text to speech: {text.strip()}")
+
+            print(f"Bot: {text.strip()}")
 
-        logger.debug(f"Converting text to speech: {text.strip()}")
+            if optimize_time or optimize_numbers:
+                text = self.optimize_text(text, optimize_time, optimize_numbers)
 
-        print(f"Bot: {text.strip()}")
+            if self.engine is None:
+                if self.sink is not None:
+                    self.sink.write(f"{text.strip()}\n")
+                return
 
-        if optimize_time or optimize_numbers:
-            text = self.optimize_text(text, optimize_time, optimize_numbers)
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except RuntimeError:
+                logger.error("The text to speech engine is already in use.")
+
+    @contextmanager
+    def defer(self, priority: int) -> Iterator[None]:
+        """Queues everything the current thread converts as announcements instead of speaking it
+
+        Used for proactive jobs running on a worker thread. The main loop speaks the announcements with `drain`
+        between two turns.
+
+        Parameters
+        ----------
+        priority : int
+            The priority of the announcements, lower values are spoken first.
+        """
+        self._deferred.priority = priority
+        self._deferred.batch = next(self._batches)
+        self._deferred.index = itertools.count()
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
-        except RuntimeError:
-            logger.error("The text to speech engine is already in use.")
+            yield
+        finally:
+            self._deferred.priority = None
+
+    def _queue(
+        self,
+        text: str = "",
+        options: dict[str, Any] | None = None,
+        line_above: bool = False,
+        follow_up: Callable[[], None] | None = None,
+    ) -> bool:
+        """Queues an announcement if the current thread is deferred
+
+        Returns
+        -------
+        bool
+            Boolean if the announcement was queued.
+        """
+        priority = getattr(self._deferred, "priority", None)
+        if priority is None:
+            return False
+
+        self.announcements.put(
+            Announcement(
+                priority,
+                self._deferred.batch,
+                next(self._deferred.index),
+                text=text,
+                options=options or {},
+                line_above=line_above,
+                follow_up=follow_up,
+            )
+        )
+        return True
+
+    def follow_up(self, function: Callable[[], None]) -> None:
+        """Calls a function which interacts with the user, e.g. asks a question
+
+        Worker threads must not listen to the user, therefore in a deferred thread the function is queued
+        behind the announcements of the job and called by `drain` on the main thread.
+
+        Parameters
+        ----------
+        function : Callable[[], None]
+            The function which should be called.
+        """
+        if not self._queue(follow_up=function):
+            function()
+
+    def drain(self) -> int:
+        """Speaks all queued announcements ordered by priority
+
+        Returns
+        -------
+        int
+            The number of announcements which were spoken.
+        """
+        count = 0
+        with self.lock:
+            while True:
+                try:
+                    announcement = self.announcements.get_nowait()
+                except queue.Empty:
+                    return count
+
+                if announcement.follow_up is not None:
+                    announcement.follow_up()
+                else:
+                    self.convert_text(announcement.text, line_above=announcement.line_above, **announcement.options)
+                count += 1
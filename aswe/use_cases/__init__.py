@@ -1,7 +1,32 @@
-from aswe.use_cases.event import EventUseCase
-from aswe.use_cases.general import GeneralUseCase
-from aswe.use_cases.morning_briefing import MorningBriefingUseCase
-from aswe.use_cases.navigation import NavigationUseCase
-from aswe.use_cases.sport import SportUseCase
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from aswe.use_cases.event import EventUseCase
+    from aswe.use_cases.general import GeneralUseCase
+    from aswe.use_cases.morning_briefing import MorningBriefingUseCase
+    from aswe.use_cases.navigation import NavigationUseCase
+    from aswe.use_cases.sport import SportUseCase
 
 __all__ = ("EventUseCase", "GeneralUseCase", "MorningBriefingUseCase", "SportUseCase", "NavigationUseCase")
+
+_MODULES = {
+    "EventUseCase": "aswe.use_cases.event",
+    "GeneralUseCase": "aswe.use_cases.general",
+    "MorningBriefingUseCase": "aswe.use_cases.morning_briefing",
+    "NavigationUseCase": "aswe.use_cases.navigation",
+    "SportUseCase": "aswe.use_cases.sport",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the module of a use case on first access
+
+    Each use case pulls in its API modules, so importing the package alone does not import them.
+    """
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    use_case = getattr(importlib.import_module(_MODULES[name]), name)
+    globals()[name] = use_case
+    return use_case
@@ -1,5 +1,7 @@
+from collections.abc import MutableMapping
 from datetime import datetime, timedelta
 from math import floor
+from typing import Any
 
 from loguru import logger
 
@@ -11,6 +13,7 @@ from aswe.api.navigation import MapsTrip, MapsTripMode, get_maps_connection
 from aswe.api.weather.weather import forecast
 from aswe.api.weather.weather_params import ElementsEnum, IncludeEnum
 from aswe.core.objects import BestMatch
+from aswe.core.scheduler import JobResult
 from aswe.utils.abstract import AbstractUseCase
 from aswe.utils.date import get_next_saturday
 from aswe.utils.shell import get_int, print_options
@@ -19,14 +22,52 @@ from aswe.utils.shell import get_int, print_options
 class EventUseCase(AbstractUseCase):
     """Use case to handle events"""
 
-    attending_events: dict[str, EventSummary] = {}
+    proactivity_interval = timedelta(minutes=15)
+    proactivity_max_interval = timedelta(hours=2)
+    proactivity_hosts = ("app.ticketmaster.com",)
 
-    def check_proactivity(self) -> None:
-        """Check if there are any events in the next 30 minutes and trigger the assistant"""
+    attending_events: MutableMapping[str, EventSummary] = {}
+
+    def restore_state(self) -> None:
+        """Restores the events the user attends, every change is checkpointed"""
+        self.attending_events = self.state.mapping("events.attending_events", decode=self._decode_event_summary)
+
+    @staticmethod
+    def _decode_event_summary(value: dict[str, Any]) -> EventSummary:
+        """Converts a stored event summary back to an `EventSummary`
+
+        Parameters
+        ----------
+        value : dict[str, Any]
+            The event summary as stored by the `StateStore`.
+
+        Returns
+        -------
+        EventSummary
+            The event summary.
+        """
+        return EventSummary(
+            **{
+                **value,
+                "start": datetime.fromisoformat(value["start"]),
+                "location": EventLocation(**value["location"]),
+                "trip_mode": MapsTripMode(value["trip_mode"]),
+            }
+        )
+
+    def check_proactivity(self) -> JobResult:
+        """Check if there are any events in the next 30 minutes and trigger the assistant
+
+        Returns
+        -------
+        JobResult
+            The checked events and the start of the next one.
+        """
 
         logger.debug("Perform proactivity for EventUseCase")
 
-        for old_event_summary in self.attending_events.values():
+        states: list[EventSummary] = []
+        for old_event_summary in list(self.attending_events.values()):
             reduced_events = events(EventApiEventParams(id=old_event_summary.id))
 
             if reduced_events is None or len(reduced_events) == 0:
@@ -38,6 +79,7 @@ class EventUseCase(AbstractUseCase):
                 self.attending_events.pop(old_event_summary.id, None)
             else:
                 new_event_summary = self._get_event_summary(reduced_events[0])
+                states.append(new_event_summary)
                 formatted_weather_change = ""
 
                 if old_event_summary.start != new_event_summary.start:
@@ -78,6 +120,9 @@ class EventUseCase(AbstractUseCase):
                 if formatted_weather_change != "":
                     self.tts.convert_text(formatted_weather_change)
 
+        upcoming = [summary.start for summary in states if summary.start > datetime.now()]
+        return JobResult(state=tuple(states), deadline=min(upcoming, default=None))
+
     def trigger_assistant(self, best_match: BestMatch) -> None:
         """UseCase for events
 
@@ -2,12 +2,13 @@ import sys
 import time
 from datetime import datetime
 
-import pyjokes
-
 from aswe.core.objects import BestMatch
 from aswe.utils.abstract import AbstractUseCase
+from aswe.utils.lazy import lazy_import
 from aswe.utils.shell import get_int
 
+pyjokes = lazy_import("pyjokes")
+
 
 class GeneralUseCase(AbstractUseCase):
     """Class for managing the general use case"""
@@ -1,31 +1,81 @@
-from datetime import datetime
+import asyncio
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, cast
 
-import pycountry
 from loguru import logger
 
 from aswe.api.calendar import get_all_events_today
 from aswe.api.finance import (
     get_currency_by_country,
     get_news_info_by_symbol,
-    get_stock_price,
-    get_stock_price_change,
-    get_stock_rating,
+    get_stock_price_async,
+    get_stock_price_change_async,
+    get_stock_rating_async,
     get_ticker_by_symbol,
 )
-from aswe.api.news import keyword_search, top_headlines_search
+from aswe.api.news import keyword_search_async, top_headlines_search
 from aswe.api.weather.weather import dynamic_range
 from aswe.api.weather.weather_params import DynamicPeriodEnum, ElementsEnum, IncludeEnum
-from aswe.core.objects import BestMatch
+from aswe.core.objects import BestMatch, User
+from aswe.core.scheduler import JobResult, ProactivityScheduler
 from aswe.utils.abstract import AbstractUseCase
 from aswe.utils.error import TooManyRequests
+from aswe.utils.lazy import lazy_import
+
+pycountry = lazy_import("pycountry")
 
 
 class MorningBriefingUseCase(AbstractUseCase):
     """Use case for the morning briefing"""
 
-    last_stock_prices: dict[str, float] = {}
+    proactivity_interval = timedelta(minutes=15)
+    proactivity_max_interval = timedelta(hours=2)
+    proactivity_hosts = ("financialmodelingprep.com",)
+
+    last_stock_prices: MutableMapping[str, float] = {}
     currency: tuple[str, str] = ("", "")
 
+    def restore_state(self) -> None:
+        """Restores the last announced stock prices and the currency of the user, every change is checkpointed"""
+        self.last_stock_prices = self.state.mapping("morningBriefing.last_stock_prices")
+        currency = self.state.get("morningBriefing", "currency")
+        if currency is not None:
+            self.currency = (currency[0], currency[1])
+
+    @classmethod
+    def register_jobs(
+        cls,
+        scheduler: ProactivityScheduler,
+        name: str,
+        get_instance: Callable[[], AbstractUseCase],
+        user: User,
+    ) -> None:
+        """Registers the stock check and the daily full briefing at the wakeup time of the user
+
+        Parameters
+        ----------
+        scheduler : ProactivityScheduler
+            The scheduler of the agent.
+        name : str
+            The name the use case is registered with.
+        get_instance : Callable[[], AbstractUseCase]
+            Callable returning the instance of the use case.
+        user : User
+            User preference information
+        """
+        super().register_jobs(scheduler, name, get_instance, user)
+
+        scheduler.register(
+            f"{name}.wakeup",
+            lambda: cast(MorningBriefingUseCase, get_instance()).full_briefing(),
+            timedelta(days=1),
+            first_due=cls._get_next_wakeup(user),
+            anchored=True,
+            priority=0,
+        )
+
     def full_briefing(self) -> None:
         """Provides an overview of the calendar, news, weather and finance for the current day"""
         self.tts.convert_text(
@@ -82,9 +132,7 @@ class MorningBriefingUseCase(AbstractUseCase):
             for headline in country_top_headlines:
                 self.tts.convert_text(headline)
 
-        keyword_headlines_list = [
-            keyword_search(keyword=keyword, max_results=1) for keyword in self.user.favorites.news_keywords
-        ]
+        keyword_headlines_list = asyncio.run(self._search_keywords())
         for keyword_headlines in keyword_headlines_list:
             if keyword_headlines is not None:
                 self.tts.convert_text("You could also be interested in these headlines:")
@@ -96,6 +144,14 @@ class MorningBriefingUseCase(AbstractUseCase):
         ):
             self.tts.convert_text("Unfortunately, I could not find any news for you today.")
 
+    async def _search_keywords(self) -> list[list[str] | None]:
+        """Searches the headlines of all news keywords of the user concurrently"""
+        return list(
+            await asyncio.gather(
+                *(keyword_search_async(keyword=keyword, max_results=1) for keyword in self.user.favorites.news_keywords)
+            )
+        )
+
     def _weather_overview(self) -> None:
         """Reads out the weather forecast for the current day"""
         weather = dynamic_range(
@@ -130,32 +186,61 @@ class MorningBriefingUseCase(AbstractUseCase):
         """Reads out the stock prices, changes, ratings for the user's favorite stocks"""
         if self.currency == ("", ""):
             self.currency = get_currency_by_country(self.user.address.country)
+            self.state.set("morningBriefing", "currency", self.currency)
 
-        for stock in self.user.favorites.stocks:
-            try:
-                price = get_stock_price(stock["symbol"], self.currency[1])
-                change = get_stock_price_change(stock["symbol"])
-                rating = get_stock_rating(stock["symbol"])
+        stock_infos = asyncio.run(self._fetch_stock_infos())
+        for stock_info in stock_infos:
+            if isinstance(stock_info, BaseException) and not isinstance(stock_info, TooManyRequests):
+                raise stock_info
 
-                if all(response is None for response in [price, change, rating]):
-                    self.tts.convert_text("Unfortunately, I could not find any information for you today.")
-                else:
-                    self.tts.convert_text(f"About {stock['name']}:")
-                    if price is not None:
-                        self.last_stock_prices[stock["symbol"]] = price
-                        self.tts.convert_text(
-                            f"The {stock['name']} stock is currently trading at {price} {self.currency[0]} per share."
-                        )
-                    if change is not None:
-                        self.tts.convert_text(
-                            f"""It has changed by {change['24h']} in the last 24 hours ({change['5D']} """
-                            """in the last 5 days)."""
-                        )
-                    if rating is not None:
-                        self.tts.convert_text(f"The latest rating by analysts is {rating}.")
-            except TooManyRequests:
-                self.tts.convert_text("Unfortunately, I could not find any information about your stocks today.")
-                return
+        if stock_infos and all(isinstance(stock_info, TooManyRequests) for stock_info in stock_infos):
+            self.tts.convert_text("Unfortunately, I could not find any information about your stocks today.")
+            return
+
+        for stock, stock_info in zip(self.user.favorites.stocks, stock_infos):
+            if isinstance(stock_info, BaseException):
+                self.tts.convert_text(f"Unfortunately, I could not find any information about {stock['name']} today.")
+                continue
+
+            price, change, rating = stock_info
+            if all(response is None for response in [price, change, rating]):
+                self.tts.convert_text("Unfortunately, I could not find any information for you today.")
+            else:
+                self.tts.convert_text(f"About {stock['name']}:")
+                if price is not None:
+                    self.last_stock_prices[stock["symbol"]] = price
+                    self.tts.convert_text(
+                        f"The {stock['name']} stock is currently trading at {price} {self.currency[0]} per share."
+                    )
+                if change is not None:
+                    self.tts.convert_text(
+                        f"""It has changed by {change['24h']} in the last 24 hours ({change['5D']} """
+                        """in the last 5 days)."""
+                    )
+                if rating is not None:
+                    self.tts.convert_text(f"The latest rating by analysts is {rating}.")
+
+    async def _fetch_stock_infos(
+        self,
+    ) -> list[tuple[float | None, dict[str, str] | None, str | None] | BaseException]:
+        """Fetches the price, change and rating of all favorite stocks of the user concurrently
+
+        The exception of a stock is returned in its place, so the other stocks are still read out.
+        """
+
+        async def fetch(symbol: str) -> tuple[float | None, dict[str, str] | None, str | None]:
+            price, change, rating = await asyncio.gather(
+                get_stock_price_async(symbol, self.currency[1]),
+                get_stock_price_change_async(symbol),
+                get_stock_rating_async(symbol),
+            )
+            return price, change, rating
+
+        return list(
+            await asyncio.gather(
+                *(fetch(stock["symbol"]) for stock in self.user.favorites.stocks), return_exceptions=True
+            )
+        )
 
     def _news_sentiment_info(self, stock: dict[str, str]) -> None:
         """Reads out the relevant headlines and their sentiment for a given stock"""
@@ -176,14 +261,57 @@ class MorningBriefingUseCase(AbstractUseCase):
         else:
             self.tts.convert_text("Unfortunately, I could not find any news sentiment information for you today.")
 
-    def check_proactivity(self) -> None:
-        """Check if there is a proactivity to be triggered."""
+    @staticmethod
+    def _get_next_wakeup(user: User) -> datetime:
+        """Returns the next time the user wakes up
+
+        Parameters
+        ----------
+        user : User
+            User preference information
+
+        Returns
+        -------
+        datetime
+            The wakeup time of today, or of tomorrow if it already passed.
+        """
+        wakeup = datetime.now().replace(
+            hour=user.favorites.wakeup_time.hour,
+            minute=user.favorites.wakeup_time.minute,
+            second=0,
+            microsecond=0,
+        )
+        if wakeup <= datetime.now():
+            wakeup += timedelta(days=1)
+
+        return wakeup
+
+    def _ask_news_sentiment_info(self, stock: dict[str, str]) -> None:
+        """Asks the user if the news sentiment of a stock should be read out
+
+        Parameters
+        ----------
+        stock : dict[str, str]
+            The stock of the user favorites, containing the `symbol` and `name`.
+        """
+        self.tts.convert_text("Do you want to hear more about this?")
+        if self.stt.check_if_yes():
+            self._news_sentiment_info(stock)
+
+    def check_proactivity(self) -> JobResult:
+        """Check if there is a proactivity to be triggered.
+
+        Returns
+        -------
+        JobResult
+            The last announced stock prices and the next wakeup time.
+        """
 
         logger.debug("Evaluate proactivity in morning briefing use case")
 
         try:
-            for stock in self.user.favorites.stocks:
-                price = get_stock_price(stock["symbol"])
+            prices = asyncio.run(self._fetch_stock_prices())
+            for stock, price in zip(self.user.favorites.stocks, prices):
                 if price is not None and self.last_stock_prices[stock["symbol"]] is not None:
                     change = (price - self.last_stock_prices[stock["symbol"]]) / self.last_stock_prices[stock["symbol"]]
                     if abs(change) >= 0.03:
@@ -193,14 +321,20 @@ class MorningBriefingUseCase(AbstractUseCase):
                             f"""price. It is now trading at {round(price, 2)} {self.currency[0]} per share."""
                         )
                         self.last_stock_prices[stock["symbol"]] = price
-                        self.tts.convert_text("Do you want to hear more about this?")
-                        if self.stt.check_if_yes():
-                            self._news_sentiment_info(stock)
+                        self.tts.follow_up(partial(self._ask_news_sentiment_info, stock))
         except KeyError:
             logger.error("Stock price not found in last briefing")
             self.tts.convert_text("Unfortunately, an error occurred while checking for proactivity.")
             self.tts.convert_text("This is probably due to a missing stock price from the last briefing.")
 
+        return JobResult(state=tuple(sorted(self.last_stock_prices.items())), deadline=self._get_next_wakeup(self.user))
+
+    async def _fetch_stock_prices(self) -> list[float | None]:
+        """Fetches the prices of all favorite stocks of the user in USD concurrently"""
+        return list(
+            await asyncio.gather(*(get_stock_price_async(stock["symbol"]) for stock in self.user.favorites.stocks))
+        )
+
     def trigger_assistant(self, best_match: BestMatch) -> None:
         """UseCase for morning briefing
 
@@ -7,14 +7,25 @@ from aswe.api.navigation import MapsTripMode, get_maps_connection, get_next_conn
 from aswe.api.weather import weather as weatherApi
 from aswe.api.weather.weather_params import DynamicPeriodEnum, ElementsEnum, IncludeEnum
 from aswe.core.objects import BestMatch
+from aswe.core.scheduler import JobResult
 from aswe.utils.abstract import AbstractUseCase
 
 
 class NavigationUseCase(AbstractUseCase):
     """Use case for navigation"""
 
-    def check_proactivity(self) -> None:
-        """Trigger proactivity if the next event is between 40 and 45 minutes in the future"""
+    proactivity_interval = timedelta(minutes=5)
+    proactivity_max_interval = timedelta(hours=1)
+    proactivity_priority = 0
+
+    def check_proactivity(self) -> JobResult:
+        """Trigger proactivity if the next event is between 40 and 45 minutes in the future
+
+        Returns
+        -------
+        JobResult
+            The next event of today and the time the proactivity would trigger for it.
+        """
 
         logger.debug("Evaluate proactivity in Navigation use case")
 
@@ -26,6 +37,13 @@ class NavigationUseCase(AbstractUseCase):
 
                 self.next_event_use_case()
 
+            return JobResult(
+                state=(next_event.title, next_event.start_time),
+                deadline=next_event_start_time - timedelta(minutes=44),
+            )
+
+        return JobResult()
+
     def trigger_assistant(self, best_match: BestMatch) -> None:
         """UseCase for navigation
 
@@ -1,5 +1,8 @@
+from datetime import datetime, timedelta
+
 from aswe.api.sport import basketball, f1, football, handball
 from aswe.core.objects import BestMatch
+from aswe.core.scheduler import JobResult
 from aswe.utils.abstract import AbstractUseCase
 from aswe.utils.error import ApiLimitReached
 
@@ -7,10 +10,37 @@ from aswe.utils.error import ApiLimitReached
 class SportUseCase(AbstractUseCase):
     """Use case for sports"""
 
-    def check_proactivity(self) -> None:
+    proactivity_interval = timedelta(minutes=15)
+    proactivity_max_interval = timedelta(hours=4)
+    proactivity_priority = 2
+    proactivity_hosts = ("api.football-data.org",)
+
+    next_kickoff: datetime | None = None
+
+    def _get_next_kickoff(self) -> datetime | None:
+        """Returns the next kick-off of the favorite team
+
+        The kick-off is only requested again once the last known match is over (after `3` hours).
+
+        Returns
+        -------
+        datetime | None
+            The next kick-off, `None` if no match is scheduled.
+        """
+        if self.next_kickoff is None or self.next_kickoff < datetime.now() - timedelta(hours=3):
+            self.next_kickoff = football.get_next_team_kickoff(self.user.favorites.league, self.user.favorites.team)
+
+        return self.next_kickoff
+
+    def check_proactivity(self) -> JobResult:
         """Check if there is a proactivity to be triggered
 
         * TODO: Why is it necessary to check if valid_teams is None twice?
+
+        Returns
+        -------
+        JobResult
+            The current match of the favorite team and the next kick-off.
         """
         valid_teams = football.get_teams(self.user.favorites.league)
         if valid_teams is None:
@@ -22,9 +52,11 @@ class SportUseCase(AbstractUseCase):
             )
         match = football.get_current_team_match(self.user.favorites.league, self.user.favorites.team)
         if match is None or match == []:
-            return
+            return JobResult(state=None, deadline=self._get_next_kickoff())
         self.tts.convert_text(match[0])
 
+        return JobResult(state=tuple(match), deadline=self._get_next_kickoff())
+
     def choose_league(self, leagues: list[str]) -> str:
         """Returns the league the users chooses.
 
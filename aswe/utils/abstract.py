@@ -1,13 +1,41 @@
 from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Callable
 
 from aswe.core.objects import BestMatch, User
+from aswe.core.scheduler import JobResult, ProactivityScheduler
+from aswe.core.state import StateStore
 from aswe.core.user_interaction import SpeechToText, TextToSpeech
 
 
 class AbstractUseCase(ABC):
-    """Abstract class for use cases"""
+    """Abstract class for use cases
 
-    def __init__(self, stt: SpeechToText, tts: TextToSpeech, assistant_name: str, user: User) -> None:
+    Attributes
+    ----------
+    proactivity_interval : timedelta | None
+        The shortest time between two `check_proactivity` runs, `None` if the use case has no proactivity.
+    proactivity_max_interval : timedelta | None
+        The longest time between two `check_proactivity` runs while nothing changes, `None` keeps the interval fixed.
+    proactivity_priority : int
+        The priority of the proactive announcements, lower values are spoken first.
+    proactivity_hosts : tuple[str, ...]
+        The API hosts `check_proactivity` polls, it is skipped while one of them is unavailable.
+    """
+
+    proactivity_interval: timedelta | None = None
+    proactivity_max_interval: timedelta | None = None
+    proactivity_priority: int = 1
+    proactivity_hosts: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        stt: SpeechToText,
+        tts: TextToSpeech,
+        assistant_name: str,
+        user: User,
+        state: StateStore | None = None,
+    ) -> None:
         """Use case constructor to provide objects from the parent agent class
 
         * TODO: Add Attributes section
@@ -22,11 +50,23 @@ class AbstractUseCase(ABC):
             The name of the assistant
         user: User
             User preference information
+        state : StateStore | None, optional
+            The store the state of the use case is checkpointed to. _By default the state is kept in memory_.
         """
         self.stt = stt
         self.tts = tts
         self.assistant_name = assistant_name
         self.user = user
+        self.state = state if state is not None else StateStore()
+
+        self.restore_state()
+
+    def restore_state(self) -> None:
+        """Restores the state of the use case from `self.state`
+
+        Called by the constructor. Use cases keeping state between turns override it, e.g. to replace a
+        dictionary with `self.state.mapping(...)`, so every change is checkpointed.
+        """
 
     @abstractmethod
     def trigger_assistant(self, best_match: BestMatch) -> None:
@@ -48,11 +88,16 @@ class AbstractUseCase(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def check_proactivity(self) -> None:
+    def check_proactivity(self) -> JobResult | None:
         """Abstract method for use case classes
 
         Checks apis if certain events have occurred and informs user.
 
+        Returns
+        -------
+        JobResult | None
+            The state which was checked and the next known deadline, used to adapt the polling interval.
+
         Raises
         ------
         NotImplementedError
@@ -60,3 +105,37 @@ class AbstractUseCase(ABC):
             or if the function is not implemented yet.
         """
         raise NotImplementedError
+
+    @classmethod
+    def register_jobs(
+        cls,
+        scheduler: ProactivityScheduler,
+        name: str,
+        get_instance: Callable[[], "AbstractUseCase"],
+        user: User,
+    ) -> None:
+        """Registers the proactive jobs of the use case
+
+        By default `check_proactivity` is registered under the name of the use case, polling between
+        `proactivity_interval` and `proactivity_max_interval`. The use case is only instantiated once a job is due.
+
+        Parameters
+        ----------
+        scheduler : ProactivityScheduler
+            The scheduler of the agent.
+        name : str
+            The name the use case is registered with.
+        get_instance : Callable[[], AbstractUseCase]
+            Callable returning the instance of the use case.
+        user : User
+            User preference information
+        """
+        if cls.proactivity_interval is not None:
+            scheduler.register(
+                name,
+                lambda: get_instance().check_proactivity(),
+                cls.proactivity_interval,
+                priority=cls.proactivity_priority,
+                max_interval=cls.proactivity_max_interval,
+                hosts=cls.proactivity_hosts,
+            )
@@ -0,0 +1,156 @@
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+from urllib.parse import urlsplit
+
+
+class BreakerState(Enum):
+    """Enum of the states of a circuit breaker"""
+
+    CLOSED = "closed"
+    """The host is healthy, requests are sent"""
+    OPEN = "open"
+    """The host failed repeatedly, requests fail fast"""
+    HALF_OPEN = "half_open"
+    """The recovery timeout passed, a single probe request is sent"""
+
+
+@dataclass
+class _Circuit:
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+
+
+def _host(url_or_host: str) -> str:
+    """Returns the host of a URL, or the host itself"""
+    return (urlsplit(url_or_host).netloc or url_or_host).lower()
+
+
+class CircuitBreaker:
+    """Circuit breaker per host which fails fast while a host is unhealthy
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts or `5xx` responses) the circuit
+    of the host opens and requests fail immediately instead of waiting for the timeout again. Once
+    `recovery_timeout` seconds passed, a single probe request is let through. Its success closes the circuit,
+    its failure opens it again.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, recovery_timeout: float = 60.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Parameters
+        ----------
+        failure_threshold : int, optional
+            The number of consecutive failures opening the circuit. _By default `3`_.
+        recovery_timeout : float, optional
+            The seconds an open circuit waits before probing the host again. _By default `60.0`_.
+        clock : Callable[[], float], optional
+            The clock in seconds. _By default `time.monotonic`_.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, url_or_host: str) -> BreakerState:
+        """Returns the state of the circuit of a host
+
+        Parameters
+        ----------
+        url_or_host : str
+            The URL of a request or the host.
+
+        Returns
+        -------
+        BreakerState
+            The state, an open circuit whose recovery timeout passed is reported as half open.
+        """
+        circuit = self._circuits.get(_host(url_or_host))
+        if circuit is None:
+            return BreakerState.CLOSED
+        if circuit.state == BreakerState.OPEN and self.clock() - circuit.opened_at >= self.recovery_timeout:
+            return BreakerState.HALF_OPEN
+
+        return circuit.state
+
+    def is_available(self, url_or_host: str) -> bool:
+        """Checks if a request to a host would be sent, without letting a probe request through
+
+        Parameters
+        ----------
+        url_or_host : str
+            The URL of a request or the host.
+
+        Returns
+        -------
+        bool
+            Boolean if the circuit of the host is not open.
+        """
+        return self.state(url_or_host) != BreakerState.OPEN
+
+    def allow(self, url: str) -> bool:
+        """Checks if a request may be sent and lets a single probe through once the recovery timeout passed
+
+        A probe without outcome (neither success nor failure recorded) is repeated after another timeout.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+
+        Returns
+        -------
+        bool
+            Boolean if the request may be sent, `False` if it should fail fast.
+        """
+        with self._lock:
+            circuit = self._circuits.get(_host(url))
+            if circuit is None or circuit.state == BreakerState.CLOSED:
+                return True
+            if self.clock() - circuit.opened_at >= self.recovery_timeout:
+                circuit.state = BreakerState.HALF_OPEN
+                circuit.opened_at = self.clock()
+                return True
+
+            return False
+
+    def record_success(self, url: str) -> None:
+        """Closes the circuit of a host after a successful request
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        """
+        with self._lock:
+            self._circuits.pop(_host(url), None)
+
+    def record_failure(self, url: str) -> None:
+        """Counts a failed request and opens the circuit once the threshold is reached or a probe failed
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(_host(url), _Circuit())
+            circuit.failures += 1
+            if circuit.state == BreakerState.HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = BreakerState.OPEN
+                circuit.opened_at = self.clock()
+
+    def states(self) -> dict[str, BreakerState]:
+        """Returns the states of all hosts which failed since their last success
+
+        Returns
+        -------
+        dict[str, BreakerState]
+            The states by host.
+        """
+        return {host: self.state(host) for host in list(self._circuits)}
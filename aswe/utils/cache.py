@@ -0,0 +1,778 @@
+import copy
+import dataclasses
+import functools
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Generic, Hashable, ParamSpec, TypeVar
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from aswe.utils.cassette import normalize_url
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class CacheStats:
+    """Dataclass to store the statistics of a cache
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups served from the cache.
+    misses : int
+        The number of lookups which were not cached or expired.
+    evictions : int
+        The number of entries removed because the cache was full.
+    expirations : int
+        The number of entries removed because their TTL passed.
+    revalidations : int
+        The number of hits served after the server confirmed a stale response with `304 Not Modified`.
+    coalesced : int
+        The number of calls which shared the result of an identical call in flight instead of calling again.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    revalidations: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Size-bounded cache whose entries expire after a time to live
+
+    Entries are kept in least recently used order. If the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int = 256, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of entries. _By default `256`_.
+        clock : Callable[[], float], optional
+            The clock the TTLs are measured with in seconds. _By default `time.monotonic`_.
+
+        Attributes
+        ----------
+        stats : CacheStats
+            The statistics of the cache.
+        """
+        self.max_entries = max_entries
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Returns a cached value
+
+        Parameters
+        ----------
+        key : K
+            The key of the value.
+
+        Returns
+        -------
+        V | None
+            The value, `None` if it is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                self.stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def put(self, key: K, value: V, ttl: float | None) -> None:
+        """Caches a value
+
+        Parameters
+        ----------
+        key : K
+            The key of the value.
+        value : V
+            The value.
+        ttl : float | None
+            The time to live in seconds, `None` keeps the value until it is evicted.
+        """
+        expires = self.clock() + ttl if ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        with self._lock:
+            self._entries.clear()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Dataclass to store how long the responses of a provider are cached
+
+    Attributes
+    ----------
+    name : str
+        The name of the policy, used to group the statistics.
+    pattern : str
+        Regular expression which is searched in the URL of the request.
+    ttl : float | None
+        The time to live in seconds, `None` caches the response until it is evicted and `0` disables caching.
+    """
+
+    name: str
+    pattern: str
+    ttl: float | None
+    _regex: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_regex", re.compile(self.pattern))
+
+    def matches(self, url: str) -> bool:
+        """Checks if the policy applies to a URL
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+
+        Returns
+        -------
+        bool
+            Boolean if the pattern is found in the URL.
+        """
+        return self._regex.search(url) is not None
+
+
+DEFAULT_POLICIES: list[CachePolicy] = [
+    CachePolicy("football-data.live", r"api\.football-data\.org/.*status=IN_PLAY", 60),
+    CachePolicy("football-data.standings", r"api\.football-data\.org/v4/competitions/\w+/standings", 10 * 60),
+    CachePolicy("football-data.teams", r"api\.football-data\.org/v4/competitions/\w+/teams", 24 * 60 * 60),
+    CachePolicy("football-data", r"api\.football-data\.org", 10 * 60),
+    CachePolicy("ergast.past", r"ergast\.com/api/f1/\d{4}/\d+/results", None),
+    CachePolicy("ergast", r"ergast\.com/api/f1", 60 * 60),
+    CachePolicy("api-sports.games", r"api-sports\.io/games", 5 * 60),
+    CachePolicy("api-sports.standings", r"api-sports\.io/standings", 60 * 60),
+    CachePolicy("api-sports", r"api-sports\.io/(teams|leagues)", 24 * 60 * 60),
+    CachePolicy("visualcrossing", r"weather\.visualcrossing\.com", 30 * 60),
+    CachePolicy("newsapi", r"newsapi\.org", 15 * 60),
+    CachePolicy("alphavantage", r"alphavantage\.co/query\?function=NEWS_SENTIMENT", 60 * 60),
+    CachePolicy("fmp.quote", r"financialmodelingprep\.com/api/v3/quote-short", 60),
+    CachePolicy("fmp.rating", r"financialmodelingprep\.com/api/v3/rating", 24 * 60 * 60),
+    CachePolicy("fmp", r"financialmodelingprep\.com", 10 * 60),
+    CachePolicy("ticketmaster", r"app\.ticketmaster\.com", 30 * 60),
+]
+"""Cache policies of the providers used by the API modules, the first matching policy applies"""
+
+
+@dataclass
+class StoredResponse:
+    """Dataclass to store a response of the `ResponseStore`
+
+    Attributes
+    ----------
+    response : Response
+        The restored response.
+    expires : float | None
+        The UNIX timestamp the response turns stale, `None` if it never does.
+    etag : str | None
+        The `ETag` header of the response.
+    last_modified : str | None
+        The `Last-Modified` header of the response.
+    """
+
+    response: Response
+    expires: float | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        """Checks if the response can be used without asking the server
+
+        Parameters
+        ----------
+        now : float
+            The current UNIX timestamp.
+
+        Returns
+        -------
+        bool
+            Boolean if the response is not expired.
+        """
+        return self.expires is None or self.expires > now
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """The headers of a conditional request revalidating the response"""
+        validators = {}
+        if self.etag is not None:
+            validators["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            validators["If-Modified-Since"] = self.last_modified
+        return validators
+
+
+class ResponseStore:
+    """SQLite store of HTTP responses which survives restarts
+
+    Bodies larger than `compress_min_size` are compressed with zlib. Stale responses with an `ETag` or
+    `Last-Modified` header are kept, so they can be revalidated with a conditional request. The URL of a response
+    is stored without secret query parameters (see `normalize_url`), API keys are never written to disk.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        max_entries: int = 1024,
+        compress_min_size: int = 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        path : str | Path, optional
+            The path to the SQLite database. _By default `:memory:`_.
+        max_entries : int, optional
+            The maximum number of stored responses, the oldest written responses are removed first.
+            _By default `1024`_.
+        compress_min_size : int, optional
+            The body size in bytes from which bodies are compressed. _By default `1024`_.
+        clock : Callable[[], float], optional
+            The clock returning the current UNIX timestamp. _By default `time.time`_.
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.compress_min_size = compress_min_size
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, url TEXT, status INTEGER NOT NULL, headers TEXT NOT NULL, "
+                "encoding TEXT, body BLOB NOT NULL, compressed INTEGER NOT NULL, etag TEXT, last_modified TEXT, "
+                "expires REAL, stored REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> StoredResponse | None:
+        """Returns a stored response
+
+        Stale responses which can not be revalidated are removed.
+
+        Parameters
+        ----------
+        key : str
+            The key of the response.
+
+        Returns
+        -------
+        StoredResponse | None
+            The response, `None` if it is not stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, status, headers, encoding, body, compressed, etag, last_modified, expires "
+                "FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        url, status, headers, encoding, body, compressed, etag, last_modified, expires = row
+        if expires is not None and expires <= self.clock() and etag is None and last_modified is None:
+            self.delete(key)
+            return None
+
+        return StoredResponse(
+            self._response(url, status, headers, encoding, body, compressed), expires, etag, last_modified
+        )
+
+    @staticmethod
+    def _response(
+        url: str | None, status: int, headers: str, encoding: str | None, body: bytes, compressed: int
+    ) -> Response:
+        """Restores a response from its columns"""
+        response = Response()
+        response.url = url  # type: ignore[assignment]
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.encoding = encoding
+        response._content = zlib.decompress(body) if compressed else body  # pylint: disable=protected-access
+
+        return response
+
+    def responses(self) -> list[Response]:
+        """Returns all stored responses, including stale ones
+
+        Returns
+        -------
+        list[Response]
+            The responses, oldest written first.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url, status, headers, encoding, body, compressed FROM responses ORDER BY stored"
+            ).fetchall()
+
+        return [self._response(*row) for row in rows]
+
+    def put(self, key: str, response: Response, expires: float | None) -> None:
+        """Stores a response, replacing the previous one
+
+        Parameters
+        ----------
+        key : str
+            The key of the response.
+        response : Response
+            The response.
+        expires : float | None
+            The UNIX timestamp the response turns stale, `None` if it never does.
+        """
+        body = response.content
+        compressed = len(body) >= self.compress_min_size
+        if compressed:
+            body = zlib.compress(body)
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    normalize_url(response.url) if response.url else None,
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    response.encoding,
+                    body,
+                    int(compressed),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    expires,
+                    self.clock(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY stored DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def refresh(self, key: str, expires: float | None) -> None:
+        """Extends the lifetime of a revalidated response
+
+        Parameters
+        ----------
+        key : str
+            The key of the response.
+        expires : float | None
+            The new UNIX timestamp the response turns stale, `None` if it never does.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE responses SET expires = ?, stored = ? WHERE key = ?", (expires, self.clock(), key)
+            )
+
+    def delete(self, key: str) -> None:
+        """Removes a response
+
+        Parameters
+        ----------
+        key : str
+            The key of the response.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache:
+    """Cache of successful HTTP responses with a TTL per provider
+
+    Responses are keyed on the URL and the headers of the request. Requests without a matching policy are
+    not cached. Every lookup returns a copy, so callers can not change the cached response.
+
+    Responses are kept in memory and, if a `ResponseStore` is given, written to disk. After a restart the
+    memory is refilled from the store. Stale stored responses are revalidated with a conditional request,
+    a `304 Not Modified` answer counts as hit.
+    """
+
+    def __init__(
+        self,
+        policies: list[CachePolicy] | None = None,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+        store: ResponseStore | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        policies : list[CachePolicy] | None, optional
+            The policies, the first matching policy applies. _By default `DEFAULT_POLICIES`_.
+        max_entries : int, optional
+            The maximum number of responses cached in memory. _By default `256`_.
+        clock : Callable[[], float], optional
+            The clock the TTLs in memory are measured with in seconds. _By default `time.monotonic`_.
+        store : ResponseStore | None, optional
+            The store responses are persisted to. _By default responses are only cached in memory_.
+
+        Attributes
+        ----------
+        policy_stats : dict[str, CacheStats]
+            The statistics by policy name.
+        """
+        self.policies = policies if policies is not None else DEFAULT_POLICIES
+        self.store = store
+        self.policy_stats: dict[str, CacheStats] = {}
+        self._cache: TTLCache[str, Response] = TTLCache(max_entries, clock)
+
+    @property
+    def stats(self) -> CacheStats:
+        """The statistics of all policies"""
+        return CacheStats(
+            hits=sum(stats.hits for stats in self.policy_stats.values()),
+            misses=sum(stats.misses for stats in self.policy_stats.values()),
+            evictions=self._cache.stats.evictions,
+            expirations=self._cache.stats.expirations,
+            revalidations=sum(stats.revalidations for stats in self.policy_stats.values()),
+        )
+
+    def policy(self, url: str) -> CachePolicy | None:
+        """Returns the policy of a URL
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+
+        Returns
+        -------
+        CachePolicy | None
+            The first matching policy, `None` if responses of the URL are not cached.
+        """
+        policy = next((policy for policy in self.policies if policy.matches(url)), None)
+        return policy if policy is not None and policy.ttl != 0 else None
+
+    @staticmethod
+    def key(url: str, headers: dict[Any, Any] | None) -> str:
+        """Returns the cache key of a request
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        headers : dict[Any, Any] | None
+            The headers of the request.
+
+        Returns
+        -------
+        str
+            The key.
+        """
+        return f"{url} {sorted((str(name), str(value)) for name, value in (headers or {}).items())}"
+
+    @classmethod
+    def _store_key(cls, url: str, headers: dict[Any, Any] | None) -> str:
+        """Returns the hashed key of a request, so API keys in headers are not written to disk"""
+        return hashlib.sha256(cls.key(url, headers).encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, response: Response, expires: float | None) -> None:
+        """Caches a stored response in memory for the rest of its lifetime"""
+        ttl = expires - self.store.clock() if self.store is not None and expires is not None else None
+        self._cache.put(key, response, ttl)
+
+    def get(self, url: str, headers: dict[Any, Any] | None = None) -> Response | None:
+        """Returns a cached response
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        headers : dict[Any, Any] | None, optional
+            The headers of the request. _By default `None`_.
+
+        Returns
+        -------
+        Response | None
+            A copy of the cached response, `None` if it is not cached or stale.
+        """
+        policy = self.policy(url)
+        if policy is None:
+            return None
+
+        stats = self.policy_stats.setdefault(policy.name, CacheStats())
+        key = self.key(url, headers)
+        response = self._cache.get(key)
+        if response is None and self.store is not None:
+            stored = self.store.get(self._store_key(url, headers))
+            if stored is not None and stored.is_fresh(self.store.clock()):
+                response = stored.response
+                self._remember(key, response, stored.expires)
+
+        if response is None:
+            stats.misses += 1
+            return None
+
+        stats.hits += 1
+        return copy.copy(response)
+
+    def validators(self, url: str, headers: dict[Any, Any] | None = None) -> dict[str, str]:
+        """Returns the headers to revalidate a stale stored response with a conditional request
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        headers : dict[Any, Any] | None, optional
+            The headers of the request. _By default `None`_.
+
+        Returns
+        -------
+        dict[str, str]
+            `If-None-Match` and `If-Modified-Since`, empty if there is no response to revalidate.
+        """
+        if self.store is None or self.policy(url) is None:
+            return {}
+
+        stored = self.store.get(self._store_key(url, headers))
+        return stored.validators if stored is not None else {}
+
+    def revalidate(self, url: str, headers: dict[Any, Any] | None = None) -> Response | None:
+        """Returns the stored response after the server answered a conditional request with `304 Not Modified`
+
+        The lifetime of the stored response starts again.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        headers : dict[Any, Any] | None, optional
+            The headers of the request without the validators. _By default `None`_.
+
+        Returns
+        -------
+        Response | None
+            A copy of the stored response, `None` if it is not stored anymore.
+        """
+        policy = self.policy(url)
+        if policy is None or self.store is None:
+            return None
+
+        store_key = self._store_key(url, headers)
+        stored = self.store.get(store_key)
+        if stored is None:
+            return None
+
+        expires = self.store.clock() + policy.ttl if policy.ttl is not None else None
+        self.store.refresh(store_key, expires)
+        self._remember(self.key(url, headers), stored.response, expires)
+
+        stats = self.policy_stats.setdefault(policy.name, CacheStats())
+        stats.hits += 1
+        stats.revalidations += 1
+        return copy.copy(stored.response)
+
+    def put(self, url: str, headers: dict[Any, Any] | None, response: Response) -> None:
+        """Caches a successful response
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        headers : dict[Any, Any] | None
+            The headers of the request.
+        response : Response
+            The response, which is only cached with status code `200`.
+        """
+        policy = self.policy(url)
+        if policy is None or response.status_code != 200:
+            return
+
+        self._cache.put(self.key(url, headers), copy.copy(response), policy.ttl)
+        if self.store is not None:
+            expires = self.store.clock() + policy.ttl if policy.ttl is not None else None
+            self.store.put(self._store_key(url, headers), response, expires)
+
+    def clear(self) -> None:
+        """Removes all responses cached in memory"""
+        self._cache.clear()
+
+
+class SingleFlight(Generic[R]):
+    """Coalesces concurrent identical calls into a single call
+
+    The first caller of a key runs the call, every caller arriving while it is in flight waits for and shares
+    its result or exception. Once the call finished, the next caller runs the call again.
+    """
+
+    def __init__(self) -> None:
+        """
+        Attributes
+        ----------
+        saved : int
+            The number of calls which shared the result of a call in flight.
+        """
+        self.saved = 0
+        self._calls: dict[Hashable, Future[R]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], R]) -> tuple[R, bool]:
+        """Runs a call or waits for the identical call in flight
+
+        Parameters
+        ----------
+        key : Hashable
+            The key identifying identical calls.
+        function : Callable[[], R]
+            The call.
+
+        Returns
+        -------
+        tuple[R, bool]
+            The result and a boolean if it is shared with another caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+            else:
+                self.saved += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = function()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return result, False
+
+
+class CachedFunction(Generic[P, R]):
+    """Function whose results are cached for a time to live, created with `ttl_cache`"""
+
+    def __init__(self, function: Callable[P, R], ttl: float | None, max_entries: int = 128) -> None:
+        """
+        Parameters
+        ----------
+        function : Callable[P, R]
+            The wrapped function.
+        ttl : float | None
+            The time to live of a result in seconds, `None` keeps the result until it is evicted.
+        max_entries : int, optional
+            The maximum number of cached results. _By default `128`_.
+        """
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.ttl = ttl
+        self._cache: TTLCache[Hashable, R] = TTLCache(max_entries)
+        self._flights: SingleFlight[R] = SingleFlight()
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        key = (args, tuple(sorted(kwargs.items())))
+        result = self._cache.get(key)
+        if result is None:
+            result, _ = self._flights.do(key, functools.partial(self._load, key, *args, **kwargs))
+
+        return result
+
+    def _load(self, key: Hashable, *args: Any, **kwargs: Any) -> R:
+        """Calls the function and caches its result"""
+        result = self.function(*args, **kwargs)
+        if result is not None:
+            self._cache.put(key, result, self.ttl)
+
+        return result
+
+    def cache_stats(self) -> CacheStats:
+        """Returns the statistics of the cache"""
+        return dataclasses.replace(self._cache.stats, coalesced=self._flights.saved)
+
+    def cache_clear(self) -> None:
+        """Removes all cached results"""
+        self._cache.clear()
+
+
+def ttl_cache(ttl: float | None, max_entries: int = 128) -> Callable[[Callable[P, R]], CachedFunction[P, R]]:
+    """Caches the results of a function for `ttl` seconds
+
+    Intended for clients which do not use `http_request` (e.g. Google Maps or Google Calendar). Like
+    `functools.lru_cache`, the arguments must be hashable and the wrapper provides `cache_stats` and
+    `cache_clear`. `None` results are not cached. Concurrent calls with the same arguments share one call.
+
+    ```python
+    @ttl_cache(5 * 60)
+    def get_maps_connection(start_location: str, end_location: str, mode: MapsTripMode) -> MapsTrip:
+        ...
+    ```
+
+    Parameters
+    ----------
+    ttl : float | None
+        The time to live of a result in seconds, `None` keeps the result until it is evicted.
+    max_entries : int, optional
+        The maximum number of cached results. _By default `128`_.
+
+    Returns
+    -------
+    Callable[[Callable[P, R]], CachedFunction[P, R]]
+        The decorator.
+    """
+
+    def decorator(function: Callable[P, R]) -> CachedFunction[P, R]:
+        return CachedFunction(function, ttl, max_entries)
+
+    return decorator
@@ -0,0 +1,250 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Iterator, ParamSpec, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from loguru import logger
+
+from aswe.utils.error import CassetteMiss
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_SECRET_PARAMS = {"apikey", "key", "token"}
+
+
+def normalize_url(url: str) -> str:
+    """Removes secret query parameters (e.g. `apikey`) from a URL
+
+    Recorded sessions must not contain API keys, therefore canned responses are looked up by the normalized URL.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+
+    Returns
+    -------
+    str
+        The URL without secret query parameters.
+    """
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query) if name.lower() not in _SECRET_PARAMS]
+
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class CassetteMode(str, Enum):
+    """Enum of the modes of a cassette"""
+
+    RECORD = "record"
+    """Calls are sent and their results stored, replacing earlier recordings of the same call"""
+    REPLAY = "replay"
+    """Calls are answered from the cassette without touching the network"""
+
+
+class Cassette:
+    """SQLite store of recorded API calls which are replayed deterministically
+
+    Every call is stored under its name (e.g. the host and endpoint of an HTTP request or `googlemaps.directions`)
+    and its parameters. A replayed call whose parameters were not recorded, e.g. because the URL contains the
+    current date, is answered with the recordings of the same name in the order they were recorded.
+
+    Results are stored with `pickle`, so only replay cassettes you recorded yourself.
+    """
+
+    def __init__(self, path: str | Path, mode: CassetteMode = CassetteMode.REPLAY) -> None:
+        """
+        Parameters
+        ----------
+        path : str | Path
+            The path to the SQLite database, `:memory:` for a cassette which is not persisted.
+        mode : CassetteMode, optional
+            Whether calls are recorded or replayed. _By default `CassetteMode.REPLAY`_.
+
+        Raises
+        ------
+        FileNotFoundError
+            If a cassette should be replayed which does not exist.
+        """
+        if str(path) != ":memory:":
+            if mode == CassetteMode.REPLAY and not Path(path).is_file():
+                raise FileNotFoundError(f"No cassette at {path}")
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.mode = CassetteMode(mode)
+        self._lock = threading.Lock()
+        self._positions: dict[str, int] = {}
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS calls ("
+                "key TEXT PRIMARY KEY, name TEXT NOT NULL, params TEXT NOT NULL, result BLOB NOT NULL, "
+                "recorded REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def key(name: str, params: str) -> str:
+        """Returns the key of a call
+
+        Parameters
+        ----------
+        name : str
+            The name of the call.
+        params : str
+            The representation of the parameters.
+
+        Returns
+        -------
+        str
+            The SHA-256 hex digest of name and parameters.
+        """
+        return hashlib.sha256(f"{name}\n{params}".encode("utf-8")).hexdigest()
+
+    def call(self, name: str, params: str, function: Callable[[], R]) -> R:
+        """Records or replays a call
+
+        Parameters
+        ----------
+        name : str
+            The name of the call.
+        params : str
+            The representation of the parameters, it must not contain secrets.
+        function : Callable[[], R]
+            Sends the call, only used while recording.
+
+        Returns
+        -------
+        R
+            The result of the call.
+
+        Raises
+        ------
+        CassetteMiss
+            If a replayed call was never recorded under its name.
+        """
+        key = self.key(name, params)
+        if self.mode == CassetteMode.REPLAY:
+            replayed: R = self._replay(key, name, params)
+            return replayed
+
+        result = function()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?)",
+                (key, name, params, pickle.dumps(result), time.time()),
+            )
+
+        return result
+
+    def _replay(self, key: str, name: str, params: str) -> Any:
+        """Returns the recorded result of a call, falling back to the recordings of its name"""
+        with self._lock:
+            row = self._connection.execute("SELECT result FROM calls WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                rows = self._connection.execute(
+                    "SELECT result FROM calls WHERE name = ? ORDER BY recorded", (name,)
+                ).fetchall()
+                if not rows:
+                    raise CassetteMiss(f"No recorded call of {name} with {params}")
+                position = self._positions.get(name, 0)
+                self._positions[name] = position + 1
+                row = rows[position % len(rows)]
+                logger.debug(f"Replaying the recording {position % len(rows)} of {name} for {params}")
+
+        return pickle.loads(row[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM calls").fetchone()[0])
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+_CASSETTE: Cassette | None = None
+
+
+def configure_cassette(cassette: Cassette | None = None) -> None:
+    """Replaces the cassette API calls are recorded to or replayed from
+
+    Parameters
+    ----------
+    cassette : Cassette | None, optional
+        The cassette. _By default `None`, calls are sent as usual_.
+    """
+    global _CASSETTE  # pylint: disable=global-statement
+    _CASSETTE = cassette
+
+
+def current_cassette() -> Cassette | None:
+    """Returns the cassette API calls are recorded to or replayed from, `None` if there is none"""
+    return _CASSETTE
+
+
+@contextmanager
+def use_cassette(path: str | Path, mode: CassetteMode = CassetteMode.REPLAY) -> Iterator[Cassette]:
+    """Records or replays the API calls sent in the context
+
+    ```python
+    with use_cassette("data/cassettes/briefing.sqlite", CassetteMode.RECORD):
+        use_case.full_briefing()
+    ```
+
+    Parameters
+    ----------
+    path : str | Path
+        The path to the cassette.
+    mode : CassetteMode, optional
+        Whether calls are recorded or replayed. _By default `CassetteMode.REPLAY`_.
+
+    Yields
+    ------
+    Cassette
+        The cassette.
+    """
+    previous = _CASSETTE
+    cassette = Cassette(path, mode)
+    configure_cassette(cassette)
+    try:
+        yield cassette
+    finally:
+        configure_cassette(previous)
+        cassette.close()
+
+
+def recorded(name: str, function: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """Calls a function of an API client through the current cassette
+
+    Without a cassette the function is simply called. It is used for the clients which do not send their
+    requests with `http_request`, e.g. `recorded("googlemaps.directions", directions, start, end)`.
+
+    Parameters
+    ----------
+    name : str
+        The name of the call.
+    function : Callable[P, R]
+        The function sending the call.
+    *args : P.args
+        The positional arguments of the function, their representation must not contain secrets.
+    **kwargs : P.kwargs
+        The keyword arguments of the function.
+
+    Returns
+    -------
+    R
+        The result of the function, respectively the recorded result.
+    """
+    if _CASSETTE is None:
+        return function(*args, **kwargs)
+
+    params = repr((args, sorted(kwargs.items())))
+    return _CASSETTE.call(name, params, lambda: function(*args, **kwargs))
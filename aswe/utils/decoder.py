@@ -0,0 +1,215 @@
+import codecs
+import importlib
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+import requests
+from requests import Response
+
+from aswe.utils.metrics import request_metrics
+
+
+@dataclass(frozen=True)
+class JsonDecoder:
+    """Dataclass to store a JSON decoder
+
+    Attributes
+    ----------
+    name : str
+        The name of the library, reported by the benchmark.
+    loads : Callable[[bytes], Any]
+        Decodes a UTF-8 encoded JSON document. Invalid documents raise a `ValueError`.
+    """
+
+    name: str
+    loads: Callable[[bytes], Any]
+
+
+STDLIB_DECODER = JsonDecoder("json", json.loads)
+"""Decoder of the standard library, always available"""
+
+
+def fast_decoder() -> JsonDecoder | None:
+    """Returns the decoder of `orjson` if it is installed
+
+    Returns
+    -------
+    JsonDecoder | None
+        The decoder, `None` if `orjson` is not installed.
+    """
+    try:
+        orjson = importlib.import_module("orjson")
+    except ModuleNotFoundError:
+        return None
+
+    return JsonDecoder("orjson", orjson.loads)
+
+
+_DECODER = fast_decoder() or STDLIB_DECODER
+
+
+def configure_decoder(decoder: JsonDecoder | None = None) -> None:
+    """Replaces the decoder used by `decode_json`
+
+    Parameters
+    ----------
+    decoder : JsonDecoder | None, optional
+        The decoder. _By default `orjson` if it is installed, otherwise the standard library_.
+    """
+    global _DECODER  # pylint: disable=global-statement
+    _DECODER = decoder or fast_decoder() or STDLIB_DECODER
+
+
+def current_decoder() -> JsonDecoder:
+    """Returns the decoder used by `decode_json`"""
+    return _DECODER
+
+
+def decode_json(response: Response) -> Any:
+    """Decodes the JSON body of a response with the configured decoder
+
+    Replaces `response.json()` in the API modules. The body is decoded from bytes without creating an
+    intermediate string.
+
+    Parameters
+    ----------
+    response : Response
+        The response of `http_request`.
+
+    Returns
+    -------
+    Any
+        The decoded body.
+
+    Raises
+    ------
+    requests.JSONDecodeError
+        If the body is not valid JSON, the same error `response.json()` raises.
+    """
+    content = response.content
+    try:
+        return _DECODER.loads(content)
+    except ValueError as err:
+        request_metrics().record_error(response.url, "json")
+        raise requests.JSONDecodeError(str(err), content.decode("utf-8", errors="replace"), 0) from err
+
+
+class _JsonStream:
+    """Incremental reader of a JSON document which arrives in chunks
+
+    Only the unread part of the document is buffered, so values which were already decoded are released.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+
+    def _read(self) -> bool:
+        """Appends the next chunk to the unread part of the buffer, returns `False` at the end of the document"""
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._position :] + self._text.decode(chunk)
+                self._position = 0
+                return True
+
+        return False
+
+    def _peek(self, separators: str = "") -> str:
+        """Skips whitespace and separators and returns the next character, `""` at the end of the document"""
+        while True:
+            while self._position < len(self._buffer) and (
+                self._buffer[self._position].isspace() or self._buffer[self._position] in separators
+            ):
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._read():
+                return ""
+
+    def _expect(self, character: str) -> None:
+        """Consumes the next character, which must be `character`"""
+        if self._peek() != character:
+            raise json.JSONDecodeError(f"Expecting '{character}'", self._buffer, self._position)
+        self._position += 1
+
+    def _value(self) -> Any:
+        """Decodes the next value, reading chunks until it is complete"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+                # A value ending with the buffer may be cut off, e.g. a number
+                if end < len(self._buffer):
+                    self._position = end
+                    return value
+            except json.JSONDecodeError:
+                pass
+            if not self._read():
+                value, self._position = self._decoder.raw_decode(self._buffer, self._position)
+                return value
+
+    def items(self, key: str) -> Iterator[Any]:
+        """Yields the items of the array stored under `key` in the top level object"""
+        self._expect("{")
+        while self._peek(",") != "}":
+            name = self._value()
+            self._expect(":")
+            if name == key:
+                self._expect("[")
+                while self._peek(",") != "]":
+                    yield self._value()
+                return
+            self._value()
+
+        raise KeyError(key)
+
+
+def iter_json_items(response: Response, key: str, chunk_size: int = 16 * 1024) -> Iterator[Any]:
+    """Yields the items of an array in the JSON body of a response while it is downloaded
+
+    Large feeds (e.g. all matches of the day) are decoded item by item, so items which are filtered out are
+    released right away and the download stops as soon as the caller stops iterating. Otherwise the body is read
+    to its end after the last item, so the response is cached. Use it with `http_request(url, stream=True)`:
+
+    ```python
+    response = http_request(url, stream=True)
+    relevant_news = list(islice(filter(is_relevant, iter_json_items(response, "feed")), 2))
+    ```
+
+    Parameters
+    ----------
+    response : Response
+        The response of `http_request`, streamed or with its body already loaded.
+    key : str
+        The key of the array in the top level object of the body.
+    chunk_size : int, optional
+        The number of bytes read at once. _By default `16 * 1024`_.
+
+    Yields
+    ------
+    Any
+        The decoded items of the array.
+
+    Raises
+    ------
+    KeyError
+        If the top level object has no `key`.
+    json.JSONDecodeError
+        If the body is not valid JSON.
+    """
+    chunks = response.iter_content(chunk_size) if response.raw is not None else iter([response.content])
+    try:
+        yield from _JsonStream(chunks).items(key)
+        # The rest of the body is read, so `http_request` can cache the completely read response
+        for _ in chunks:
+            pass
+    except json.JSONDecodeError:
+        request_metrics().record_error(response.url, "json")
+        raise
+    finally:
+        if response.raw is not None:
+            response.close()
@@ -4,3 +4,7 @@ class ApiLimitReached(Exception):
 
 class TooManyRequests(Exception):
     """Define an exception for when too many requests are made."""
+
+
+class CassetteMiss(Exception):
+    """Define an exception for when a replayed API call was never recorded."""
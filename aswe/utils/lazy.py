@@ -0,0 +1,55 @@
+import importlib
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Module proxy which imports the actual module on first attribute access
+
+    Heavy third party libraries (e.g. `pandas` or `googleapiclient`) are only required by some use cases.
+    Importing them through a proxy keeps them out of the agent startup until the use case is actually used.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            The absolute name of the module, e.g. `google.auth.transport.requests`.
+        """
+        super().__init__(name)
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+
+        return self._module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a proxy for a module which is imported on first use
+
+    ```python
+    pd = lazy_import("pandas")
+
+    pd.read_csv(file)  # pandas is imported here
+    ```
+
+    Parameters
+    ----------
+    name : str
+        The absolute name of the module.
+
+    Returns
+    -------
+    LazyModule
+        Proxy of the module.
+    """
+    return LazyModule(name)
@@ -0,0 +1,284 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+from aswe.core.state import StateStore
+
+_BACKGROUND: ContextVar[bool] = ContextVar("background", default=False)
+
+
+@contextmanager
+def background_requests() -> Iterator[None]:
+    """Marks the requests sent in the context as low priority
+
+    The agent runs its proactive jobs in this context, so their polls are dropped before the daily quota
+    reserved for requests of the user runs out.
+    """
+    token = _BACKGROUND.set(True)
+    try:
+        yield
+    finally:
+        _BACKGROUND.reset(token)
+
+
+def is_background() -> bool:
+    """Checks if the current context sends low priority requests, see `background_requests`"""
+    return _BACKGROUND.get()
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Dataclass to store the limits of an API
+
+    Attributes
+    ----------
+    pattern : str
+        Regular expression matched against the host of the request. Every matching host has its own limits.
+    rate : float
+        The number of requests per second the token bucket is refilled with.
+    burst : int
+        The size of the token bucket, i.e. the number of requests which can be sent at once.
+    daily_quota : int | None
+        The number of requests per day, `None` if the API has no daily limit.
+    reserve : float
+        The share of the daily quota reserved for requests of the user. Background requests are dropped once
+        less is left.
+    """
+
+    pattern: str
+    rate: float
+    burst: int
+    daily_quota: int | None = None
+    reserve: float = 0.2
+    _regex: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_regex", re.compile(self.pattern))
+
+    def matches(self, host: str) -> bool:
+        """Checks if the limit applies to a host
+
+        Parameters
+        ----------
+        host : str
+            The host of the request.
+
+        Returns
+        -------
+        bool
+            Boolean if the pattern is found in the host.
+        """
+        return self._regex.search(host) is not None
+
+
+DEFAULT_LIMITS: list[RateLimit] = [
+    RateLimit(r"api-sports\.io$", rate=10 / 60, burst=10, daily_quota=100),
+    RateLimit(r"alphavantage\.co$", rate=5 / 60, burst=5, daily_quota=500),
+    RateLimit(r"financialmodelingprep\.com$", rate=5, burst=10, daily_quota=250),
+    RateLimit(r"api\.football-data\.org$", rate=10 / 60, burst=10),
+    RateLimit(r"newsapi\.org$", rate=1, burst=5, daily_quota=100),
+    RateLimit(r"weather\.visualcrossing\.com$", rate=1, burst=5, daily_quota=1000),
+    RateLimit(r"ergast\.com$", rate=4, burst=4),
+    RateLimit(r"app\.ticketmaster\.com$", rate=5, burst=5, daily_quota=5000),
+]
+"""Limits of the free plans of the APIs used by the API modules, the first matching limit applies"""
+
+
+class TokenBucket:
+    """Token bucket allowing `burst` requests at once and `rate` requests per second on average"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Parameters
+        ----------
+        rate : float
+            The number of tokens per second the bucket is refilled with.
+        burst : int
+            The size of the bucket.
+        clock : Callable[[], float], optional
+            The clock in seconds. _By default `time.monotonic`_.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+
+    def acquire(self) -> float:
+        """Takes a token from the bucket
+
+        Returns
+        -------
+        float
+            `0` if a token was taken, otherwise the seconds until the next token is available.
+        """
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+
+@dataclass
+class QuotaUsage:
+    """Dataclass to store the daily quota usage of a host
+
+    Attributes
+    ----------
+    day : str
+        The day in ISO format the usage was counted on.
+    used : int
+        The number of requests sent on that day.
+    dropped : int
+        The number of background requests dropped on that day.
+    """
+
+    day: str
+    used: int = 0
+    dropped: int = 0
+
+
+class RateLimiter:
+    """Rate limiter with a token bucket and a daily quota per host
+
+    The quota usage is checkpointed to a `StateStore`, so a restarted agent does not consume the daily
+    quota again. Requests of the user wait for a token and are only refused once the quota is exhausted.
+    Background requests (see `background_requests`) are already refused once the reserve of the quota is
+    reached, so proactive polls can not use up the quota of the user.
+    """
+
+    def __init__(
+        self,
+        limits: list[RateLimit] | None = None,
+        state: StateStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], date] = date.today,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        limits : list[RateLimit] | None, optional
+            The limits, the first matching limit applies. _By default `DEFAULT_LIMITS`_.
+        state : StateStore | None, optional
+            The store the quota usage is persisted to. _By default the usage is kept in memory_.
+        clock : Callable[[], float], optional
+            The clock of the token buckets in seconds. _By default `time.monotonic`_.
+        today : Callable[[], date], optional
+            Returns the current day the quotas are counted on. _By default `date.today`_.
+        sleep : Callable[[float], None], optional
+            Waits for the next token. _By default `time.sleep`_.
+        """
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
+        self.state = state if state is not None else StateStore()
+        self.clock = clock
+        self.today = today
+        self.sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._usage: dict[str, QuotaUsage] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, host: str) -> RateLimit | None:
+        """Returns the limit of a host
+
+        Parameters
+        ----------
+        host : str
+            The host of the request.
+
+        Returns
+        -------
+        RateLimit | None
+            The first matching limit, `None` if the host is not limited.
+        """
+        return next((limit for limit in self.limits if limit.matches(host)), None)
+
+    def usage(self, host: str) -> QuotaUsage:
+        """Returns the quota usage of a host on the current day
+
+        Parameters
+        ----------
+        host : str
+            The host of the request.
+
+        Returns
+        -------
+        QuotaUsage
+            The usage, restored from the store after a restart.
+        """
+        day = self.today().isoformat()
+        usage = self._usage.get(host)
+        if usage is None or usage.day != day:
+            stored = self.state.get("rate_limits", host)
+            usage = QuotaUsage(**stored) if stored is not None and stored["day"] == day else QuotaUsage(day)
+            self._usage[host] = usage
+
+        return usage
+
+    def acquire(self, url: str, background: bool | None = None) -> bool:
+        """Waits until a request may be sent and counts it against the daily quota
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        background : bool | None, optional
+            Boolean if the request is low priority. _By default `is_background()`_.
+
+        Returns
+        -------
+        bool
+            Boolean if the request may be sent, `False` if the quota does not allow it.
+        """
+        host = urlsplit(url).netloc.lower()
+        limit = self.limit(host)
+        if limit is None:
+            return True
+
+        background = is_background() if background is None else background
+        while True:
+            with self._lock:
+                usage = self.usage(host)
+                if limit.daily_quota is not None:
+                    allowed = limit.daily_quota * (1 - limit.reserve) if background else limit.daily_quota
+                    if usage.used >= allowed:
+                        if background:
+                            usage.dropped += 1
+                            self.state.set("rate_limits", host, usage)
+                        return False
+
+                bucket = self._buckets.setdefault(host, TokenBucket(limit.rate, limit.burst, self.clock))
+                wait = bucket.acquire()
+                if wait == 0:
+                    usage.used += 1
+                    self.state.set("rate_limits", host, usage)
+                    return True
+
+            self.sleep(wait)
+
+    def exhaust(self, url: str) -> None:
+        """Marks the daily quota of a host as used up, e.g. after the API answered `429 Too Many Requests`
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        """
+        host = urlsplit(url).netloc.lower()
+        limit = self.limit(host)
+        if limit is None or limit.daily_quota is None:
+            return
+
+        with self._lock:
+            usage = self.usage(host)
+            usage.used = max(usage.used, limit.daily_quota)
+            self.state.set("rate_limits", host, usage)
@@ -0,0 +1,403 @@
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Dataclass to store how the URLs of an API endpoint are grouped
+
+    Attributes
+    ----------
+    pattern : str
+        Regular expression searched in the URL without its scheme.
+    template : str
+        The name of the endpoint, may reference groups of the pattern, e.g. `/api/v3/\\1/{symbol}`.
+    """
+
+    pattern: str
+    template: str
+    _regex: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_regex", re.compile(self.pattern))
+
+    def match(self, url: str) -> str | None:
+        """Returns the endpoint of a URL
+
+        Parameters
+        ----------
+        url : str
+            The URL without its scheme.
+
+        Returns
+        -------
+        str | None
+            The expanded template, `None` if the pattern is not found in the URL.
+        """
+        match = self._regex.search(url)
+        return match.expand(self.template) if match is not None else None
+
+
+DEFAULT_ENDPOINTS: list[Endpoint] = [
+    Endpoint(r"financialmodelingprep\.com(/api/v3/[\w-]+)/", r"\1/{symbol}"),
+    Endpoint(r"alphavantage\.co/query\?(?:.*&)?function=(\w+)", r"/query?function=\1"),
+    Endpoint(r"api\.football-data\.org/v4/(competitions|teams)/[^/?]+(/\w+)?", r"/v4/\1/{id}\2"),
+    Endpoint(r"visualcrossing\.com(/\S+/timeline)/", r"\1/{location}"),
+]
+"""Endpoints whose URLs contain parameters in the path, other URLs are grouped by their path with numeric
+segments replaced by `{id}`"""
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds in seconds of the latency histogram buckets"""
+
+
+@dataclass
+class Histogram:
+    """Dataclass to store the distribution of observed values in buckets
+
+    Attributes
+    ----------
+    buckets : tuple[float, ...]
+        The upper bounds of the buckets.
+    counts : list[int]
+        The number of values per bucket, the last bucket counts the values above all bounds.
+    total : float
+        The sum of all values.
+    """
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = self.counts or [0] * (len(self.buckets) + 1)
+
+    @property
+    def count(self) -> int:
+        """The number of values"""
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        """Adds a value to its bucket
+
+        Parameters
+        ----------
+        value : float
+            The observed value.
+        """
+        index = next((index for index, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.total += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Returns the number of values up to each bound, as Prometheus reports them
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            The bounds with their cumulative counts, ending with `+Inf`.
+        """
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        counts = [sum(self.counts[: index + 1]) for index in range(len(self.counts))]
+        return list(zip(bounds, counts))
+
+
+@dataclass
+class EndpointMetrics:
+    """Dataclass to store the metrics of an endpoint
+
+    Attributes
+    ----------
+    requests : int
+        The number of requests sent to the API.
+    cache_hits : int
+        The number of requests served from the response cache, including revalidated responses.
+    bytes : int
+        The number of body bytes received.
+    errors : dict[str, int]
+        The number of errors by class, e.g. `timeout`, `http_429` or `json`.
+    latency : Histogram
+        The durations in seconds of the requests sent to the API.
+    """
+
+    requests: int = 0
+    cache_hits: int = 0
+    bytes: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    latency: Histogram = field(default_factory=Histogram)
+
+
+def error_class(status_code: int) -> str:
+    """Returns the error class of an HTTP status code
+
+    Parameters
+    ----------
+    status_code : int
+        The status code of the response.
+
+    Returns
+    -------
+    str
+        `http_429` for rate limited requests, otherwise `http_4xx` or `http_5xx`.
+    """
+    if status_code == 429:
+        return "http_429"
+
+    return "http_5xx" if status_code >= 500 else "http_4xx"
+
+
+class RequestMetrics:
+    """Counts, latencies, transferred bytes, cache hits and errors of the HTTP requests per host and endpoint
+
+    URLs are grouped into endpoints (see `DEFAULT_ENDPOINTS`), so the metrics do not grow with every symbol, team
+    or location requested.
+    """
+
+    def __init__(self, endpoints: list[Endpoint] | None = None, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Parameters
+        ----------
+        endpoints : list[Endpoint] | None, optional
+            The endpoints with parameters in the path, the first match applies. _By default `DEFAULT_ENDPOINTS`_.
+        buckets : tuple[float, ...], optional
+            The upper bounds in seconds of the latency buckets. _By default `DEFAULT_BUCKETS`_.
+        """
+        self.endpoints = endpoints if endpoints is not None else DEFAULT_ENDPOINTS
+        self.buckets = buckets
+        self._metrics: dict[tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, url: str | None) -> tuple[str, str]:
+        """Returns the host and the endpoint of a URL
+
+        Parameters
+        ----------
+        url : str | None
+            The URL of the request.
+
+        Returns
+        -------
+        tuple[str, str]
+            The host and the endpoint, `unknown` for both if the URL is missing.
+        """
+        if not url:
+            return "unknown", "unknown"
+
+        parts = urlsplit(url)
+        without_scheme = url.split("://", 1)[-1]
+        templates = (endpoint.match(without_scheme) for endpoint in self.endpoints)
+        template = next((template for template in templates if template is not None), None)
+        if template is None:
+            template = "/".join("{id}" if re.fullmatch(r"[\d.:-]+", part) else part for part in parts.path.split("/"))
+
+        return parts.netloc.lower(), template or "/"
+
+    def _get(self, url: str | None) -> EndpointMetrics:
+        key = self.endpoint(url)
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            metrics = self._metrics[key] = EndpointMetrics(latency=Histogram(self.buckets))
+
+        return metrics
+
+    def record_request(self, url: str, seconds: float, size: int) -> None:
+        """Records a request sent to the API, whatever its status code
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        seconds : float
+            The duration of the request.
+        size : int
+            The number of body bytes received.
+        """
+        with self._lock:
+            metrics = self._get(url)
+            metrics.requests += 1
+            metrics.bytes += size
+            metrics.latency.observe(seconds)
+
+    def record_cache_hit(self, url: str) -> None:
+        """Records a request served from the response cache
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        """
+        with self._lock:
+            self._get(url).cache_hits += 1
+
+    def record_error(self, url: str | None, error: str) -> None:
+        """Records a failed request
+
+        Parameters
+        ----------
+        url : str | None
+            The URL of the request.
+        error : str
+            The class of the error, e.g. `timeout`, `connection`, `http_429`, `http_5xx`, `json`, `circuit_open`
+            or `quota`.
+        """
+        with self._lock:
+            errors = self._get(url).errors
+            errors[error] = errors.get(error, 0) + 1
+
+    def reset(self) -> None:
+        """Removes all metrics"""
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Returns the metrics as a JSON serializable dictionary
+
+        Returns
+        -------
+        dict[str, Any]
+            The metrics per endpoint and the totals per host, the host with the most time spent in requests
+            first.
+        """
+        with self._lock:
+            items = sorted(self._metrics.items())
+            endpoints: list[dict[str, Any]] = [
+                {
+                    "host": host,
+                    "endpoint": endpoint,
+                    "requests": metrics.requests,
+                    "cache_hits": metrics.cache_hits,
+                    "bytes": metrics.bytes,
+                    "errors": dict(metrics.errors),
+                    "latency_seconds": round(metrics.latency.total, 6),
+                    "latency_buckets": dict(metrics.latency.cumulative()),
+                }
+                for (host, endpoint), metrics in items
+            ]
+
+        hosts: dict[str, dict[str, Any]] = {}
+        for entry in endpoints:
+            host = hosts.setdefault(
+                entry["host"], {"requests": 0, "cache_hits": 0, "bytes": 0, "errors": 0, "latency_seconds": 0.0}
+            )
+            for key in ("requests", "cache_hits", "bytes", "latency_seconds"):
+                host[key] += entry[key]
+            host["errors"] += sum(entry["errors"].values())
+
+        return {
+            "hosts": dict(sorted(hosts.items(), key=lambda item: -item[1]["latency_seconds"])),
+            "endpoints": endpoints,
+        }
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text format
+
+        Returns
+        -------
+        str
+            The counters and the latency histogram labelled with `host` and `endpoint`.
+        """
+        counters: dict[str, list[str]] = {"requests": [], "cache_hits": [], "bytes": [], "errors": []}
+        histogram: list[str] = []
+        with self._lock:
+            for (host, endpoint), metrics in sorted(self._metrics.items()):
+                labels = f'host="{_escape(host)}",endpoint="{_escape(endpoint)}"'
+                counters["requests"].append(f"aswe_http_requests_total{{{labels}}} {metrics.requests}")
+                counters["cache_hits"].append(f"aswe_http_cache_hits_total{{{labels}}} {metrics.cache_hits}")
+                counters["bytes"].append(f"aswe_http_response_bytes_total{{{labels}}} {metrics.bytes}")
+                for error, count in sorted(metrics.errors.items()):
+                    counters["errors"].append(f'aswe_http_errors_total{{{labels},error="{_escape(error)}"}} {count}')
+                for bound, count in metrics.latency.cumulative():
+                    histogram.append(f'aswe_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                histogram.append(f"aswe_http_request_duration_seconds_sum{{{labels}}} {metrics.latency.total}")
+                histogram.append(f"aswe_http_request_duration_seconds_count{{{labels}}} {metrics.latency.count}")
+
+        lines = [
+            "# HELP aswe_http_requests_total HTTP requests sent to the API.",
+            "# TYPE aswe_http_requests_total counter",
+            *counters["requests"],
+            "# HELP aswe_http_cache_hits_total HTTP requests served from the response cache.",
+            "# TYPE aswe_http_cache_hits_total counter",
+            *counters["cache_hits"],
+            "# HELP aswe_http_response_bytes_total Body bytes received from the API.",
+            "# TYPE aswe_http_response_bytes_total counter",
+            *counters["bytes"],
+            "# HELP aswe_http_errors_total Failed HTTP requests by error class.",
+            "# TYPE aswe_http_errors_total counter",
+            *counters["errors"],
+            "# HELP aswe_http_request_duration_seconds Duration of the HTTP requests sent to the API.",
+            "# TYPE aswe_http_request_duration_seconds histogram",
+            *histogram,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escapes a Prometheus label value"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_METRICS = RequestMetrics()
+
+
+def request_metrics() -> RequestMetrics:
+    """Returns the metrics recorded by `http_request`"""
+    return _METRICS
+
+
+def serve_metrics(
+    port: int = 9464, host: str = "127.0.0.1", metrics: RequestMetrics | None = None
+) -> ThreadingHTTPServer:
+    """Serves the metrics on a local port in a background thread
+
+    `/metrics` returns the Prometheus text format, `/metrics.json` the snapshot as JSON. Stop the server with
+    `server.shutdown()`.
+
+    Parameters
+    ----------
+    port : int, optional
+        The port, `0` picks a free one. _By default `9464`_.
+    host : str, optional
+        The address the server listens on. _By default `127.0.0.1`_.
+    metrics : RequestMetrics | None, optional
+        The metrics which are served. _By default the metrics recorded by `http_request`_.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The running server.
+    """
+    served = metrics if metrics is not None else _METRICS
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Handler of the metrics endpoints"""
+
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            if self.path == "/metrics":
+                body, content_type = served.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(served.snapshot()), "application/json"
+            else:
+                self.send_error(404)
+                return
+
+            content = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+            logger.debug(f"Metrics server: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"Serving HTTP metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
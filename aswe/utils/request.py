@@ -1,15 +1,325 @@
-from typing import Any
+import asyncio
+import copy
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass, replace
+from functools import partial, wraps
+from typing import Any, Callable, Coroutine, Iterator, ParamSpec, TypeVar
+from urllib.parse import urlsplit
 
 import requests
 from loguru import logger
 from requests import HTTPError, Response
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
+from urllib3.util.retry import Retry
 
+from aswe.core.state import StateStore
+from aswe.utils.breaker import BreakerState, CircuitBreaker
+from aswe.utils.cache import (
+    CachePolicy,
+    CacheStats,
+    ResponseCache,
+    ResponseStore,
+    SingleFlight,
+)
+from aswe.utils.cassette import current_cassette, normalize_url
+from aswe.utils.decoder import decode_json
 from aswe.utils.error import TooManyRequests
+from aswe.utils.limiter import RateLimit, RateLimiter, is_background
+from aswe.utils.metrics import error_class, request_metrics
 
+P = ParamSpec("P")
+R = TypeVar("R")
 
-def http_request(url: str, headers: dict[Any, Any] | None = None, timeout: int = 10) -> Response | None:
+
+@dataclass(frozen=True)
+class SessionConfig:
+    """Dataclass to store the configuration of the pooled HTTP sessions
+
+    Attributes
+    ----------
+    pool_maxsize : int
+        The number of connections kept open per host.
+    keep_alive : bool
+        If connections are reused between requests. Otherwise every response closes its connection.
+    retries : int
+        The number of retries of the HTTP adapter for connection errors and `502`, `503` and `504` responses.
+        `429` and `403` are never retried, because they signal an exhausted API limit. Read timeouts are not
+        retried either, a slow host would only make the user wait for the timeout again.
+    backoff_factor : float
+        The factor of the exponential backoff between retries in seconds.
+    backoff_jitter : float
+        The maximum random seconds added to every backoff, so concurrent retries do not hit the host at once.
+    backoff_max : float
+        The maximum backoff between two retries in seconds.
+    """
+
+    pool_maxsize: int = 8
+    keep_alive: bool = True
+    retries: int = 2
+    backoff_factor: float = 0.3
+    backoff_jitter: float = 0.3
+    backoff_max: float = 2.0
+
+
+class JitteredRetry(Retry):
+    """`Retry` whose backoff is capped and randomized
+
+    urllib3 only accepts `backoff_jitter` and `backoff_max` from version 2 on, this subclass provides both on the
+    locked urllib3 1.26 as well.
+    """
+
+    def __init__(self, *args: Any, jitter: float = 0.0, max_backoff: float = 120.0, **kwargs: Any) -> None:
+        """
+        Parameters
+        ----------
+        *args : Any
+            The positional arguments of `Retry`.
+        jitter : float, optional
+            The maximum random seconds added to every backoff. _By default `0.0`_.
+        max_backoff : float, optional
+            The maximum backoff between two retries in seconds. _By default `120.0`_.
+        **kwargs : Any
+            The keyword arguments of `Retry`.
+        """
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+
+    def new(self, **kw: Any) -> "JitteredRetry":
+        retry = super().new(**kw)
+        retry.jitter = self.jitter
+        retry.max_backoff = self.max_backoff
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+
+        return min(self.max_backoff, backoff + random.uniform(0, self.jitter))
+
+
+class SessionPool:
+    """Pool of `requests.Session` objects with one session per host
+
+    Every API module calls `http_request` with a full URL, therefore the session is picked by the host of the
+    URL. Reusing the session keeps the TCP and TLS connection alive, so only the first request to a host
+    pays for the handshakes.
+    """
+
+    def __init__(self, config: SessionConfig | None = None) -> None:
+        """
+        Parameters
+        ----------
+        config : SessionConfig | None, optional
+            The configuration of the sessions. _By default `SessionConfig()`_.
+        """
+        self.config = config if config is not None else SessionConfig()
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Creates a session with a pooled and retrying HTTP adapter"""
+        retry = JitteredRetry(
+            total=self.config.retries,
+            read=0,
+            backoff_factor=self.config.backoff_factor,
+            jitter=self.config.backoff_jitter,
+            max_backoff=self.config.backoff_max,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=["GET"],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.config.pool_maxsize, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def get(self, url: str) -> requests.Session:
+        """Returns the session of the host of a URL and creates it on first use
+
+        Parameters
+        ----------
+        url : str
+            The URL which should be requested.
+
+        Returns
+        -------
+        requests.Session
+            The session of the host.
+        """
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._create_session()
+
+            return self._sessions[host]
+
+    @property
+    def hosts(self) -> list[str]:
+        """The hosts which have an open session"""
+        return list(self._sessions)
+
+    def close(self) -> None:
+        """Closes all sessions and their connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_SESSIONS = SessionPool()
+_CACHE = ResponseCache()
+_FLIGHTS: SingleFlight[Response | None] = SingleFlight()
+_STREAMS: SingleFlight[tuple[Response, threading.Event] | None] = SingleFlight()
+_LIMITER = RateLimiter()
+_BREAKER = CircuitBreaker()
+_ASYNC_EXECUTOR = ThreadPoolExecutor(max_workers=SessionConfig.pool_maxsize, thread_name_prefix="http")
+
+
+def configure_sessions(config: SessionConfig) -> None:
+    """Replaces the configuration of the pooled sessions used by `http_request`
+
+    Open sessions are closed, new ones are created with the given configuration.
+
+    Parameters
+    ----------
+    config : SessionConfig
+        The new configuration.
+    """
+    _SESSIONS.close()
+    _SESSIONS.config = config
+
+
+def configure_rate_limits(limits: list[RateLimit] | None = None, state: StateStore | None = None) -> None:
+    """Replaces the rate limiter used by `http_request`
+
+    ```python
+    configure_rate_limits(state=StateStore("data/state.sqlite"))
+    ```
+
+    Parameters
+    ----------
+    limits : list[RateLimit] | None, optional
+        The limits per host, an empty list disables rate limiting. _By default `aswe.utils.limiter.DEFAULT_LIMITS`_.
+    state : StateStore | None, optional
+        The store the daily quota usage is persisted to across restarts. _By default it is kept in memory_.
+    """
+    global _LIMITER  # pylint: disable=global-statement
+    _LIMITER = RateLimiter(limits, state)
+
+
+def configure_breaker(failure_threshold: int = 3, recovery_timeout: float = 60.0) -> None:
+    """Replaces the circuit breaker used by `http_request`
+
+    Parameters
+    ----------
+    failure_threshold : int, optional
+        The number of consecutive failures opening the circuit of a host. _By default `3`_.
+    recovery_timeout : float, optional
+        The seconds an open circuit waits before probing the host again. _By default `60.0`_.
+    """
+    global _BREAKER  # pylint: disable=global-statement
+    _BREAKER = CircuitBreaker(failure_threshold, recovery_timeout)
+
+
+def host_available(url_or_host: str) -> bool:
+    """Checks if the circuit of a host is not open, e.g. to skip proactive polls of unavailable APIs
+
+    Parameters
+    ----------
+    url_or_host : str
+        The URL of a request or the host.
+
+    Returns
+    -------
+    bool
+        Boolean if requests to the host are sent.
+    """
+    return _BREAKER.is_available(url_or_host)
+
+
+def breaker_states() -> dict[str, BreakerState]:
+    """Returns the circuit states of all hosts which failed since their last success
+
+    Returns
+    -------
+    dict[str, BreakerState]
+        The states by host.
+    """
+    return _BREAKER.states()
+
+
+def configure_cache(
+    policies: list[CachePolicy] | None = None, max_entries: int = 256, store: ResponseStore | None = None
+) -> None:
+    """Replaces the response cache used by `http_request`
+
+    ```python
+    configure_cache(store=ResponseStore("data/http_cache.sqlite"))
+    ```
+
+    Parameters
+    ----------
+    policies : list[CachePolicy] | None, optional
+        The policies, an empty list disables caching. _By default `aswe.utils.cache.DEFAULT_POLICIES`_.
+    max_entries : int, optional
+        The maximum number of responses cached in memory. _By default `256`_.
+    store : ResponseStore | None, optional
+        The store responses are persisted to across restarts. _By default responses are only cached in memory_.
+    """
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE.store is not None and _CACHE.store is not store:
+        _CACHE.store.close()
+    _CACHE = ResponseCache(policies, max_entries, store=store)
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    """Returns the statistics of the response cache used by `http_request`
+
+    Returns
+    -------
+    dict[str, CacheStats]
+        The statistics by policy name and the statistics of all policies as `total`. The number of requests
+        which shared the network call of an identical request in flight is reported as `total.coalesced`.
+    """
+    return {**_CACHE.policy_stats, "total": replace(_CACHE.stats, coalesced=_FLIGHTS.saved + _STREAMS.saved)}
+
+
+def http_request(
+    url: str, headers: dict[Any, Any] | None = None, timeout: int = 10, stream: bool = False
+) -> Response | None:
     """Send a HTTP request to the given URL and return the response.
 
+    Successful responses are cached with the TTL of the provider, see `ResponseCache`. Otherwise the request is
+    sent with the pooled session of the host, see `SessionPool`. A stale persisted response is revalidated with
+    a conditional request and reused if the server answers `304 Not Modified`. Concurrent identical requests
+    share one network call, see `SingleFlight`.
+
+    Requests to APIs with limits wait for the token bucket of the host and count against its daily quota, see
+    `RateLimiter`. Background requests (see `background_requests`) return `None` once only the quota reserved
+    for the user is left. Requests to a host which failed repeatedly return `None` immediately until the host
+    recovers, see `CircuitBreaker`. Latencies, transferred bytes, cache hits and errors are recorded per host and
+    endpoint, see `RequestMetrics`.
+
+    While a cassette is configured (see `use_cassette`), the responses are recorded to it respectively replayed
+    from it without touching the network, the cache or the limits.
+
+    Large feeds can be streamed and parsed item by item with `iter_json_items`. A streamed body is read while it
+    is parsed, so identical requests in flight wait until it was read completely and share it then. They send
+    their own request if the first caller stopped reading early. A completely read body is also cached, a cached
+    response is served as usual.
+
     Parameters
     ----------
     url : str
@@ -18,31 +328,242 @@ def http_request(url: str, headers: dict[Any, Any] | None = None, timeout: int =
         The headers to send with the request. _By default `None`._
     timeout : int, optional
         The time in seconds to wait for a response. _By default `10`.
+    stream : bool, optional
+        Boolean if the body should be downloaded while it is read instead of at once. _By default `False`_.
 
     Returns
     -------
     Response | None
         The response from the API or None if the request failed.
     """
+    cassette = current_cassette()
+    if cassette is not None:
+        host, endpoint = request_metrics().endpoint(url)
+        return cassette.call(
+            f"{host}{endpoint}", normalize_url(url), lambda: _recordable(_send(url, headers, timeout, stream))
+        )
+
+    return _send(url, headers, timeout, stream)
+
+
+def _recordable(response: Response | None) -> Response | None:
+    """Returns a copy of a response without the request, cookies and secret query parameters, to be recorded"""
+    if response is None:
+        return None
+
+    recordable = copy.copy(response)
+    recordable.url = normalize_url(response.url)
+    recordable.request = None  # type: ignore[assignment]
+    recordable.cookies = RequestsCookieJar()
+    recordable.history = []
+    return recordable
+
+
+def _send(url: str, headers: dict[Any, Any] | None, timeout: int, stream: bool) -> Response | None:
+    """Serves the request of `http_request` from the cache or sends it"""
+    cached = _CACHE.get(url, headers)
+    if cached is not None:
+        logger.debug(f"Served {url} from the response cache")
+        request_metrics().record_cache_hit(url)
+        return cached
+
+    if stream:
+        return _send_stream(url, headers, timeout)
+
+    # Background requests are dropped near the quota, so user requests never wait for and share their flight
+    response, shared = _FLIGHTS.do(
+        (ResponseCache.key(url, headers), is_background()), partial(_fetch, url, headers, timeout)
+    )
+    if shared and response is not None:
+        logger.debug(f"Shared the response of an identical request to {url} in flight")
+        return copy.copy(response)
+
+    return response
+
+
+def _send_stream(url: str, headers: dict[Any, Any] | None, timeout: int) -> Response | None:
+    """Sends the streamed request of `http_request` or shares the body of an identical one in flight"""
+    flight, shared = _STREAMS.do(
+        (ResponseCache.key(url, headers), is_background()), partial(_fetch_stream, url, headers, timeout)
+    )
+    if flight is None or not shared:
+        return flight[0] if flight is not None else None
+
+    response, read = flight
+    if read.wait(timeout) and isinstance(response._content, bytes):  # pylint: disable=protected-access
+        logger.debug(f"Shared the streamed body of an identical request to {url} in flight")
+        return copy.copy(response)
+
+    # The first caller stopped reading early, so the body has to be downloaded again
+    flight = _fetch_stream(url, headers, timeout)
+    return flight[0] if flight is not None else None
+
+
+def _fetch_stream(url: str, headers: dict[Any, Any] | None, timeout: int) -> tuple[Response, threading.Event] | None:
+    """Sends the streamed request of `http_request` and tracks when its body was read"""
+    response = _fetch(url, headers, timeout, stream=True)
+    if response is None:
+        return None
+
+    return response, _track_read(url, headers, response)
+
+
+def _track_read(url: str, headers: dict[Any, Any] | None, response: Response) -> threading.Event:
+    """Caches a streamed response as soon as its body was read completely
+
+    Returns
+    -------
+    threading.Event
+        The event which is set once the caller finished or stopped reading the body.
+    """
+    read = threading.Event()
+    iter_content = response.iter_content
+
+    def read_and_cache(chunk_size: int | None = 1, decode_unicode: bool = False) -> Iterator[Any]:
+        try:
+            if decode_unicode:
+                yield from iter_content(chunk_size, decode_unicode=True)
+                return
+
+            chunks = []
+            for chunk in iter_content(chunk_size):
+                chunks.append(chunk)
+                yield chunk
+
+            del response.iter_content
+            response._content = b"".join(chunks)  # pylint: disable=protected-access
+            if _CACHE.policy(url) is not None:
+                _CACHE.put(url, headers, response)
+                logger.debug(f"Cached the completely read stream of {url}")
+        finally:
+            read.set()
+
+    response.iter_content = read_and_cache  # type: ignore[method-assign]
+    return read
+
+
+def _fetch(url: str, headers: dict[Any, Any] | None, timeout: int, stream: bool = False) -> Response | None:
+    """Sends the request of `http_request` and caches the response unless it is streamed"""
+    metrics = request_metrics()
+    if not _BREAKER.allow(url):
+        logger.warning(f"Failing fast, {urlsplit(url).netloc} is unavailable")
+        metrics.record_error(url, "circuit_open")
+        return None
+
+    if not _LIMITER.acquire(url):
+        metrics.record_error(url, "quota")
+        if is_background():
+            logger.warning(f"Dropped background request to {url} to save the daily quota")
+            return None
+        logger.error(f"The daily quota of {url} is exhausted")
+        raise TooManyRequests
+
+    validators = _CACHE.validators(url, headers)
+    start = time.perf_counter()
     try:
-        response = requests.get(url, timeout=timeout, headers=headers)
+        response = _SESSIONS.get(url).get(
+            url, timeout=timeout, headers={**(headers or {}), **validators} if validators else headers, stream=stream
+        )
+        size = int(response.headers.get("Content-Length", 0)) if stream else len(response.content or b"")
+        metrics.record_request(url, time.perf_counter() - start, size)
+        if response.status_code == 304 and validators:
+            revalidated = _CACHE.revalidate(url, headers)
+            _BREAKER.record_success(url)
+            if revalidated is not None:
+                logger.debug(f"Revalidated {url} in the response cache")
+                metrics.record_cache_hit(url)
+                return revalidated
 
         response.raise_for_status()
         if not response.status_code == 200:
             raise Exception("HTTP status code is not 200")
     except HTTPError as http_err:
         logger.error(f"HTTP error occurred: {http_err}")
-        if http_err.response.status_code == 429 or http_err.response.status_code == 403:
+        status_code = http_err.response.status_code if http_err.response is not None else 500
+        metrics.record_error(url, error_class(status_code))
+        if status_code >= 500:
+            _BREAKER.record_failure(url)
+        else:
+            _BREAKER.record_success(url)
+        if status_code == 429 or status_code == 403:
+            _LIMITER.exhaust(url)
             raise TooManyRequests from http_err
         return None
+    except (requests.ConnectionError, requests.Timeout) as err:
+        logger.error(f"Connection error occurred: {err}")
+        metrics.record_request(url, time.perf_counter() - start, 0)
+        metrics.record_error(url, "timeout" if isinstance(err, requests.Timeout) else "connection")
+        _BREAKER.record_failure(url)
+        return None
     except Exception as err:
         logger.error(f"Other error occurred: {err}")
+        metrics.record_error(url, "other")
         return None
 
     logger.success(f"Successfully fetched data from {url} with status code {response.status_code}")
+    _BREAKER.record_success(url)
+    if not stream:
+        _CACHE.put(url, headers, response)
     return response
 
 
+async def http_request_async(url: str, headers: dict[Any, Any] | None = None, timeout: int = 10) -> Response | None:
+    """Async variant of `http_request`
+
+    The request runs on the HTTP worker threads with the same pooled sessions, response cache and request
+    coalescing, so many requests can be awaited concurrently:
+
+    ```python
+    responses = await asyncio.gather(*(http_request_async(url) for url in urls))
+    ```
+
+    Parameters
+    ----------
+    url : str
+        The URL of the API.
+    headers : dict[Any, Any] | None, optional
+        The headers to send with the request. _By default `None`._
+    timeout : int, optional
+        The time in seconds to wait for a response. _By default `10`.
+
+    Returns
+    -------
+    Response | None
+        The response from the API or None if the request failed.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _ASYNC_EXECUTOR, partial(copy_context().run, http_request, url, headers, timeout)
+    )
+
+
+def asynchronous(function: Callable[P, R]) -> Callable[P, Coroutine[Any, Any, R]]:
+    """Returns the async variant of a blocking API function
+
+    The function runs on the HTTP worker threads like `http_request_async`, in a copy of the current context
+    so the request priority is kept. The API modules use it to provide
+    `*_async` counterparts of their functions, e.g. `get_stock_price_async = asynchronous(get_stock_price)`.
+
+    Parameters
+    ----------
+    function : Callable[P, R]
+        The blocking function.
+
+    Returns
+    -------
+    Callable[P, Coroutine[Any, Any, R]]
+        The coroutine function with the same parameters.
+    """
+
+    @wraps(function)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await asyncio.get_running_loop().run_in_executor(
+            _ASYNC_EXECUTOR, partial(copy_context().run, function, *args, **kwargs)
+        )
+
+    wrapper.__name__ = wrapper.__qualname__ = f"{function.__name__}_async"
+    return wrapper
+
+
 def validate_api(response: Response) -> bool:
     """Test if the API limit is reached
 
@@ -57,7 +578,7 @@ def validate_api(response: Response) -> bool:
         Return True if the API limit is reached
     """
     try:
-        if "You have reached the request limit for the day" in response.json()["errors"]["requests"]:
+        if "You have reached the request limit for the day" in decode_json(response)["errors"]["requests"]:
             return True
     except KeyError:
         return False
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from difflib import SequenceMatcher
 
 
@@ -25,3 +26,88 @@ def calculate_similarity(parsed_text: str, options: list[str] | str) -> float:
         return 0.0
 
     return max(SequenceMatcher(None, parsed_text, option).quick_ratio() for option in options)
+
+
+def extract_terms(text: str, ngram_size: int = 3) -> set[str]:
+    """Extracts the lower case tokens and character n-grams of a text.
+
+    Tokens are prefixed with `w:` and n-grams with `c:`, so a short token can not collide with an n-gram.
+    The n-grams are taken from the text padded with a space on both sides to also capture word boundaries.
+
+    Parameters
+    ----------
+    text : str
+        The text the terms should be extracted from.
+    ngram_size : int, optional
+        The length of the character n-grams. _By default `3`._
+
+    Returns
+    -------
+    set[str]
+        All distinct terms of the text.
+    """
+    text = text.lower()
+    padded_text = f" {' '.join(text.split())} "
+
+    terms = {f"w:{token}" for token in text.split()}
+    terms.update(f"c:{padded_text[i:i + ngram_size]}" for i in range(len(padded_text) - ngram_size + 1))
+
+    return terms
+
+
+class InvertedIndex:
+    """Inverted index mapping tokens and character n-grams to the phrases containing them
+
+    The index is used to prune the phrases which have to be scored for a parsed text. Only phrases sharing
+    at least one token or n-gram with the parsed text are returned as candidates.
+    """
+
+    def __init__(self, phrases: list[str], ngram_size: int = 3, full_scan_fallback: bool = True) -> None:
+        """
+        Parameters
+        ----------
+        phrases : list[str]
+            The phrases which should be indexed. Their position is used as id.
+        ngram_size : int, optional
+            The length of the character n-grams. _By default `3`._
+        full_scan_fallback : bool, optional
+            If all phrases should be returned when no phrase shares a term with the parsed text.
+            _By default `True`._
+
+        Attributes
+        ----------
+        postings : dict[str, list[int]]
+            Mapping of every term to the sorted ids of the phrases containing it.
+        """
+        self.size = len(phrases)
+        self.ngram_size = ngram_size
+        self.full_scan_fallback = full_scan_fallback
+
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for phrase_id, phrase in enumerate(phrases):
+            for term in extract_terms(phrase, ngram_size):
+                postings[term].append(phrase_id)
+        self.postings: dict[str, list[int]] = dict(postings)
+
+    def candidates(self, parsed_text: str) -> list[int]:
+        """Returns the ids of all phrases sharing material with the parsed text
+
+        Parameters
+        ----------
+        parsed_text : str
+            The parsed text from the user input.
+
+        Returns
+        -------
+        list[int]
+            The sorted ids of the candidate phrases. If no phrase shares a term with the parsed text, either
+            all ids or an empty list are returned, depending on `full_scan_fallback`.
+        """
+        candidate_ids: set[int] = set()
+        for term in extract_terms(parsed_text, self.ngram_size):
+            candidate_ids.update(self.postings.get(term, ()))
+
+        if len(candidate_ids) == 0 and self.full_scan_fallback:
+            return list(range(self.size))
+
+        return sorted(candidate_ids)
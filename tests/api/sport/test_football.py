@@ -3,6 +3,7 @@
 # pylint: disable=redefined-outer-name,protected-access
 
 import json
+from datetime import datetime, timezone
 
 import pytest
 from pytest_mock import MockFixture
@@ -14,6 +15,7 @@ from aswe.api.sport.football import (
     get_league_standings,
     get_matchday_matches,
     get_matches_today,
+    get_next_team_kickoff,
     get_ongoing_matches,
     get_teams,
     get_upcoming_team_matches,
@@ -469,6 +471,38 @@ def test_get_upcoming_team_matches_invalid_response(mocker: MockFixture, import_
     assert get_upcoming_team_matches("World Cup", "Netherlands") is None
 
 
+def test_get_next_team_kickoff(mocker: MockFixture, import_paths: dict[str, str]) -> None:
+    """Test `aswe.api.sport.football.get_next_team_kickoff`
+
+    Parameters
+    ----------
+    mocker : MockFixture
+        General MockFixture Class
+    import_paths : dict[str, str]
+        Fixture used for test setup
+    """
+
+    mocker.patch(import_paths["get_teams"], return_value=["Netherlands", 1, "United States", 0, "Germany", 7])
+    mock_valid_response_object = {
+        "matches": [
+            {"utcDate": "2022-12-09T19:00:00Z", "status": "SCHEDULED"},
+            {"utcDate": "2022-12-03T15:00:00Z", "status": "SCHEDULED"},
+        ]
+    }
+    valid_response = Response()
+    valid_response._content = json.dumps(mock_valid_response_object).encode()
+    mocker.patch(import_paths["http_request"], return_value=valid_response)
+
+    assert get_next_team_kickoff("World Cup", "Netherlands") == datetime(
+        2022, 12, 3, 15, tzinfo=timezone.utc
+    ).astimezone().replace(tzinfo=None)
+
+    # * Mock None response and unknown team
+    mocker.patch(import_paths["http_request"], return_value=None)
+    assert get_next_team_kickoff("World Cup", "Netherlands") is None
+    assert get_next_team_kickoff("World Cup", "Brazil") is None
+
+
 def test_get_teams(mocker: MockFixture, import_paths: dict[str, str]) -> None:
     """Test `aswe.api.sport.foodball.get_teams`
 
@@ -1,5 +1,8 @@
 # pylint: disable=no-value-for-parameter
+from pathlib import Path
+
 import pytest
+from pytest_mock import MockFixture
 
 from aswe.api.calendar import (
     Event,
@@ -8,6 +11,7 @@ from aswe.api.calendar import (
     get_events_by_timeframe,
     get_next_event_today,
 )
+from aswe.utils.cassette import CassetteMode, use_cassette
 
 
 def test_event_required_fields() -> None:
@@ -80,3 +84,20 @@ def test_create_event() -> None:
             end_time="2022-11-20T17:30:00+01:00",
         )
     )
+
+
+def test_replay_events_by_timeframe(mocker: MockFixture, tmp_path: Path) -> None:
+    """Test that recorded calendar events are replayed without credentials"""
+    raw_events = [[{"summary": "Lecture", "start": {"dateTime": "2022-10-19T08:00:00+01:00"}, "end": {}}]]
+    mocker.patch("aswe.api.calendar._list_calendar_events", return_value=raw_events)
+    with use_cassette(tmp_path / "calendar.sqlite", CassetteMode.RECORD):
+        recorded_events = get_events_by_timeframe("2022-10-19T00:00:00.000001Z", "2022-10-19T23:59:59.999999Z")
+    get_events_by_timeframe.cache_clear()
+
+    mocker.stopall()
+    with use_cassette(tmp_path / "calendar.sqlite"):
+        replayed_events = get_events_by_timeframe("2022-10-20T00:00:00.000001Z", "2022-10-20T23:59:59.999999Z")
+    get_events_by_timeframe.cache_clear()
+
+    assert [event.title for event in replayed_events] == ["Lecture"]
+    assert replayed_events == recorded_events
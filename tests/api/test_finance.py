@@ -237,9 +237,12 @@ def test_get_news_info_by_symbol(mocker: MockFixture, http_request_path: str) ->
 
     valid_response = Response()
     valid_response._content = json.dumps(mock_valid_response_object).encode()
-    mocker.patch(http_request_path, return_value=valid_response)
+    request = mocker.patch(http_request_path, return_value=valid_response)
 
     apple_news = get_news_info_by_symbol("MSFT")
+    assert get_news_info_by_symbol("MSFT") is apple_news
+    request.assert_called_once()
+    get_news_info_by_symbol.cache_clear()
 
     assert isinstance(apple_news, list)
     assert len(apple_news) > 0 and len(apple_news) <= 3
@@ -1,7 +1,9 @@
 # pylint: disable=no-value-for-parameter
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import pytest
+from pytest_mock import MockFixture
 
 from aswe.api.navigation import (
     Connection,
@@ -12,6 +14,7 @@ from aswe.api.navigation import (
     get_maps_connection,
     get_next_connection,
 )
+from aswe.utils.cassette import CassetteMode, use_cassette
 
 
 def test_get_latest_connection() -> None:
@@ -106,3 +109,19 @@ def test_trip_variable_types() -> None:
     assert isinstance(trip.duration, int)
     assert isinstance(trip.connections, list)
     assert isinstance(trip.connections[0], Connection)
+
+
+def test_replay_maps_connection(mocker: MockFixture, tmp_path: Path) -> None:
+    """Test that recorded Google Maps directions are replayed without an API key"""
+    directions = [{"legs": [{"distance": {"value": 4200}, "duration": {"value": 600}}]}]
+    mocker.patch("aswe.api.navigation._get_directions", return_value=directions)
+    with use_cassette(tmp_path / "maps.sqlite", CassetteMode.RECORD):
+        get_maps_connection("Ernsthaldenstraße 43", "Rotebühlplatz 41", MapsTripMode.DRIVING)
+    get_maps_connection.cache_clear()
+
+    mocker.stopall()
+    with use_cassette(tmp_path / "maps.sqlite"):
+        maps_trip = get_maps_connection("Ernsthaldenstraße 43", "Rotebühlplatz 41", MapsTripMode.DRIVING)
+    get_maps_connection.cache_clear()
+
+    assert maps_trip == MapsTrip(duration=10, distance=4200)
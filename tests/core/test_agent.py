@@ -11,8 +11,8 @@ from aswe.core.user_interaction import SpeechToText, TextToSpeech
 
 @pytest.fixture
 def agent() -> Agent:
-    """Patch `convert_text` method of `TextToSpeech` Class"""
-    return Agent()
+    """Agent which keeps its state and HTTP cache in memory, so no stores are written to `data/`"""
+    return Agent(state_path=":memory:", http_cache_path=None)
 
 
 def test_init(agent: Agent) -> None:
@@ -23,7 +23,7 @@ def test_init(agent: Agent) -> None:
 
     with open(Path("data/quotes.json"), encoding="utf-8") as file:
         combinations = [len(phrase) for _, value in json.load(file).items() for _, phrase in value.items()]
-    assert len(agent.quotes["phrase"]) == sum(combinations)
+    assert len(agent.intents.phrases) == sum(combinations)
 
     assert isinstance(agent.user, User)
     assert isinstance(agent.stt, SpeechToText)
@@ -46,3 +46,70 @@ def test_check_proactivity(agent: Agent) -> None:
     """Test agent check_proactivity"""
 
     agent._check_proactivity()
+
+    assert "morningBriefing.wakeup" in agent.scheduler
+    assert "general" not in agent.scheduler
+    assert not agent.registry.is_loaded("morningBriefing")
+
+
+def test_headless_main(tmp_path: Path) -> None:
+    """Test agent main loop in headless mode"""
+    utterances = tmp_path / "utterances.txt"
+    utterances.write_text("marry me\n\nqqqq\n", encoding="utf-8")
+    sink = tmp_path / "sink.txt"
+
+    headless_agent = Agent(
+        headless=True, utterances=str(utterances), tts_sink=str(sink), state_path=":memory:", http_cache_path=None
+    )
+    headless_agent.main()
+    assert headless_agent.tts.sink is not None
+    headless_agent.tts.sink.flush()
+
+    assert len(headless_agent.turn_durations) == 2
+    answers = sink.read_text(encoding="utf-8")
+    assert "I am sorry, I am already married to my job." in answers
+    assert "Sorry, I didn't find a match for your request." in answers
+
+
+def test_headless_tied_match(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a tied match is resolved without prompting in headless mode"""
+    utterances = tmp_path / "utterances.txt"
+    utterances.write_text("how are you\nmarry me\nmarry me\n", encoding="utf-8")
+    sink = tmp_path / "sink.txt"
+
+    def no_prompt(prompt: str = "") -> str:
+        raise AssertionError(f"Prompted for {prompt!r} in headless mode")
+
+    monkeypatch.setattr("builtins.input", no_prompt)
+    headless_agent = Agent(
+        headless=True, utterances=str(utterances), tts_sink=str(sink), state_path=":memory:", http_cache_path=None
+    )
+    assert len(headless_agent.intents.match("how are you")) > 1
+
+    headless_agent.main()
+    assert headless_agent.tts.sink is not None
+    headless_agent.tts.sink.flush()
+
+    assert len(headless_agent.turn_durations) == 3
+    answers = sink.read_text(encoding="utf-8")
+    assert "Please choose one" not in answers
+    assert answers.count("I am sorry, I am already married to my job.") == 2
+
+
+def test_classify_batch(tmp_path: Path) -> None:
+    """Test agent classify_batch"""
+    utterances = tmp_path / "utterances.txt"
+    utterances.write_text("marry me\nqqqq\nwhat is the weather\n", encoding="utf-8")
+
+    headless_agent = Agent(
+        headless=True,
+        utterances=str(utterances),
+        tts_sink=str(tmp_path / "sink.txt"),
+        state_path=":memory:",
+        http_cache_path=None,
+    )
+    best_matches = headless_agent.classify_batch(["marry me", "qqqq", "what is the weather"])
+    assert best_matches[1] is None
+    assert best_matches[2] is not None and best_matches[2].function_key == "weather"
+
+    assert headless_agent.classify_batch(str(utterances)) == best_matches
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+
+import pytest
+from requests import Response
+
+from aswe.core.benchmark import benchmark_decoders, benchmark_file, load_payloads
+from aswe.utils.cache import ResponseStore
+from aswe.utils.decoder import STDLIB_DECODER, JsonDecoder
+
+
+def test_load_payloads(tmp_path: Path) -> None:
+    """Test that recorded payloads are grouped by provider from sessions and response stores"""
+    session_payloads = load_payloads("data/replay/sample_session.json")
+    assert set(session_payloads) == {"ergast.com", "api.football-data.org"}
+
+    store = ResponseStore(tmp_path / "cache.sqlite", compress_min_size=10)
+    for index, url in enumerate(["https://newsapi.org/v2/everything?q=a", "https://newsapi.org/v2/everything?q=b"]):
+        response = Response()
+        response.url = url
+        response.status_code = 200
+        response._content = json.dumps({"articles": [index] * 20}).encode()  # pylint: disable=protected-access
+        store.put(url, response, None)
+    store.close()
+
+    store_payloads = load_payloads(tmp_path / "cache.sqlite")
+    assert list(store_payloads) == ["newsapi.org"]
+    assert [json.loads(body)["articles"][0] for body in store_payloads["newsapi.org"]] == [0, 1]
+
+    with pytest.raises(FileNotFoundError):
+        load_payloads(tmp_path / "missing.sqlite")
+
+
+def test_benchmark_decoders() -> None:
+    """Test that the report contains the timings and the saving per provider"""
+    slow = JsonDecoder("slow", lambda content: [json.loads(content) for _ in range(20)][0])
+    report = benchmark_decoders({"ergast.com": [b'{"MRData": {}}']}, baseline=slow, candidate=STDLIB_DECODER)
+
+    assert report["baseline"] == "slow"
+    assert report["candidate"] == "json"
+    assert report["providers"]["ergast.com"]["payloads"] == 1
+    assert report["providers"]["ergast.com"]["saving_percent"] > 0
+
+
+def test_benchmark_file() -> None:
+    """Test that the report of a recorded session is valid JSON"""
+    report = json.loads(benchmark_file("data/replay/sample_session.json"))
+
+    assert set(report["providers"]) == {"ergast.com", "api.football-data.org"}
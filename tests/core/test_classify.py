@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from aswe.core.classify import classify_batch, classify_file
+from aswe.core.intent import CatalogueWatcher, IntentIndex
+
+
+@pytest.fixture(scope="module")
+def intents() -> IntentIndex:
+    """Index of the intent catalogue"""
+    return IntentIndex(CatalogueWatcher(Path("data/quotes.json")).poll() or {})
+
+
+def test_classify_batch(intents: IntentIndex) -> None:
+    """Test that utterances are classified without an agent, also sharded across processes"""
+    best_matches = classify_batch(intents, ["marry me", "qqqq", "what is the weather"])
+    assert best_matches[1] is None
+    assert best_matches[2] is not None and best_matches[2].function_key == "weather"
+
+    assert classify_batch(intents, ["marry me", "qqqq", "what is the weather"], processes=2) == best_matches
+
+    with pytest.raises(ValueError):
+        classify_batch(intents, ["marry me"], threshold=2)
+
+
+def test_classify_file(tmp_path: Path) -> None:
+    """Test that the utterances of a file are reported as JSON"""
+    utterances = tmp_path / "utterances.txt"
+    utterances.write_text("what is the weather\n\nqqqq\n", encoding="utf-8")
+
+    report = json.loads(classify_file(str(utterances)))
+
+    assert len(report) == 2
+    assert report[0]["function_key"] == "weather"
+    assert report[0]["parsed_text"] == "what is the weather"
+    assert report[1] is None
@@ -0,0 +1,163 @@
+import json
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+
+from aswe.core.intent import CatalogueWatcher, IntentCandidate, IntentIndex
+from aswe.utils.text import calculate_similarity
+
+
+@pytest.fixture
+def catalogue() -> dict[str, dict[str, list[str]]]:
+    """Small intent catalogue to build an index from"""
+    return {
+        "general": {"time": ["time", "what time is it"], "joke": ["tell me a joke"], "empty": []},
+        "navigation": {"dhbw": ["dhbw", "i need to get to the dhbw"], "hpe": ["hpe", "i need to get to hpe"]},
+    }
+
+
+def test_init(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that the index skips empty combinations and stores every phrase"""
+    index = IntentIndex(catalogue)
+
+    assert len(index) == 7
+    assert ("general", "empty") not in index.groups
+    assert index.counts.shape == (7, len(index.alphabet))
+    assert list(index.lengths) == [len(phrase) for phrase in index.phrases]
+
+
+def test_score_matches_calculate_similarity() -> None:
+    """Test that the vectorized score is identical to `calculate_similarity` for the shipped catalogue"""
+    index = IntentIndex.from_file(Path("data/quotes.json"), prune=False)
+
+    for parsed_text in ["marry me", "what is the weather", "football standings", "", "xyz"]:
+        scores = index.score(parsed_text)
+        for phrase, score in zip(index.phrases, scores):
+            assert score == pytest.approx(calculate_similarity(parsed_text, phrase))
+
+
+def test_match(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test `IntentIndex.match` for single, multiple and missing matches"""
+    index = IntentIndex(catalogue)
+
+    assert index.match("tell me a joke") == [IntentCandidate("general", "joke", "tell me a joke", 1.0)]
+    assert index.match("qqqq") == []
+
+    candidates = index.match("i need to get to the dhbw", threshold=0.0)
+    assert candidates[0].use_case == "navigation"
+    assert candidates[0].choice == "dhbw"
+    assert candidates[0].phrase == "i need to get to the dhbw"
+
+    assert IntentIndex({}).match("time") == []
+
+
+def test_match_agrees_with_catalogue() -> None:
+    """Test that every phrase of the shipped catalogue is matched to its own combination"""
+    with open(Path("data/quotes.json"), encoding="utf-8") as file:
+        quotes = json.load(file)
+    index = IntentIndex(quotes)
+
+    for use_case, choices in quotes.items():
+        for choice, phrases in choices.items():
+            for phrase in phrases:
+                candidates = index.match(phrase)
+                assert (use_case, choice) in [(candidate.use_case, candidate.choice) for candidate in candidates]
+
+
+def test_pruning(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that pruning only scores phrases sharing material with the parsed text"""
+    index = IntentIndex(catalogue)
+    full_index = IntentIndex(catalogue, prune=False)
+
+    scores = index.score("dhbw")
+    assert scores[index.phrases.index("dhbw")] == 1.0
+    assert scores[index.phrases.index("tell me a joke")] == 0.0
+    assert index.match("dhbw") == full_index.match("dhbw")
+
+    assert index.score("qqqq").tolist() == full_index.score("qqqq").tolist()
+    assert not IntentIndex(catalogue, full_scan_fallback=False).score("qqqq").any()
+
+
+def test_match_cache(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that repeated and equivalent utterances are served from the cache"""
+    index = IntentIndex(catalogue, cache_size=2)
+
+    first = index.match("What time  is it")
+    assert index.match("what time is it") == first
+    assert index.cache_info().hits == 1
+    assert index.cache_info().misses == 1
+
+    index.match("what time is it", threshold=0.9)
+    assert index.cache_info().misses == 2
+
+    index.clear_cache()
+    assert index.cache_info().currsize == 0
+    assert index.cache_info().hits == 0
+
+
+def test_match_batch(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that batch matching agrees with matching one text at a time"""
+    index = IntentIndex(catalogue, prune=False)
+    texts = ["what time is it", "tell me a joke", "qqqq", "i need to get to hpe", "dhbw"]
+
+    assert index.match_batch(texts, chunk_size=2) == [index.match(text) for text in texts]
+    assert index.match_batch([]) == []
+    assert IntentIndex({}).match_batch(["time"]) == [[]]
+
+
+def test_pickle(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that the index can be sent to worker processes"""
+    index = IntentIndex(catalogue, cache_size=8)
+    index.match("dhbw")
+
+    restored = pickle.loads(pickle.dumps(index))
+
+    assert restored.match("dhbw") == index.match("dhbw")
+    assert restored.cache_info().maxsize == 8
+
+
+def test_update(catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that an update only compiles the changed use cases"""
+    index = IntentIndex(catalogue)
+    assert index.compiled_use_cases == ["general", "navigation"]
+
+    changed_catalogue = {
+        "general": catalogue["general"],
+        "navigation": {**catalogue["navigation"], "ibm": ["ibm", "i need to get to ibm"]},
+        "sport": {"f1": ["formula one results"]},
+    }
+    updated_index = index.update(changed_catalogue)
+
+    assert updated_index.compiled_use_cases == ["navigation", "sport"]
+    assert updated_index.match("formula one results")[0].choice == "f1"
+    assert updated_index.match("i need to get to ibm")[0].choice == "ibm"
+    assert index.match("formula one results") == []
+
+    rebuilt_index = IntentIndex(changed_catalogue)
+    for parsed_text in ["what time is it", "ibm", "zzz"]:
+        assert updated_index.score(parsed_text).tolist() == rebuilt_index.score(parsed_text).tolist()
+
+
+def test_catalogue_watcher(tmp_path: Path, catalogue: dict[str, dict[str, list[str]]]) -> None:
+    """Test that the watcher only returns a catalogue if the content changed"""
+    path = tmp_path / "quotes.json"
+    path.write_text(json.dumps(catalogue), encoding="utf-8")
+    watcher = CatalogueWatcher(path)
+
+    assert watcher.poll() == catalogue
+    assert watcher.poll() is None
+
+    os.utime(path, ns=(0, 0))
+    assert watcher.poll() is None
+
+    path.write_text(json.dumps({"general": {"time": ["time"]}}), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert watcher.poll() == {"general": {"time": ["time"]}}
+
+    path.write_text("{", encoding="utf-8")
+    os.utime(path, ns=(2, 2))
+    assert watcher.poll() is None
+
+    assert CatalogueWatcher(tmp_path / "missing.json").poll() is None
@@ -0,0 +1,19 @@
+import json
+
+from aswe.core.metrics import dump_metrics
+from aswe.utils.metrics import RequestMetrics, serve_metrics
+
+
+def test_dump_metrics() -> None:
+    """Test that the metrics of a running agent are dumped as JSON"""
+    metrics = RequestMetrics()
+    metrics.record_cache_hit("https://api.football-data.org/v4/matches?status=IN_PLAY")
+    server = serve_metrics(0, metrics=metrics)
+    try:
+        report = json.loads(dump_metrics(server.server_address[1]))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report["hosts"]["api.football-data.org"]["cache_hits"] == 1
+    assert report["endpoints"][0]["endpoint"] == "/v4/matches"
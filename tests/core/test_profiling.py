@@ -0,0 +1,36 @@
+import json
+
+from aswe.core.profiling import parse_import_times, profile_startup
+
+_IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   loguru._defaults
+import time:        50 |         50 |     tiny
+import time:       300 |        350 |   aswe.utils
+import time:       200 |        650 | aswe
+import time:        10 |         10 | other
+"""
+
+
+def test_parse_import_times() -> None:
+    """Test that the `-X importtime` output is converted into a tree"""
+    tree = parse_import_times(_IMPORT_TIME_OUTPUT)
+
+    assert [node["module"] for node in tree] == ["aswe", "other"]
+    assert tree[0]["cumulative_us"] == 650
+    assert [child["module"] for child in tree[0]["children"]] == ["loguru._defaults", "aswe.utils"]
+    assert tree[0]["children"][1]["children"][0]["module"] == "tiny"
+
+    pruned_tree = parse_import_times(_IMPORT_TIME_OUTPUT, min_cumulative_us=100)
+    assert [node["module"] for node in pruned_tree] == ["aswe"]
+    assert pruned_tree[0]["children"][1]["children"] == []
+
+
+def test_profile_startup() -> None:
+    """Test that the startup report is valid JSON containing all stages"""
+    report = json.loads(profile_startup())
+
+    assert report["imports"]["module"] == "aswe.core.agent"
+    assert report["imports"]["total_us"] > 0
+    assert set(report["stages"]) == {"load_quotes", "load_user", "init_text_to_speech", "init_speech_to_text"}
+    assert "error" not in report["stages"]["load_quotes"]
+    assert "error" not in report["stages"]["load_user"]
@@ -0,0 +1,89 @@
+# pylint: disable=redefined-outer-name
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from pytest_mock import MockFixture
+
+from aswe.core.objects import Address, BestMatch, Favorites, Possessions, User
+from aswe.core.registry import UseCaseRegistry
+from aswe.core.user_interaction import SpeechToText, TextToSpeech
+from aswe.utils.abstract import AbstractUseCase
+
+
+class DummyUseCase(AbstractUseCase):
+    """Use case without any API access"""
+
+    def trigger_assistant(self, best_match: BestMatch) -> None:
+        self.tts.convert_text(best_match.function_key)
+
+    def check_proactivity(self) -> None:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def registry(mocker: MockFixture) -> UseCaseRegistry:
+    """Registry with patched `SpeechToText` and `TextToSpeech` objects"""
+    user = User(
+        name="TestUser",
+        age=10,
+        address=Address(street="", city="Stuttgart", zip_code=70569, country="DE", vvs_id=""),
+        possessions=Possessions(bike=True, car=True),
+        favorites=Favorites(
+            stocks=[], league="", team="", news_country="", news_keywords=[""], wakeup_time=datetime.now()
+        ),
+    )
+    return UseCaseRegistry(mocker.MagicMock(SpeechToText), mocker.MagicMock(TextToSpeech), "TestBuddy", user)
+
+
+def test_lazy_instantiation(mocker: MockFixture, registry: UseCaseRegistry) -> None:
+    """Test that a use case is created on first access and reused afterwards"""
+    factory = mocker.MagicMock(return_value=DummyUseCase)
+    registry.register("dummy", factory)
+
+    assert "dummy" in registry
+    assert "other" not in registry
+    assert not registry.is_loaded("dummy")
+    factory.assert_not_called()
+
+    use_case = registry.get("dummy")
+    assert isinstance(use_case, DummyUseCase)
+    assert use_case.assistant_name == "TestBuddy"
+    assert registry.is_loaded("dummy")
+    assert registry.get("dummy") is use_case
+    factory.assert_called_once()
+
+    use_case.trigger_assistant(BestMatch("dummy", "key", 1.0, "key"))
+    registry.tts.convert_text.assert_called_once_with("key")  # type: ignore
+
+
+def test_unknown_use_case(registry: UseCaseRegistry) -> None:
+    """Test that an unknown use case raises a `KeyError`"""
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+
+
+def test_concurrent_instantiation(registry: UseCaseRegistry) -> None:
+    """Test that concurrent first accesses from worker threads create a single instance"""
+    created: list[int] = []
+    barrier = threading.Barrier(4)
+
+    class SlowUseCase(DummyUseCase):
+        """Use case whose constructor takes a while"""
+
+        def __init__(self, *args: object) -> None:
+            created.append(1)
+            threading.Event().wait(0.05)
+            super().__init__(*args)  # type: ignore[arg-type]
+
+    def first_access() -> AbstractUseCase:
+        barrier.wait(5)
+        return registry.get("slow")
+
+    registry.register("slow", lambda: SlowUseCase)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        instances = list(executor.map(lambda _: first_access(), range(4)))
+
+    assert len(created) == 1
+    assert all(instance is instances[0] for instance in instances)
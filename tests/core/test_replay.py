@@ -0,0 +1,76 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from aswe.core.agent import Agent
+from aswe.core.replay import ReplayStub, frozen_clock, replay, replay_file
+from aswe.utils.cassette import normalize_url
+from aswe.utils.date import check_timedelta, get_next_saturday
+
+
+def test_normalize_url() -> None:
+    """Test that secret query parameters are removed"""
+    assert normalize_url("https://test.com/a?apikey=secret&limit=2") == "https://test.com/a?limit=2"
+    assert normalize_url("https://test.com/a?key=secret") == "https://test.com/a"
+    assert normalize_url("https://test.com/a") == "https://test.com/a"
+
+
+def test_replay_stub() -> None:
+    """Test that recorded responses are served and missing ones fail like `http_request`"""
+    stub = ReplayStub({"https://test.com/a?limit=2": {"json": {"lorem": "ipsum"}}})
+
+    response = stub("https://test.com/a?limit=2&apiKey=secret")
+    assert response is not None
+    assert response.status_code == 200
+    assert response.json() == {"lorem": "ipsum"}
+
+    assert stub("https://test.com/b") is None
+    assert [call["replayed"] for call in stub.calls] == [True, False]
+
+
+def test_replay_sample_session() -> None:
+    """Test that the sample session is replayed without network access"""
+    with open(Path("data/replay/sample_session.json"), encoding="utf-8") as file:
+        session = json.load(file)
+
+    report = replay(session)
+
+    assert report["summary"]["turns"] == len(session["turns"])
+    for turn in report["turns"]:
+        assert "error" not in turn
+        assert all(call["replayed"] for call in turn["api_calls"])
+        assert turn["total_ms"] >= turn["intent_matching_ms"]
+
+    assert [turn["choice"] for turn in report["turns"]] == [
+        "time",
+        "f1LastRoundResult",
+        "footballStandings",
+        "marryMe",
+    ]
+    assert len(report["turns"][2]["api_calls"]) == 1
+
+    assert json.loads(replay_file("data/replay/sample_session.json"))["summary"]["turns"] == 4
+
+
+def test_frozen_clock() -> None:
+    """Test that the clock of the `aswe` modules is fixed to the recorded time and restored afterwards"""
+    with frozen_clock(datetime(2022, 12, 1, 7, 30)):
+        assert get_next_saturday() == datetime(2022, 12, 3)
+        assert not check_timedelta(datetime(2022, 12, 1, 7, 0), 60)
+        assert check_timedelta(datetime(2022, 12, 1, 6, 0), 60)
+
+    assert get_next_saturday() > datetime(2022, 12, 3)
+    assert check_timedelta(datetime(2022, 12, 1, 7, 0), 60)
+
+
+def test_replay_recorded_time(mocker: MockerFixture) -> None:
+    """Test that time dependent answers are reproduced from the timestamp of the turn"""
+    agent = Agent(headless=True, utterances=os.devnull, state_path=":memory:", http_cache_path=None)
+    convert_text = mocker.patch.object(agent.tts, "convert_text")
+
+    replay({"turns": [{"timestamp": "2022-12-01T07:30:00", "utterance": "what time is it"}]}, agent)
+
+    convert_text.assert_called_once_with("The current time is 07:30")
@@ -0,0 +1,168 @@
+import threading
+from datetime import datetime, timedelta
+
+from pytest_mock import MockFixture
+
+from aswe.core.scheduler import JobResult, ProactivityScheduler
+
+
+def test_run_due_in_deadline_order(mocker: MockFixture) -> None:
+    """Test that only due jobs run, ordered by their deadline, and are rescheduled"""
+    now = datetime(2022, 12, 1, 12, 0)
+    calls: list[str] = []
+    scheduler = ProactivityScheduler()
+    scheduler.register("late", lambda: calls.append("late"), timedelta(minutes=15), first_due=now)
+    scheduler.register("early", lambda: calls.append("early"), timedelta(minutes=5), first_due=now - timedelta(1))
+    future = mocker.MagicMock()
+    scheduler.register("future", future, timedelta(minutes=5), first_due=now + timedelta(minutes=1))
+
+    assert scheduler.next_deadline() == now - timedelta(1)
+    assert scheduler.run_due(now) == ["early", "late"]
+    assert calls == ["early", "late"]
+    future.assert_not_called()
+
+    assert scheduler.jobs["early"].next_due == now + timedelta(minutes=5)
+    assert scheduler.jobs["late"].last_run == now
+    assert scheduler.next_deadline() == now + timedelta(minutes=1)
+    assert scheduler.run_due(now) == []
+
+
+def test_anchored_job_keeps_time_of_day(mocker: MockFixture) -> None:
+    """Test that anchored jobs are rescheduled from their deadline instead of the time they ran"""
+    wakeup = datetime(2022, 12, 1, 7, 0)
+    scheduler = ProactivityScheduler()
+    scheduler.register("wakeup", mocker.MagicMock(), timedelta(days=1), first_due=wakeup, anchored=True)
+
+    scheduler.run_due(wakeup + timedelta(days=2, minutes=3))
+    assert scheduler.jobs["wakeup"].next_due == wakeup + timedelta(days=3)
+
+
+def test_reschedule_and_unregister(mocker: MockFixture) -> None:
+    """Test that stale heap entries are skipped"""
+    now = datetime(2022, 12, 1, 12, 0)
+    job = mocker.MagicMock()
+    scheduler = ProactivityScheduler()
+    scheduler.register("job", job, timedelta(minutes=5), first_due=now)
+    scheduler.register("removed", job, timedelta(minutes=5), first_due=now - timedelta(minutes=1))
+
+    scheduler.reschedule("job", now + timedelta(hours=1))
+    scheduler.unregister("removed")
+    assert "removed" not in scheduler
+    assert scheduler.run_due(now) == []
+    assert scheduler.next_deadline() == now + timedelta(hours=1)
+    job.assert_not_called()
+
+
+def test_not_implemented_job_is_removed() -> None:
+    """Test that jobs raising `NotImplementedError` are removed"""
+
+    def not_implemented() -> None:
+        raise NotImplementedError
+
+    scheduler = ProactivityScheduler()
+    scheduler.register("general", not_implemented, timedelta(minutes=5), first_due=datetime.now())
+
+    assert scheduler.run_due() == ["general"]
+    assert "general" not in scheduler
+    assert scheduler.next_deadline() is None
+
+
+def test_seconds_until_next_deadline() -> None:
+    """Test that the wait time is clamped between minimum and maximum"""
+    scheduler = ProactivityScheduler()
+    assert scheduler.seconds_until_next_deadline(maximum=60) == 60
+
+    scheduler.register("soon", lambda: None, timedelta(seconds=20))
+    assert 10 < scheduler.seconds_until_next_deadline(maximum=60) <= 20
+
+    scheduler.reschedule("soon", datetime.now() - timedelta(minutes=1))
+    assert scheduler.seconds_until_next_deadline(maximum=60) == 1
+
+
+def test_worker_pool(mocker: MockFixture) -> None:
+    """Test that jobs run on worker threads in their context and are not started twice"""
+    release = threading.Event()
+    threads: list[str] = []
+    context = mocker.MagicMock()
+
+    def slow_job() -> None:
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+
+    scheduler = ProactivityScheduler(max_workers=2, context=context)
+    scheduler.register("slow", slow_job, timedelta(seconds=1), first_due=datetime.now())
+    scheduler.register("failing", mocker.MagicMock(side_effect=NotImplementedError), timedelta(seconds=1))
+
+    assert scheduler.run_due() == ["slow"]
+    assert scheduler.running == ["slow"]
+    scheduler.run("slow")
+    scheduler.run("failing")
+
+    release.set()
+    scheduler.join()
+    assert scheduler.running == []
+    assert "failing" not in scheduler
+    assert len(threads) == 1 and threads[0].startswith("proactivity")
+    assert context.call_count == 2
+    scheduler.shutdown()
+
+
+def test_adaptive_interval() -> None:
+    """Test that the interval backs off while the state does not change and resets once it changes"""
+    now = datetime(2022, 12, 1, 12, 0)
+    results = iter([JobResult("a"), JobResult("a"), JobResult("a"), JobResult("a"), JobResult("b")])
+    scheduler = ProactivityScheduler()
+    job = scheduler.register(
+        "sport", lambda: next(results), timedelta(minutes=15), first_due=now, max_interval=timedelta(minutes=50)
+    )
+
+    intervals = []
+    for _ in range(5):
+        scheduler.run_due(job.next_due)
+        intervals.append(job.next_due - job.last_run)  # type: ignore
+
+    minutes = [interval.total_seconds() / 60 for interval in intervals]
+    assert minutes == [15, 30, 50, 50, 15]
+
+
+def test_adaptive_interval_near_deadline() -> None:
+    """Test that jobs are never scheduled after an upcoming deadline and use the minimum interval near it"""
+    now = datetime(2022, 12, 1, 12, 0)
+    kickoff = now + timedelta(hours=2, minutes=10)
+    scheduler = ProactivityScheduler()
+    job = scheduler.register(
+        "sport",
+        lambda: JobResult(None, kickoff),
+        timedelta(minutes=15),
+        first_due=now,
+        max_interval=timedelta(hours=4),
+    )
+    job.interval = timedelta(hours=4)
+    job.last_state = None
+
+    scheduler.run_due(now)
+    assert job.next_due == kickoff
+
+    scheduler.run_due(kickoff)
+    assert job.next_due == kickoff + timedelta(minutes=15)
+
+    scheduler.configure("sport", min_interval=timedelta(minutes=10), max_interval=timedelta(minutes=5))
+    assert job.min_interval == job.max_interval == job.interval == timedelta(minutes=10)
+
+
+def test_unavailable_host_skips_job(mocker: MockFixture) -> None:
+    """Test that jobs polling an unavailable host are skipped and rescheduled"""
+    now = datetime(2022, 12, 1, 12, 0)
+    job = mocker.MagicMock(return_value=None)
+    available = {"api.football-data.org": False}
+    scheduler = ProactivityScheduler(available=lambda host: available.get(host, True))
+    scheduler.register("sport", job, timedelta(minutes=15), first_due=now, hosts=("api.football-data.org",))
+    scheduler.register("navigation", job, timedelta(minutes=5), first_due=now)
+
+    assert scheduler.run_due(now) == ["sport", "navigation"]
+    assert job.call_count == 1
+    assert scheduler.jobs["sport"].next_due == now + timedelta(minutes=15)
+
+    available["api.football-data.org"] = True
+    scheduler.run_due(now + timedelta(minutes=15))
+    assert job.call_count == 3
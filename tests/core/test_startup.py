@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+_IMPORT_TIME_BUDGET_US = 600_000
+_HEAVY_MODULES = [
+    "currency_converter",
+    "google_auth_oauthlib",
+    "googleapiclient",
+    "googlemaps",
+    "pandas",
+    "pycountry",
+    "pyjokes",
+    "vvspy",
+]
+
+
+def test_import_time_budget() -> None:
+    """Test that importing `aswe.core.agent` stays within the import time budget
+
+    The cumulative import time is taken from `python -X importtime` in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import aswe.core.agent"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    agent_line = next(line for line in result.stderr.splitlines() if line.endswith("| aswe.core.agent"))
+    cumulative_us = int(agent_line.split("|")[1])
+
+    assert cumulative_us < _IMPORT_TIME_BUDGET_US, f"Importing the agent took {cumulative_us / 1000:.0f} ms"
+
+
+def test_no_heavy_imports() -> None:
+    """Test that no heavy dependency of a use case is imported together with `aswe.core.agent`"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, aswe.core.agent; print(','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
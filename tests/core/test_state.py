@@ -0,0 +1,104 @@
+# pylint: disable=redefined-outer-name
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockFixture
+
+from aswe.api.event.event_data import EventLocation, EventSummary
+from aswe.api.navigation import MapsTripMode
+from aswe.core.objects import Address, Favorites, Possessions, User
+from aswe.core.scheduler import ProactivityScheduler
+from aswe.core.state import StateStore
+from aswe.core.user_interaction import SpeechToText, TextToSpeech
+from aswe.use_cases.event import EventUseCase
+from aswe.use_cases.morning_briefing import MorningBriefingUseCase
+
+
+@pytest.fixture
+def user() -> User:
+    """User without any API keys or favorites"""
+    return User(
+        name="TestUser",
+        age=10,
+        address=Address(street="", city="Stuttgart", zip_code=70569, country="DE", vvs_id=""),
+        possessions=Possessions(bike=True, car=True),
+        favorites=Favorites(
+            stocks=[], league="", team="", news_country="", news_keywords=[""], wakeup_time=datetime.now()
+        ),
+    )
+
+
+def test_store_persists_across_restarts(tmp_path: Path) -> None:
+    """Test that values survive reopening the database"""
+    path = tmp_path / "state" / "state.sqlite"
+    store = StateStore(path)
+    store.set("ns", "a", {"price": 1.5, "at": datetime(2022, 12, 1, 7, 30)})
+    store.set("ns", "b", [1, 2])
+    store.set("other", "a", "ignored")
+    store.delete("ns", "b")
+    store.close()
+
+    store = StateStore(path)
+    assert store.items("ns") == {"a": {"price": 1.5, "at": "2022-12-01T07:30:00"}}
+    assert store.get("ns", "b", "default") == "default"
+
+
+def test_persistent_dict() -> None:
+    """Test that every change of a `PersistentDict` is written through"""
+    store = StateStore()
+    mapping = store.mapping("prices")
+    mapping["AAPL"] = 150.0
+    mapping["MSFT"] = 250.0
+    mapping.pop("MSFT")
+
+    assert store.items("prices") == {"AAPL": 150.0}
+    assert dict(store.mapping("prices")) == {"AAPL": 150.0}
+
+
+def test_use_case_state(mocker: MockFixture, user: User) -> None:
+    """Test that use cases restore their state from the store"""
+    store = StateStore()
+    stt, tts = mocker.MagicMock(SpeechToText), mocker.MagicMock(TextToSpeech)
+
+    summary = EventSummary(
+        id="1",
+        name="Concert",
+        start=datetime(2022, 12, 1, 20, 0),
+        location=EventLocation(city="Stuttgart", address="Street 1"),
+        trip_mode=MapsTripMode.TRANSIT,
+    )
+    EventUseCase(stt, tts, "TestBuddy", user, store).attending_events[summary.id] = summary
+    morning_briefing = MorningBriefingUseCase(stt, tts, "TestBuddy", user, store)
+    morning_briefing.last_stock_prices["AAPL"] = 150.0
+    store.set("morningBriefing", "currency", ("euro", "EUR"))
+
+    assert EventUseCase(stt, tts, "TestBuddy", user, store).attending_events == {"1": summary}
+    restored = MorningBriefingUseCase(stt, tts, "TestBuddy", user, store)
+    assert dict(restored.last_stock_prices) == {"AAPL": 150.0}
+    assert restored.currency == ("euro", "EUR")
+
+    assert len(EventUseCase(stt, tts, "TestBuddy", user).attending_events) == 0
+
+
+def test_scheduler_state(mocker: MockFixture) -> None:
+    """Test that a restarted scheduler continues the schedule instead of starting over"""
+    store = StateStore()
+    now = datetime(2022, 12, 1, 12, 0)
+
+    scheduler = ProactivityScheduler(state=store)
+    job = scheduler.register(
+        "sport", mocker.MagicMock(), timedelta(minutes=15), first_due=now, max_interval=timedelta(hours=1)
+    )
+    scheduler.run_due(now)
+    job.interval = timedelta(minutes=30)
+    scheduler.reschedule("sport", now + timedelta(minutes=30))
+
+    restarted = ProactivityScheduler(state=store)
+    restored = restarted.register("sport", mocker.MagicMock(), timedelta(minutes=15), max_interval=timedelta(hours=1))
+    assert restored.next_due == now + timedelta(minutes=30)
+    assert restored.interval == timedelta(minutes=30)
+    assert restored.last_run == now
+
+    restarted.unregister("sport")
+    assert store.get("scheduler", "sport") is None
@@ -1,5 +1,8 @@
+import threading
+from io import StringIO
 from pathlib import Path
 
+import pytest
 import speech_recognition as sr
 from pyttsx3 import Engine
 
@@ -61,3 +64,62 @@ def test_optimize_text() -> None:
         tts.optimize_text("The event is at 14:15.", optimize_time=True, optimize_numbers=True)
         == "The event is at 14 15 ."
     )
+
+
+def test_headless() -> None:
+    """Test that utterances are read from and answers written to text streams in headless mode"""
+    stt = SpeechToText(get_mic=True, source=StringIO("yes\n\n"))
+    assert stt.microphone_index is None
+    assert stt.check_if_yes() is True
+    assert stt.convert_speech() is None
+    with pytest.raises(EOFError):
+        stt.convert_speech()
+
+    sink = StringIO()
+    tts = TextToSpeech(sink=sink)
+    assert tts.engine is None
+
+    tts.convert_text("The event is at 12:00.")
+    assert sink.getvalue() == "The event is at 12 o'clock .\n"
+
+
+def test_deferred_announcements() -> None:
+    """Test that deferred announcements are spoken by `drain` in the order of their priority"""
+    sink = StringIO()
+    tts = TextToSpeech(sink=sink)
+
+    def job(name: str, priority: int) -> None:
+        with tts.defer(priority):
+            tts.convert_text(f"{name} first")
+            tts.follow_up(lambda: tts.convert_text(f"{name} follow up"))
+            tts.convert_text(f"{name} last")
+
+    worker = threading.Thread(target=job, args=("sport", 2))
+    worker.start()
+    worker.join()
+    job("navigation", 0)
+    assert sink.getvalue() == ""
+
+    assert tts.drain() == 6
+    assert sink.getvalue().splitlines() == [
+        "navigation first",
+        "navigation follow up",
+        "navigation last",
+        "sport first",
+        "sport follow up",
+        "sport last",
+    ]
+
+    tts.convert_text("not deferred")
+    assert sink.getvalue().endswith("not deferred\n")
+
+
+def test_deferred_line_above(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that `drain` prints the new line requested for a deferred announcement"""
+    tts = TextToSpeech(sink=StringIO())
+    with tts.defer(0):
+        tts.convert_text("first", line_above=True)
+        tts.convert_text("second")
+
+    tts.drain()
+    assert capsys.readouterr().out == "\nBot: first\nBot: second\n"
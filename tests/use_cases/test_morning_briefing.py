@@ -11,6 +11,7 @@ from aswe.api.calendar import Event
 from aswe.core.objects import Address, BestMatch, Favorites, Possessions, User
 from aswe.core.user_interaction import SpeechToText, TextToSpeech
 from aswe.use_cases.morning_briefing import MorningBriefingUseCase
+from aswe.utils.error import TooManyRequests
 
 
 @pytest.fixture(scope="function")
@@ -180,7 +181,7 @@ def test_news_overview(mocker: MockFixture, patch_tts: TextToSpeech, patch_use_c
     country_top_headlines = ["Title 1: Description 1"]
     keyword_top_headlines = ["Title 2: Description 2"]
     mocker.patch("aswe.use_cases.morning_briefing.top_headlines_search", return_value=country_top_headlines)
-    mocker.patch("aswe.use_cases.morning_briefing.keyword_search", return_value=keyword_top_headlines)
+    mocker.patch("aswe.use_cases.morning_briefing.keyword_search_async", return_value=keyword_top_headlines)
     spy_tts_convert_text = mocker.spy(patch_tts, "convert_text")
 
     patch_use_case.trigger_assistant(best_match)
@@ -194,7 +195,7 @@ def test_news_overview(mocker: MockFixture, patch_tts: TextToSpeech, patch_use_c
 
     # Test with no headlines at all
     mocker.patch("aswe.use_cases.morning_briefing.top_headlines_search", return_value=None)
-    mocker.patch("aswe.use_cases.morning_briefing.keyword_search", return_value=None)
+    mocker.patch("aswe.use_cases.morning_briefing.keyword_search_async", return_value=None)
     spy_tts_convert_text = mocker.spy(patch_tts, "convert_text")
 
     patch_use_case.trigger_assistant(best_match)
@@ -272,9 +273,9 @@ def test_finance_overview(mocker: MockFixture, patch_tts: TextToSpeech, patch_us
         "5D": "+3.86%",
     }
     stock_rating = "S minus (Strong Buy)"
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price", return_value=stock_price)
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_change", return_value=stock_price_change)
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_rating", return_value=stock_rating)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_async", return_value=stock_price)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_change_async", return_value=stock_price_change)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_rating_async", return_value=stock_rating)
     spy_tts_convert_text = mocker.spy(patch_tts, "convert_text")
 
     patch_use_case.trigger_assistant(best_match)
@@ -287,11 +288,32 @@ def test_finance_overview(mocker: MockFixture, patch_tts: TextToSpeech, patch_us
     ]
 
     # Test with no stock data
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price", return_value=None)
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_change", return_value=None)
-    mocker.patch("aswe.use_cases.morning_briefing.get_stock_rating", return_value=None)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_async", return_value=None)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_change_async", return_value=None)
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_rating_async", return_value=None)
     spy_tts_convert_text = mocker.spy(patch_tts, "convert_text")
 
     patch_use_case.trigger_assistant(best_match)
 
     spy_tts_convert_text.assert_called_once_with("Unfortunately, I could not find any information for you today.")
+
+    # Test with the daily quota exhausted for one of the stocks
+    def limited_stock_price(symbol: str, currency: str) -> float:
+        if symbol == "MSFT":
+            raise TooManyRequests
+        return stock_price
+
+    patch_use_case.user.favorites.stocks = [
+        {"name": "Microsoft", "symbol": "MSFT"},
+        {"name": "Apple", "symbol": "AAPL"},
+    ]
+    mocker.patch("aswe.use_cases.morning_briefing.get_stock_price_async", side_effect=limited_stock_price)
+    spy_tts_convert_text = mocker.spy(patch_tts, "convert_text")
+
+    patch_use_case.trigger_assistant(best_match)
+
+    assert spy_tts_convert_text.call_args_list == [
+        call("Unfortunately, I could not find any information about Microsoft today."),
+        call("About Apple:"),
+        call("The Apple stock is currently trading at 120.96 Euro per share."),
+    ]
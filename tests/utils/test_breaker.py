@@ -0,0 +1,29 @@
+from aswe.utils.breaker import BreakerState, CircuitBreaker
+
+
+def test_circuit_breaker() -> None:
+    """Test that the circuit opens after consecutive failures and closes after a successful probe"""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30, clock=lambda: now[0])
+    url = "https://api.football-data.org/v4/matches"
+
+    breaker.record_failure(url)
+    assert breaker.allow(url)
+    breaker.record_failure(url)
+    assert breaker.state("api.football-data.org") == BreakerState.OPEN
+    assert not breaker.is_available(url)
+    assert not breaker.allow(url)
+    assert breaker.allow("https://newsapi.org")
+
+    now[0] = 30
+    assert breaker.is_available(url)
+    assert breaker.allow(url)
+    assert not breaker.allow(url)
+    breaker.record_failure(url)
+    assert breaker.states() == {"api.football-data.org": BreakerState.OPEN}
+
+    now[0] = 60
+    assert breaker.allow(url)
+    breaker.record_success(url)
+    assert breaker.state(url) == BreakerState.CLOSED
+    assert breaker.states() == {}
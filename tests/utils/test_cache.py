@@ -0,0 +1,222 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from requests.models import Response
+
+from aswe.utils.cache import (
+    CachePolicy,
+    ResponseCache,
+    ResponseStore,
+    SingleFlight,
+    TTLCache,
+    ttl_cache,
+)
+
+
+class _Clock:
+    """Manually advanced clock"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _response(status_code: int = 200, content: bytes = b"{}", etag: str | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.url = "https://example.com"
+    response._content = content  # pylint: disable=protected-access
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return response
+
+
+def test_ttl_cache_expiration_and_eviction() -> None:
+    """Test that entries expire after their TTL and the least recently used entry is evicted"""
+    clock = _Clock()
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, clock=clock)
+
+    cache.put("a", 1, ttl=10)
+    cache.put("b", 2, ttl=None)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3, ttl=10)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.expirations == 2
+    assert cache.stats.hit_rate == 0.25
+
+
+def test_response_cache_policies() -> None:
+    """Test that responses are cached by URL and headers with the TTL of the first matching policy"""
+    clock = _Clock()
+    cache = ResponseCache(
+        [
+            CachePolicy("live", r"example\.com/live", 0),
+            CachePolicy("past", r"example\.com/\d{4}", None),
+            CachePolicy("example", r"example\.com", 60),
+        ],
+        clock=clock,
+    )
+
+    cache.put("https://example.com/live", None, _response())
+    cache.put("https://example.com/2022", None, _response())
+    cache.put("https://example.com/standings", {"token": "a"}, _response())
+    cache.put("https://example.com/error", None, _response(404))
+    cache.put("https://other.com", None, _response())
+
+    assert cache.get("https://example.com/live") is None
+    assert cache.get("https://example.com/error") is None
+    assert cache.get("https://other.com") is None
+    assert cache.get("https://example.com/standings", {"token": "b"}) is None
+
+    cached = cache.get("https://example.com/standings", {"token": "a"})
+    assert cached is not None and cached.json() == {}
+
+    clock.now = 60
+    assert cache.get("https://example.com/standings", {"token": "a"}) is None
+    assert cache.get("https://example.com/2022") is not None
+
+    assert cache.policy_stats["example"].hits == 1
+    assert cache.policy_stats["example"].misses == 3
+    assert cache.policy_stats["past"].hits == 1
+    assert "live" not in cache.policy_stats
+
+
+def test_response_store(tmp_path: Path) -> None:
+    """Test that responses survive a restart, large bodies are compressed and stale responses are revalidated"""
+    clock = _Clock()
+    path = tmp_path / "http_cache.sqlite"
+    store = ResponseStore(path, max_entries=2, compress_min_size=8, clock=clock)
+    store.put("small", _response(), expires=10)
+    store.put("large", _response(content=b"[" + b"1," * 100 + b"1]", etag='"v1"'), expires=10)
+    store.close()
+
+    clock.now = 20
+    store = ResponseStore(path, max_entries=2, compress_min_size=8, clock=clock)
+    raw_size = store._connection.execute(  # pylint: disable=protected-access
+        "SELECT LENGTH(body) FROM responses WHERE key = 'large'"
+    ).fetchone()[0]
+    assert raw_size < 100
+
+    assert store.get("small") is None
+    stale = store.get("large")
+    assert stale is not None and not stale.is_fresh(clock.now)
+    assert stale.response.json() == [1] * 101
+    assert stale.validators == {"If-None-Match": '"v1"'}
+
+    store.refresh("large", expires=30)
+    refreshed = store.get("large")
+    assert refreshed is not None and refreshed.is_fresh(clock.now)
+
+    clock.now = 25
+    store.put("a", _response(), expires=None)
+    store.put("b", _response(), expires=None)
+    assert len(store) == 2
+    assert store.get("large") is None
+
+
+def test_response_store_strips_secrets(tmp_path: Path) -> None:
+    """Test that stored URLs contain no API keys"""
+    path = tmp_path / "http_cache.sqlite"
+    store = ResponseStore(path)
+    response = _response()
+    response.url = "https://newsapi.org/v2/everything?q=a&apiKey=secret"
+    store.put("news", response, expires=None)
+    store.close()
+
+    store = ResponseStore(path)
+    assert [response.url for response in store.responses()] == ["https://newsapi.org/v2/everything?q=a"]
+    store.close()
+    assert b"secret" not in path.read_bytes()
+
+
+def test_response_cache_store() -> None:
+    """Test that the response cache is refilled from the store and counts revalidations as hits"""
+    clock = _Clock()
+    policies = [CachePolicy("example", r"example\.com", 60)]
+    store = ResponseStore(clock=clock)
+    ResponseCache(policies, store=store).put("https://example.com", None, _response(etag='"v1"'))
+
+    restarted = ResponseCache(policies, store=store)
+    assert restarted.get("https://example.com") is not None
+    assert restarted.validators("https://example.com") == {"If-None-Match": '"v1"'}
+
+    clock.now = 60
+    restarted.clear()
+    assert restarted.get("https://example.com") is None
+    revalidated = restarted.revalidate("https://example.com")
+    assert revalidated is not None and revalidated.json() == {}
+    assert restarted.get("https://example.com") is not None
+
+    assert restarted.stats.hits == 3
+    assert restarted.stats.misses == 1
+    assert restarted.stats.revalidations == 1
+
+
+def test_ttl_cache_decorator() -> None:
+    """Test that `ttl_cache` caches results by arguments and skips `None` results"""
+    calls: list[str] = []
+
+    @ttl_cache(60)
+    def lookup(name: str, suffix: str = "") -> str | None:
+        calls.append(name)
+        return None if name == "" else name + suffix
+
+    assert lookup("a", suffix="!") == "a!"
+    assert lookup("a", suffix="!") == "a!"
+    assert lookup("") is None
+    assert lookup("") is None
+    assert calls == ["a", "", ""]
+    assert lookup.cache_stats().hits == 1
+
+    lookup.cache_clear()
+    assert lookup("a", suffix="!") == "a!"
+    assert calls == ["a", "", "", "a"]
+
+
+def test_single_flight() -> None:
+    """Test that concurrent identical calls share one call and its exception"""
+    flights: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def slow_call() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(flights.do, "key", slow_call)
+        started.wait(5)
+        followers = [executor.submit(flights.do, "key", slow_call) for _ in range(2)]
+        while flights.saved < 2:
+            threading.Event().wait(0.01)
+        release.set()
+
+        assert leader.result() == (42, False)
+        assert [follower.result() for follower in followers] == [(42, True), (42, True)]
+
+    assert calls == [1]
+    assert flights.saved == 2
+
+    def failing_call() -> int:
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flights.do("key", failing_call)
+    assert flights.do("key", lambda: 1) == (1, False)
@@ -0,0 +1,107 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+from requests import Response
+
+from aswe.utils.cassette import (
+    Cassette,
+    CassetteMode,
+    current_cassette,
+    normalize_url,
+    recorded,
+    use_cassette,
+)
+from aswe.utils.decoder import decode_json
+from aswe.utils.error import CassetteMiss
+from aswe.utils.request import configure_cache, http_request
+
+
+@pytest.fixture
+def no_cache() -> Iterator[None]:
+    """Disables the response cache of `http_request` during the test"""
+    configure_cache([])
+    yield
+    configure_cache()
+
+
+def test_normalize_url() -> None:
+    """Test that secret query parameters are removed"""
+    assert normalize_url("https://test.com/a?apikey=secret&limit=2") == "https://test.com/a?limit=2"
+    assert normalize_url("https://test.com/a?token=secret") == "https://test.com/a"
+
+
+def test_cassette(tmp_path: Path) -> None:
+    """Test that recorded calls are replayed by their parameters and otherwise in recording order"""
+    path = tmp_path / "cassette.sqlite"
+    with pytest.raises(FileNotFoundError):
+        Cassette(path)
+
+    cassette = Cassette(path, CassetteMode.RECORD)
+    assert cassette.call("maps", "('a', 'b')", lambda: {"distance": 1}) == {"distance": 1}
+    assert cassette.call("maps", "('a', 'c')", lambda: {"distance": 2}) == {"distance": 2}
+    assert len(cassette) == 2
+    cassette.close()
+
+    cassette = Cassette(path)
+
+    def fail() -> None:
+        raise AssertionError("A replayed call must not be sent")
+
+    assert cassette.call("maps", "('a', 'c')", fail) == {"distance": 2}
+    assert [cassette.call("maps", "('x', 'y')", fail) for _ in range(3)] == [
+        {"distance": 1},
+        {"distance": 2},
+        {"distance": 1},
+    ]
+    with pytest.raises(CassetteMiss):
+        cassette.call("vvs", "()", fail)
+    cassette.close()
+
+
+def test_recorded(tmp_path: Path) -> None:
+    """Test that client calls are only recorded and replayed inside a cassette"""
+    calls = []
+
+    def directions(start: str, end: str, mode: str = "driving") -> list[str]:
+        calls.append(start)
+        return [start, end, mode]
+
+    assert recorded("directions", directions, "a", "b") == ["a", "b", "driving"]
+    with use_cassette(tmp_path / "cassette.sqlite", CassetteMode.RECORD):
+        assert recorded("directions", directions, "a", "b", mode="walking") == ["a", "b", "walking"]
+    with use_cassette(tmp_path / "cassette.sqlite") as cassette:
+        assert current_cassette() is cassette
+        assert recorded("directions", directions, "a", "b", mode="walking") == ["a", "b", "walking"]
+
+    assert current_cassette() is None
+    assert calls == ["a", "a"]
+
+
+@pytest.mark.usefixtures("no_cache")
+def test_http_request_cassette(mocker: MockerFixture, tmp_path: Path) -> None:
+    """Test that `http_request` records responses without secrets and replays them offline"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    mock_response.url = "https://example.com/cassette?apikey=secret&q=a"
+    mock_response._content = json.dumps({"feed": [1, 2]}).encode()
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+
+    with use_cassette(tmp_path / "cassette.sqlite", CassetteMode.RECORD):
+        response = http_request("https://example.com/cassette?apikey=secret&q=a")
+        assert response is not None
+        assert decode_json(response) == {"feed": [1, 2]}
+
+    get.side_effect = requests.ConnectionError("offline")
+    with use_cassette(tmp_path / "cassette.sqlite"):
+        replayed = http_request("https://example.com/cassette?apikey=other&q=a")
+
+    assert get.call_count == 1
+    assert replayed is not None
+    assert replayed.status_code == 200
+    assert decode_json(replayed) == {"feed": [1, 2]}
+    assert replayed.url == "https://example.com/cassette?q=a"
+    assert b"secret" not in (tmp_path / "cassette.sqlite").read_bytes()
@@ -0,0 +1,114 @@
+import io
+import json
+import sys
+from itertools import islice
+
+import pytest
+import requests
+from pytest_mock import MockerFixture
+from requests import Response
+
+from aswe.utils.decoder import (
+    STDLIB_DECODER,
+    JsonDecoder,
+    configure_decoder,
+    current_decoder,
+    decode_json,
+    fast_decoder,
+    iter_json_items,
+)
+
+
+def _response(content: bytes) -> Response:
+    response = Response()
+    response.status_code = 200
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
+def test_decode_json() -> None:
+    """Test that the configured decoder returns the same result as `response.json()`"""
+    body = {"feed": [{"title": "Über", "score": 0.25}], "total": 1}
+    response = _response(json.dumps(body).encode("utf-8"))
+
+    assert decode_json(response) == response.json() == body
+
+
+def test_decode_invalid_json() -> None:
+    """Test that invalid JSON raises the error of `response.json()` with every decoder"""
+    for json_decoder in (current_decoder(), STDLIB_DECODER):
+        configure_decoder(json_decoder)
+        with pytest.raises(requests.JSONDecodeError):
+            decode_json(_response(b"<html>Too many requests</html>"))
+        with pytest.raises(json.JSONDecodeError):
+            decode_json(_response(b""))
+
+    configure_decoder()
+
+
+def test_configure_decoder(mocker: MockerFixture) -> None:
+    """Test that a custom decoder is used and the standard library is the fallback"""
+    configure_decoder(JsonDecoder("custom", lambda content: {"length": len(content)}))
+    assert decode_json(_response(b"[]")) == {"length": 2}
+
+    mocker.patch.dict(sys.modules, {"orjson": None})
+    configure_decoder()
+    assert current_decoder() == STDLIB_DECODER
+
+    mocker.stopall()
+    configure_decoder()
+    assert current_decoder() == (fast_decoder() or STDLIB_DECODER)
+
+
+class _Raw(io.BytesIO):
+    """Body of a streamed response which remembers how much was read before it was closed"""
+
+    read_before_close = -1
+
+    def close(self) -> None:
+        self.read_before_close = self.tell()
+
+
+def _streamed_response(content: bytes) -> Response:
+    response = _response(content[:0])
+    response._content = False  # pylint: disable=protected-access
+    response.raw = _Raw(content)
+    return response
+
+
+def test_iter_json_items() -> None:
+    """Test that the items of an array are decoded from arbitrarily split chunks"""
+    body = {
+        "filters": {"status": ["IN_PLAY"], "nested": [[1, 2], {"matches": []}]},
+        "resultSet": {"count": 3, "played": 12345},
+        "matches": [
+            {"homeTeam": {"name": "Türkiye"}, "score": 1.5e3, "tags": ["a", "]", "}"]},
+            12345,
+            None,
+        ],
+        "trailing": True,
+    }
+    content = json.dumps(body, indent=2, ensure_ascii=False).encode("utf-8")
+
+    for chunk_size in (1, 7, 1024):
+        response = _streamed_response(content)
+        assert list(iter_json_items(response, "matches", chunk_size)) == body["matches"]
+
+    assert list(iter_json_items(_response(content), "matches")) == body["matches"]
+    assert list(iter_json_items(_response(b'{"feed": []}'), "feed")) == []
+    with pytest.raises(KeyError):
+        list(iter_json_items(_response(b'{"fied": [1]}'), "feed"))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_items(_streamed_response(content[:-40]), "matches", 16))
+
+
+def test_iter_json_items_early_stop() -> None:
+    """Test that the download stops once the caller has enough items"""
+    content = json.dumps({"feed": [{"title": f"News {index}", "relevance": index % 2} for index in range(200)]})
+    response = _streamed_response(content.encode("utf-8"))
+    raw = response.raw
+
+    relevant = list(islice((news for news in iter_json_items(response, "feed", 256) if news["relevance"]), 2))
+
+    assert [news["title"] for news in relevant] == ["News 1", "News 3"]
+    assert 0 < raw.read_before_close < len(content) / 10
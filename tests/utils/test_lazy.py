@@ -0,0 +1,16 @@
+import sys
+
+from aswe.utils.lazy import LazyModule, lazy_import
+
+
+def test_lazy_import() -> None:
+    """Test that the module is only imported on first attribute access"""
+    sys.modules.pop("colorsys", None)
+
+    colorsys = lazy_import("colorsys")
+    assert isinstance(colorsys, LazyModule)
+    assert "colorsys" not in sys.modules
+
+    assert colorsys.rgb_to_hsv(0, 0, 0) == (0, 0, 0)
+    assert "colorsys" in sys.modules
+    assert "rgb_to_hsv" in dir(colorsys)
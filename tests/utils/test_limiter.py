@@ -0,0 +1,74 @@
+from datetime import date
+
+from aswe.core.state import StateStore
+from aswe.utils.limiter import (
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    background_requests,
+    is_background,
+)
+
+
+class _Clock:
+    """Manually advanced clock"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket() -> None:
+    """Test that the bucket allows bursts and refills with its rate"""
+    clock = _Clock()
+    bucket = TokenBucket(rate=0.5, burst=2, clock=clock)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 2
+
+    clock.now = 2
+    assert bucket.acquire() == 0
+
+
+def test_rate_limiter_waits_for_tokens() -> None:
+    """Test that requests wait for the token bucket of their host"""
+    clock = _Clock()
+    limiter = RateLimiter([RateLimit(r"example\.com$", rate=1, burst=1)], clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire("https://example.com/a")
+    assert limiter.acquire("https://example.com/b")
+    assert clock.now == 1
+    assert limiter.acquire("https://other.com")
+    assert clock.now == 1
+
+
+def test_rate_limiter_quota() -> None:
+    """Test that background requests keep the reserve of the daily quota and the usage survives restarts"""
+    state = StateStore()
+    today = [date(2022, 12, 1)]
+    limits = [RateLimit(r"api-sports\.io$", rate=100, burst=100, daily_quota=5, reserve=0.4)]
+    limiter = RateLimiter(limits, state, today=lambda: today[0])
+
+    with background_requests():
+        assert is_background()
+        assert [limiter.acquire("https://v1.handball.api-sports.io/games") for _ in range(4)] == [True] * 3 + [False]
+    assert not is_background()
+
+    restarted = RateLimiter(limits, state, today=lambda: today[0])
+    assert restarted.usage("v1.handball.api-sports.io").used == 3
+    assert restarted.usage("v1.handball.api-sports.io").dropped == 1
+    assert restarted.acquire("https://v1.handball.api-sports.io/games")
+    assert restarted.acquire("https://v1.basketball.api-sports.io/games")
+
+    restarted.exhaust("https://v1.handball.api-sports.io/games")
+    assert not restarted.acquire("https://v1.handball.api-sports.io/games")
+
+    today[0] = date(2022, 12, 2)
+    assert restarted.acquire("https://v1.handball.api-sports.io/games")
+    assert restarted.usage("v1.handball.api-sports.io").used == 1
@@ -0,0 +1,105 @@
+import json
+
+import requests
+
+from aswe.utils.metrics import (
+    Endpoint,
+    Histogram,
+    RequestMetrics,
+    error_class,
+    serve_metrics,
+)
+
+
+def test_endpoint() -> None:
+    """Test that URLs are grouped into endpoints without their parameters"""
+    metrics = RequestMetrics()
+
+    assert metrics.endpoint("https://financialmodelingprep.com/api/v3/rating/AAPL?apikey=1") == (
+        "financialmodelingprep.com",
+        "/api/v3/rating/{symbol}",
+    )
+    assert metrics.endpoint("https://api.football-data.org/v4/competitions/PL/standings") == (
+        "api.football-data.org",
+        "/v4/competitions/{id}/standings",
+    )
+    assert metrics.endpoint("https://ergast.com/api/f1/2022/5/results.json") == (
+        "ergast.com",
+        "/api/f1/{id}/{id}/results.json",
+    )
+    assert metrics.endpoint(None) == ("unknown", "unknown")
+    assert RequestMetrics([Endpoint(r"example\.com/(\w+)/", r"/\1/{name}")]).endpoint(
+        "https://example.com/users/alice"
+    ) == ("example.com", "/users/{name}")
+
+
+def test_histogram() -> None:
+    """Test that values are counted in their buckets and reported cumulatively"""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.total == 3.65
+    assert histogram.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+
+
+def test_error_class() -> None:
+    """Test that status codes are mapped to error classes"""
+    assert error_class(429) == "http_429"
+    assert error_class(404) == "http_4xx"
+    assert error_class(503) == "http_5xx"
+
+
+def test_request_metrics() -> None:
+    """Test that the snapshot and the Prometheus text contain the recorded metrics"""
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    metrics.record_request("https://newsapi.org/v2/everything?q=a", 0.05, 100)
+    metrics.record_request("https://newsapi.org/v2/everything?q=b", 2.0, 50)
+    metrics.record_cache_hit("https://newsapi.org/v2/everything?q=a")
+    metrics.record_error("https://newsapi.org/v2/everything?q=b", "timeout")
+    metrics.record_request("https://ergast.com/api/f1/current/last/results.json", 0.5, 10)
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot["hosts"]) == ["newsapi.org", "ergast.com"]
+    assert snapshot["hosts"]["newsapi.org"] == {
+        "requests": 2,
+        "cache_hits": 1,
+        "bytes": 150,
+        "errors": 1,
+        "latency_seconds": 2.05,
+    }
+    assert snapshot["endpoints"][1]["endpoint"] == "/v2/everything"
+    assert snapshot["endpoints"][1]["latency_buckets"] == {"0.1": 1, "1": 1, "+Inf": 2}
+    json.dumps(snapshot)
+
+    text = metrics.to_prometheus()
+    labels = 'host="newsapi.org",endpoint="/v2/everything"'
+    assert f"aswe_http_requests_total{{{labels}}} 2" in text
+    assert f"aswe_http_cache_hits_total{{{labels}}} 1" in text
+    assert f"aswe_http_response_bytes_total{{{labels}}} 150" in text
+    assert f'aswe_http_errors_total{{{labels},error="timeout"}} 1' in text
+    assert f'aswe_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"aswe_http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert "# TYPE aswe_http_request_duration_seconds histogram" in text
+
+    metrics.reset()
+    assert metrics.snapshot() == {"hosts": {}, "endpoints": []}
+
+
+def test_serve_metrics() -> None:
+    """Test that the metrics are served in the Prometheus text format and as JSON"""
+    metrics = RequestMetrics()
+    metrics.record_request("https://newsapi.org/v2/everything", 0.2, 10)
+    server = serve_metrics(0, metrics=metrics)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        text = requests.get(f"{base_url}/metrics", timeout=5)
+        assert text.headers["Content-Type"].startswith("text/plain")
+        assert text.text == metrics.to_prometheus()
+        assert requests.get(f"{base_url}/metrics.json", timeout=5).json() == metrics.snapshot()
+        assert requests.get(f"{base_url}/other", timeout=5).status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,7 +1,51 @@
+# pylint: disable=protected-access
+import asyncio
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Iterator
+
+import pytest
+import requests
 from pytest_mock import MockerFixture
 from requests.models import Response
+from urllib3.exceptions import ConnectTimeoutError
+
+from aswe.utils import request
+from aswe.utils.breaker import BreakerState
+from aswe.utils.cache import CachePolicy, ResponseStore
+from aswe.utils.decoder import decode_json, iter_json_items
+from aswe.utils.error import TooManyRequests
+from aswe.utils.limiter import RateLimit, background_requests, is_background
+from aswe.utils.metrics import request_metrics
+from aswe.utils.request import (
+    JitteredRetry,
+    SessionConfig,
+    SessionPool,
+    asynchronous,
+    breaker_states,
+    cache_stats,
+    configure_breaker,
+    configure_cache,
+    configure_rate_limits,
+    configure_sessions,
+    host_available,
+    http_request,
+    http_request_async,
+    validate_api,
+)
+
 
-from aswe.utils.request import http_request, validate_api
+@pytest.fixture(autouse=True)
+def default_config() -> Iterator[None]:
+    """Restores the default configuration of `http_request` after each test, also if it failed"""
+    yield
+    configure_cache()
+    configure_rate_limits()
+    configure_breaker()
+    configure_sessions(SessionConfig())
+    request_metrics().reset()
 
 
 def test_valid_request() -> None:
@@ -20,14 +64,14 @@ def test_exception(mocker: MockerFixture) -> None:
     # * HTTPError
     mock_response = Response()
     mock_response.status_code = 401
-    mocker.patch("aswe.utils.request.requests.get", return_value=mock_response)
+    mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
 
     assert http_request("lorem") is None
 
     # * Other Exception
     mock_response = Response()
     mock_response.status_code = 202
-    mocker.patch("aswe.utils.request.requests.get", return_value=mock_response)
+    mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
 
     assert http_request("lorem") is None
 
@@ -49,3 +93,332 @@ def test_valid_api_response() -> None:
     limit_reached._content = b'{"errors": {"requests": "You have reached the request limit for the day"}}'
 
     assert validate_api(limit_reached) is True
+
+
+def test_session_pool() -> None:
+    """Test that one session is reused per host"""
+    pool = SessionPool(SessionConfig(pool_maxsize=2, keep_alive=False, retries=1))
+
+    session = pool.get("https://api.football-data.org/v4/matches")
+    assert pool.get("https://API.football-data.org/v4/teams") is session
+    assert pool.get("https://newsapi.org/v2/everything") is not session
+    assert pool.hosts == ["api.football-data.org", "newsapi.org"]
+
+    assert session.headers["Connection"] == "close"
+    adapter = session.get_adapter("https://api.football-data.org")
+    assert adapter._pool_maxsize == 2  # type: ignore
+    assert adapter.max_retries.total == 1  # type: ignore
+
+    pool.close()
+    assert pool.hosts == []
+
+
+def test_session_retry_backoff() -> None:
+    """Test that the sessions are created with a capped and jittered backoff on the installed urllib3"""
+    pool = SessionPool(SessionConfig(retries=5, backoff_factor=1.0, backoff_jitter=0.5, backoff_max=3.0))
+    retry = pool.get("https://example.com").get_adapter("https://example.com").max_retries  # type: ignore
+
+    assert isinstance(retry, JitteredRetry)
+    assert retry.get_backoff_time() == 0
+
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/", error=ConnectTimeoutError())
+    assert isinstance(retry, JitteredRetry)
+    assert retry.jitter == 0.5
+    assert retry.get_backoff_time() == 3.0
+    assert retry.new(history=retry.history[:2]).get_backoff_time() == pytest.approx(2.25, abs=0.25)
+    pool.close()
+
+
+def test_configure_sessions(mocker: MockerFixture) -> None:
+    """Test that `http_request` uses the pooled sessions"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+
+    configure_sessions(SessionConfig(retries=0))
+    assert http_request("https://example.com/a", timeout=5) is mock_response
+    get.assert_called_once_with("https://example.com/a", timeout=5, headers=None, stream=False)
+
+
+def test_cached_request(mocker: MockerFixture) -> None:
+    """Test that `http_request` serves repeated requests from the response cache"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    mock_response._content = b"{}"
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+
+    configure_cache([CachePolicy("example", r"example\.com/cached", 60)])
+    assert http_request("https://example.com/cached") is not None
+    assert http_request("https://example.com/cached") is not None
+    assert http_request("https://example.com/uncached") is not None
+    assert http_request("https://example.com/uncached") is not None
+
+    assert get.call_count == 3
+    assert cache_stats()["example"].hits == 1
+    assert cache_stats()["total"].misses == 1
+
+
+def test_streamed_request(mocker: MockerFixture) -> None:
+    """Test that streamed responses are neither cached nor read by `http_request` before they are parsed"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    mock_response._content = b"{}"
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+
+    configure_cache([CachePolicy("example", r"example\.com/feed", 60)])
+    assert http_request("https://example.com/feed", stream=True) is mock_response
+    assert http_request("https://example.com/feed", stream=True) is mock_response
+
+    assert get.call_count == 2
+    assert get.call_args.kwargs["stream"] is True
+    assert cache_stats()["total"].hits == 0
+
+
+def test_streamed_request_cached_when_read(mocker: MockerFixture) -> None:
+    """Test that a streamed feed is cached once it was parsed completely, but not if parsing stopped early"""
+
+    def streamed_response(*args: Any, **kwargs: Any) -> Response:
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(b'{"count": 3, "matches": [1, 2, 3]}')
+        return response
+
+    get = mocker.patch("aswe.utils.request.requests.Session.get", side_effect=streamed_response)
+    configure_cache([CachePolicy("example", r"example\.com/feed", 60)])
+
+    response = http_request("https://example.com/feed?early", stream=True)
+    assert response is not None and next(iter_json_items(response, "matches", chunk_size=4)) == 1
+    assert http_request("https://example.com/feed?early", stream=True) is not None
+    assert get.call_count == 2
+
+    response = http_request("https://example.com/feed", stream=True)
+    assert response is not None and list(iter_json_items(response, "matches", chunk_size=4)) == [1, 2, 3]
+    cached = http_request("https://example.com/feed", stream=True)
+    assert cached is not None and list(iter_json_items(cached, "matches")) == [1, 2, 3]
+    assert get.call_count == 3
+    assert cache_stats()["example"].hits == 1
+
+
+def test_coalesced_streamed_request(mocker: MockerFixture) -> None:
+    """Test that concurrent streamed requests share the body once read, but not if reading stopped early"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def streamed_response(*args: Any, **kwargs: Any) -> Response:
+        started.set()
+        release.wait(5)
+        response = Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(b'{"count": 3, "matches": [1, 2, 3]}')
+        return response
+
+    get = mocker.patch("aswe.utils.request.requests.Session.get", side_effect=streamed_response)
+    configure_cache([])
+    saved = cache_stats()["total"].coalesced
+
+    for url, limit in [("https://example.com/feed", None), ("https://example.com/feed?early", 1)]:
+        started.clear()
+        release.clear()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(http_request, url, stream=True)
+            started.wait(5)
+            second = executor.submit(http_request, url, stream=True)
+            while cache_stats()["total"].coalesced == saved:
+                threading.Event().wait(0.01)
+            saved += 1
+            release.set()
+
+            response = first.result()
+            assert response is not None
+            assert list(islice(iter_json_items(response, "matches", chunk_size=4), limit)) == [1, 2, 3][:limit]
+            shared = second.result()
+            assert shared is not None and list(iter_json_items(shared, "matches")) == [1, 2, 3]
+
+    assert get.call_count == 3
+
+
+def test_conditional_request(mocker: MockerFixture) -> None:
+    """Test that `http_request` revalidates stale persisted responses and treats `304` as hit"""
+    stored_response = Response()
+    stored_response.status_code = 200
+    stored_response._content = b'{"teams": []}'
+    stored_response.headers["ETag"] = '"v1"'
+    not_modified = Response()
+    not_modified.status_code = 304
+    get = mocker.patch("aswe.utils.request.requests.Session.get", side_effect=[stored_response, not_modified])
+
+    now = [0.0]
+    configure_cache([CachePolicy("example", r"example\.com", 60)], store=ResponseStore(clock=lambda: now[0]))
+    assert http_request("https://example.com/teams") is not None
+
+    now[0] = 60
+    request._CACHE.clear()
+    response = http_request("https://example.com/teams")
+    assert response is not None and response.json() == {"teams": []}
+
+    assert get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert cache_stats()["example"].revalidations == 1
+
+
+def test_coalesced_request(mocker: MockerFixture) -> None:
+    """Test that concurrent identical requests share one network call"""
+    started = threading.Event()
+    release = threading.Event()
+    mock_response = Response()
+    mock_response.status_code = 200
+    mock_response._content = b"{}"
+
+    def slow_get(*args: Any, **kwargs: Any) -> Response:
+        started.set()
+        release.wait(5)
+        return mock_response
+
+    get = mocker.patch("aswe.utils.request.requests.Session.get", side_effect=slow_get)
+    configure_cache([])
+    saved = cache_stats()["total"].coalesced
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(http_request, "https://example.com/coalesced")
+        started.wait(5)
+        second = executor.submit(http_request, "https://example.com/coalesced")
+        while cache_stats()["total"].coalesced == saved:
+            threading.Event().wait(0.01)
+        release.set()
+
+        assert first.result() is mock_response
+        response = second.result()
+        assert response is not None and response is not mock_response and response.json() == {}
+
+    assert get.call_count == 1
+    assert cache_stats()["total"].coalesced == saved + 1
+
+
+def test_http_request_async(mocker: MockerFixture) -> None:
+    """Test that `http_request_async` and `asynchronous` run blocking calls concurrently"""
+    barrier = threading.Barrier(3, timeout=5)
+    mock_response = Response()
+    mock_response.status_code = 200
+
+    def blocking_get(*args: Any, **kwargs: Any) -> Response:
+        barrier.wait()
+        return mock_response
+
+    mocker.patch("aswe.utils.request.requests.Session.get", side_effect=blocking_get)
+    configure_cache([])
+
+    def blocking_call(value: int) -> int:
+        barrier.wait()
+        return value
+
+    blocking_call_async = asynchronous(blocking_call)
+    assert blocking_call_async.__name__ == "blocking_call_async"
+
+    async def fan_out() -> list[Any]:
+        return list(
+            await asyncio.gather(
+                http_request_async("https://example.com/a"),
+                http_request_async("https://example.com/b"),
+                blocking_call_async(1),
+            )
+        )
+
+    assert asyncio.run(fan_out()) == [mock_response, mock_response, 1]
+
+
+def test_rate_limited_request(mocker: MockerFixture) -> None:
+    """Test that background requests are dropped and user requests refused once the quota is used up"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+    configure_cache([])
+    configure_rate_limits([RateLimit(r"example\.com$", rate=100, burst=100, daily_quota=2, reserve=0.5)])
+
+    with background_requests():
+        assert http_request("https://example.com/a") is mock_response
+        assert http_request("https://example.com/b") is None
+    assert http_request("https://example.com/c") is mock_response
+    with pytest.raises(TooManyRequests):
+        http_request("https://example.com/d")
+
+    assert get.call_count == 2
+
+
+def test_rate_limited_request_not_shared(mocker: MockerFixture) -> None:
+    """Test that a user request does not share the flight of a background request dropped to save the quota"""
+    started = threading.Event()
+    release = threading.Event()
+    mock_response = Response()
+    mock_response.status_code = 200
+    get = mocker.patch("aswe.utils.request.requests.Session.get", return_value=mock_response)
+    configure_cache([])
+    configure_rate_limits([RateLimit(r"example\.com$", rate=100, burst=100, daily_quota=2, reserve=0.5)])
+    assert http_request("https://example.com/a") is mock_response
+
+    acquire = request._LIMITER.acquire
+
+    def slow_acquire(url: str) -> bool:
+        if is_background():
+            started.set()
+            release.wait(5)
+        return acquire(url)
+
+    mocker.patch.object(request._LIMITER, "acquire", side_effect=slow_acquire)
+
+    def background_request() -> Response | None:
+        with background_requests():
+            return http_request("https://example.com/b")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(background_request)
+        started.wait(5)
+        follower = executor.submit(http_request, "https://example.com/b")
+        assert follower.result(timeout=2) is mock_response
+        release.set()
+        assert leader.result() is None
+
+    assert get.call_count == 2
+
+
+def test_circuit_breaker_fails_fast(mocker: MockerFixture) -> None:
+    """Test that `http_request` stops calling a host after repeated connection errors"""
+    get = mocker.patch("aswe.utils.request.requests.Session.get", side_effect=requests.ConnectionError("down"))
+    configure_breaker(failure_threshold=2, recovery_timeout=60)
+
+    assert [http_request("https://example.com/down") for _ in range(3)] == [None, None, None]
+    assert get.call_count == 2
+    assert not host_available("example.com")
+    assert breaker_states() == {"example.com": BreakerState.OPEN}
+
+
+def test_request_metrics(mocker: MockerFixture) -> None:
+    """Test that `http_request` records requests, cache hits and error classes per endpoint"""
+    mock_response = Response()
+    mock_response.status_code = 200
+    mock_response._content = b"not json"
+    mock_response.url = "https://example.com/metrics/1"
+    rate_limited = Response()
+    rate_limited.status_code = 429
+    mocker.patch(
+        "aswe.utils.request.requests.Session.get",
+        side_effect=[mock_response, requests.Timeout("slow"), rate_limited],
+    )
+    configure_cache([CachePolicy("example", r"example\.com/metrics", 60)])
+    request_metrics().reset()
+
+    response = http_request("https://example.com/metrics/1")
+    assert response is not None
+    assert http_request("https://example.com/metrics/1") is not None
+    with pytest.raises(requests.JSONDecodeError):
+        decode_json(response)
+    assert http_request("https://example.com/slow") is None
+    with pytest.raises(TooManyRequests):
+        http_request("https://example.com/limited")
+
+    snapshot = {entry["endpoint"]: entry for entry in request_metrics().snapshot()["endpoints"]}
+    assert snapshot["/metrics/{id}"]["requests"] == 1
+    assert snapshot["/metrics/{id}"]["cache_hits"] == 1
+    assert snapshot["/metrics/{id}"]["bytes"] == 8
+    assert snapshot["/metrics/{id}"]["errors"] == {"json": 1}
+    assert snapshot["/slow"]["errors"] == {"timeout": 1}
+    assert snapshot["/limited"]["errors"] == {"http_429": 1}
@@ -1,4 +1,4 @@
-from aswe.utils.text import calculate_similarity
+from aswe.utils.text import InvertedIndex, calculate_similarity, extract_terms
 
 
 def test_calulate_similarity() -> None:
@@ -12,3 +12,21 @@ def test_calulate_similarity() -> None:
     assert calculate_similarity("Lorem", "Ipsum") < 0.5
     assert calculate_similarity("Lorem", ["Lorem", "Ipsum"]) == 1.0
     assert calculate_similarity("test", []) == 0.0
+
+
+def test_extract_terms() -> None:
+    """Test the `extract_terms` function."""
+    assert extract_terms("Hi  you") == {"w:hi", "w:you", "c: hi", "c:hi ", "c:i y", "c: yo", "c:you", "c:ou "}
+    assert extract_terms("") == set()
+
+
+def test_inverted_index() -> None:
+    """Test the `InvertedIndex` class."""
+    index = InvertedIndex(["football standings", "weather", "what is the weather"])
+
+    assert index.candidates("weather") == [1, 2]
+    assert index.candidates("football") == [0]
+    assert index.candidates("qqq") == [0, 1, 2]
+
+    index = InvertedIndex(["football standings", "weather"], full_scan_fallback=False)
+    assert index.candidates("qqq") == []